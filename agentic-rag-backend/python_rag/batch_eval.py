@@ -0,0 +1,162 @@
+"""
+Batch Evaluation Runner
+=======================
+Answers an evaluation set with AgenticOrchestrator.process_queries_batch
+and writes one JSON line per question (answer, contexts, pipeline mode,
+per-stage timings) to a checkpoint file that doubles as the output.
+
+Features:
+- Input as JSONL ({"id", "query" or "question", "history", extra fields
+  such as a reference answer}), a JSON list, or plain text (one question
+  per line)
+- Resumable: rerunning with the same --output skips finished questions
+  and retries failed ones
+- Configurable wave size, LLM call rate and LLM concurrency
+- Run summary (counts, throughput, latency percentiles, tokens) on stdout
+
+Usage (from python_rag/):
+    python batch_eval.py --input eval_set.jsonl --output eval_results.jsonl
+    python batch_eval.py --input questions.txt --output run.jsonl --llm-rate 5 --mode direct
+
+Author: RAG Research Team
+Date: November 2025
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Set
+
+# Pipeline modules are imported by bare name, like the wrapper does
+sys.path.insert(0, str(Path(__file__).parent))
+
+from metrics import LatencyHistogram
+from orchestrator import AgenticOrchestrator
+
+logger = logging.getLogger(__name__)
+
+
+def load_queries(path: str) -> List:
+    """
+    Read an evaluation set.
+
+    Args:
+        path: .jsonl (one object per line), .json (list) or text file
+            (one question per line)
+
+    Returns:
+        List of question strings or dicts, as accepted by process_queries_batch
+    """
+    text = Path(path).read_text(encoding="utf-8")
+    suffix = Path(path).suffix.lower()
+
+    if suffix == ".jsonl":
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    if suffix == ".json":
+        queries = json.loads(text)
+        if not isinstance(queries, list):
+            raise ValueError(f"{path} must contain a JSON list")
+        return queries
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+def summarize(records: List[Dict], wall_seconds: float, resumed_ids: Set[str]) -> Dict:
+    """
+    Aggregate result records into a run summary.
+
+    Latency percentiles cover the queries answered in this run (not the
+    ones resumed from the checkpoint).
+
+    Args:
+        records: Result records returned by process_queries_batch
+        wall_seconds: Duration of this run
+        resumed_ids: Ids of the records taken from the checkpoint
+
+    Returns:
+        Summary dictionary
+    """
+    fresh = [record for record in records if record["id"] not in resumed_ids]
+    histograms: Dict[str, LatencyHistogram] = {"total": LatencyHistogram(window=max(1, len(fresh)))}
+    tokens = {"prompt": 0, "completion": 0}
+    pipeline_modes: Dict[str, int] = {}
+
+    for record in fresh:
+        timings = record.get("timings") or {}
+        if "totalMs" not in timings:
+            continue
+        histograms["total"].observe(timings["totalMs"])
+        for stage, ms in timings.get("stages", {}).items():
+            if stage not in histograms:
+                histograms[stage] = LatencyHistogram(window=max(1, len(fresh)))
+            histograms[stage].observe(ms)
+        tokens["prompt"] += timings.get("tokens", {}).get("prompt", 0)
+        tokens["completion"] += timings.get("tokens", {}).get("completion", 0)
+        mode = record.get("pipelineMode") or "unknown"
+        pipeline_modes[mode] = pipeline_modes.get(mode, 0) + 1
+
+    return {
+        "queries": len(records),
+        "resumed": len(records) - len(fresh),
+        "answered": len(fresh),
+        "failed": sum(1 for record in records if not record.get("success")),
+        "wallSeconds": round(wall_seconds, 2),
+        "throughputQps": round(len(fresh) / wall_seconds, 2) if wall_seconds else 0.0,
+        "latency": {stage: histogram.snapshot() for stage, histogram in sorted(histograms.items())},
+        "tokens": tokens,
+        "pipelineModes": pipeline_modes,
+    }
+
+
+def main():
+    """
+    Main entry point for CLI execution.
+    """
+    parser = argparse.ArgumentParser(description='Answer an evaluation set with the agentic RAG pipeline')
+    parser.add_argument('--input', type=str, required=True,
+                        help='Evaluation set (.jsonl, .json list or one question per line)')
+    parser.add_argument('--output', type=str, required=True,
+                        help='JSONL results/checkpoint file (resumed if it exists)')
+    parser.add_argument('--mode', choices=['agentic', 'direct', 'auto'], default=None,
+                        help='Pipeline mode of every query (default: PIPELINE_MODE)')
+    parser.add_argument('--batch-size', dest='batch_size', type=int, default=None,
+                        help='Queries per wave (default: BATCH_SIZE)')
+    parser.add_argument('--llm-rate', dest='llm_rate', type=float, default=None,
+                        help='LLM call starts per second, 0 = unlimited (default: BATCH_LLM_RATE)')
+    parser.add_argument('--llm-concurrency', dest='llm_concurrency', type=int, default=None,
+                        help='LLM calls in flight, 0 = unlimited (default: BATCH_LLM_CONCURRENCY)')
+    parser.add_argument('--verbose', action='store_true',
+                        help='Show pipeline logs')
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(asctime)s [%(levelname)s] %(message)s',
+        stream=sys.stderr
+    )
+
+    queries = load_queries(args.input)
+    checkpointed = AgenticOrchestrator.load_batch_checkpoint(args.output)
+    print(f"{len(queries)} queries, {len(checkpointed)} already in {args.output}", file=sys.stderr)
+
+    orchestrator = AgenticOrchestrator()
+    orchestrator.wait_until_warm()
+
+    started = time.perf_counter()
+    records = orchestrator.process_queries_batch(
+        queries,
+        checkpoint_path=args.output,
+        mode=args.mode,
+        batch_size=args.batch_size,
+        llm_rate=args.llm_rate,
+        llm_concurrency=args.llm_concurrency
+    )
+    wall_seconds = time.perf_counter() - started
+
+    print(json.dumps(summarize(records, wall_seconds, set(checkpointed)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
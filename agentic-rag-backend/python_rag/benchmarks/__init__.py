@@ -0,0 +1,17 @@
+"""
+Offline Pipeline Benchmarks
+===========================
+Measures the agentic RAG pipeline without OpenAI, MongoDB Atlas or Tavily.
+
+AgenticOrchestrator is built with injected stand-ins (benchmarks.fakes)
+whose latencies follow configurable distributions, then driven at several
+concurrency levels. Per-stage and end-to-end latency percentiles plus
+throughput are written as JSON so runs can be compared across commits.
+
+Usage (from python_rag/):
+    python -m benchmarks.run --concurrency 1,4,16 --requests 200 --output bench.json
+    python -m benchmarks.run --mode async --llm-latency lognormal:600,0.4 --baseline bench.json
+
+Author: RAG Research Team
+Date: November 2025
+"""
@@ -0,0 +1,450 @@
+"""
+Benchmark Stand-in Services
+===========================
+In-process replacements for the pipeline's external services, injected
+through the LLMManager / Retriever constructors.
+
+Features:
+- LatencyModel: constant, uniform, normal or lognormal latency from a spec string
+- FakeEmbeddingModel: deterministic hashed bag-of-words embeddings
+- FakeMongoClient / FakeAsyncMongoClient: brute-force $vectorSearch over a
+  synthetic corpus (same score scale as Atlas)
+- FakeOpenAI / FakeAsyncOpenAI: keyword-based decomposition and canned
+  synthesis with token usage, including streaming
+- FakeTavilyClient / FakeAsyncTavilyClient: canned web results
+- Synthetic corpus and query workload built from the validator keywords
+
+Author: RAG Research Team
+Date: November 2025
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from llm_utils import LLMManager
+from validation import ResultValidator
+
+
+class LatencyModel:
+    """
+    Latency distribution in milliseconds.
+
+    Spec strings:
+        "0" or "constant:50"      fixed latency
+        "uniform:20,80"           uniform between bounds
+        "normal:50,10"            mean, standard deviation (clipped at 0)
+        "lognormal:400,0.35"      median, sigma (long right tail, like API calls)
+    """
+
+    KINDS = ("constant", "uniform", "normal", "lognormal")
+
+    def __init__(self, kind: str = "constant", params: tuple = (0.0,), seed: Optional[int] = None):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unsupported latency distribution: {kind}")
+        self.kind = kind
+        self.params = tuple(float(p) for p in params)
+        self._random = random.Random(seed)
+
+    @classmethod
+    def parse(cls, spec: str, seed: Optional[int] = None) -> "LatencyModel":
+        """
+        Build a model from a spec string.
+
+        Args:
+            spec: Distribution spec (see class docstring)
+            seed: Optional random seed
+
+        Returns:
+            LatencyModel
+        """
+        kind, _, params = spec.partition(":")
+        if not params:
+            return cls("constant", (float(kind),), seed)
+        return cls(kind, tuple(params.split(",")), seed)
+
+    def sample_ms(self) -> float:
+        """Draw one latency in milliseconds."""
+        if self.kind == "constant":
+            return self.params[0]
+        if self.kind == "uniform":
+            return self._random.uniform(*self.params)
+        if self.kind == "normal":
+            return max(0.0, self._random.gauss(*self.params))
+        median, sigma = self.params
+        return median * self._random.lognormvariate(0.0, sigma)
+
+    def sleep(self):
+        """Block for one sampled latency."""
+        delay = self.sample_ms()
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+    async def asleep(self):
+        """Await one sampled latency."""
+        delay = self.sample_ms()
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+    def __repr__(self) -> str:
+        return f"{self.kind}:{','.join(f'{p:g}' for p in self.params)}"
+
+
+class FakeEmbeddingModel:
+    """
+    SentenceTransformer stand-in producing hashed bag-of-words vectors.
+
+    Texts sharing words get similar vectors, so section routing and vector
+    search behave plausibly on the synthetic corpus.
+    """
+
+    def __init__(self, dimension: int = 384, latency: Optional[LatencyModel] = None):
+        self.dimension = dimension
+        self.latency = latency or LatencyModel()
+        self._token_vectors: Dict[str, np.ndarray] = {}
+
+    def _token_vector(self, token: str) -> np.ndarray:
+        vector = self._token_vectors.get(token)
+        if vector is None:
+            seed = int(hashlib.md5(token.encode()).hexdigest()[:8], 16)
+            vector = np.random.default_rng(seed).standard_normal(self.dimension).astype(np.float32)
+            self._token_vectors[token] = vector
+        return vector
+
+    def _embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        for token in re.findall(r"\w+", text.lower()):
+            vector += self._token_vector(token)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def encode(self, sentences, **kwargs):
+        """Encode one text (1-D array) or a list of texts (2-D array); one latency per call."""
+        self.latency.sleep()
+        if isinstance(sentences, str):
+            return self._embed(sentences)
+        return np.stack([self._embed(text) for text in sentences])
+
+
+class FakeCollection:
+    """
+    Mongo collection stand-in supporting the calls the retriever makes.
+    """
+
+    def __init__(self, documents: List[Dict], latency: Optional[LatencyModel] = None):
+        self.documents = documents
+        self.latency = latency or LatencyModel()
+        self._sections = np.array([doc["section_name"] for doc in documents])
+        matrix = np.asarray([doc["embedding"] for doc in documents], dtype=np.float32)
+        self._matrix = matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+    def find(self, filter: Optional[Dict] = None, projection: Optional[Dict] = None) -> List[Dict]:
+        ids = (filter or {}).get("_id", {}).get("$in")
+        return [dict(doc) for doc in self.documents if ids is None or doc["_id"] in ids]
+
+    def estimated_document_count(self) -> int:
+        return len(self.documents)
+
+    def aggregate(self, pipeline: List[Dict]) -> List[Dict]:
+        self.latency.sleep()
+        return self._vector_search(pipeline[0]["$vectorSearch"], pipeline[1]["$project"])
+
+    def _vector_search(self, stage: Dict, projection: Dict) -> List[Dict]:
+        query = np.asarray(stage["queryVector"], dtype=np.float32)
+        query /= np.linalg.norm(query) or 1.0
+        scores = (1.0 + self._matrix @ query) / 2.0
+
+        condition = stage.get("filter", {}).get("section_name")
+        if condition is not None:
+            allowed = condition["$in"] if isinstance(condition, dict) and "$in" in condition else [
+                condition["$eq"] if isinstance(condition, dict) else condition
+            ]
+            scores = np.where(np.isin(self._sections, allowed), scores, -1.0)
+
+        order = np.argsort(-scores)[:stage["limit"]]
+        results = []
+        for i in order:
+            if scores[i] < 0:
+                continue
+            doc = {field: self.documents[i][field] for field in projection if field in self.documents[i]}
+            doc["score"] = float(scores[i])
+            results.append(doc)
+        return results
+
+
+class _FakeAsyncCursor:
+    def __init__(self, results: List[Dict]):
+        self._results = results
+
+    async def to_list(self, length=None) -> List[Dict]:
+        return self._results
+
+
+class FakeAsyncCollection:
+    """
+    AsyncMongoClient collection stand-in sharing a FakeCollection's data.
+    """
+
+    def __init__(self, collection: FakeCollection):
+        self._collection = collection
+
+    async def aggregate(self, pipeline: List[Dict]) -> _FakeAsyncCursor:
+        await self._collection.latency.asleep()
+        return _FakeAsyncCursor(
+            self._collection._vector_search(pipeline[0]["$vectorSearch"], pipeline[1]["$project"])
+        )
+
+
+class _FakeDatabase:
+    def __init__(self, collection):
+        self._collection = collection
+
+    def __getitem__(self, name):
+        return self._collection
+
+
+class FakeMongoClient:
+    """MongoClient stand-in: every database/collection name maps to one collection."""
+
+    def __init__(self, collection):
+        self._collection = collection
+
+    def __getitem__(self, name):
+        return _FakeDatabase(self._collection)
+
+    def close(self):
+        pass
+
+
+class FakeAsyncMongoClient(FakeMongoClient):
+    """AsyncMongoClient stand-in."""
+
+    def __init__(self, collection: FakeCollection):
+        super().__init__(FakeAsyncCollection(collection))
+
+
+class _FakeLLMBackend:
+    """
+    Shared response logic of the fake OpenAI clients.
+    """
+
+    def __init__(self, latency: LatencyModel, answer_words: int = 120):
+        self.latency = latency
+        self.answer_words = answer_words
+        self.validator = ResultValidator()
+        self.calls = {"decompose": 0, "synthesize": 0}
+
+    def respond(self, messages: List[Dict]) -> str:
+        """Decompose by section keyword overlap, or write a canned answer."""
+        prompt = messages[-1]["content"]
+        if "query analyzer" in messages[0]["content"]:
+            self.calls["decompose"] += 1
+            query = prompt.split("**Student Query:**", 1)[1].split("\n", 1)[0].strip()
+            return json.dumps(self._decompose(query))
+
+        self.calls["synthesize"] += 1
+        if LLMManager.OUT_OF_DOMAIN_MARKER in prompt:
+            # Domain-checked (direct mode) synthesis
+            query = prompt.split("**Student Question:**", 1)[1].split("\n", 1)[0].strip()
+            if not self.validator.match_keywords(query):
+                return LLMManager.OUT_OF_DOMAIN_MARKER
+        words = re.findall(r"\w+", prompt)[-self.answer_words:]
+        return "Based on the college records: " + " ".join(words)
+
+    def _decompose(self, query: str) -> Dict[str, str]:
+        matched = self.validator.match_keywords(query)
+        overlap = {
+            section: len(matched & set(keywords))
+            for section, keywords in self.validator.SECTION_KEYWORDS.items()
+        }
+        ranked = sorted((section for section, hits in overlap.items() if hits), key=lambda s: -overlap[s])
+        return {section: f"{query} {section.replace('_', ' ')}" for section in ranked[:2]}
+
+    @staticmethod
+    def usage(messages: List[Dict], content: str) -> SimpleNamespace:
+        prompt_tokens = sum(len(m["content"]) for m in messages) // 4
+        completion_tokens = len(content) // 4
+        return SimpleNamespace(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens,
+        )
+
+    @staticmethod
+    def completion(content: str, usage) -> SimpleNamespace:
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=usage,
+        )
+
+    def stream(self, messages: List[Dict], content: str, total_ms: float) -> Iterator[SimpleNamespace]:
+        """Yield ~5-word deltas, spreading total_ms over them, then a usage chunk."""
+        words = content.split(" ")
+        deltas = [" ".join(words[i:i + 5]) + " " for i in range(0, len(words), 5)]
+        for delta in deltas:
+            time.sleep(total_ms / 1000 / len(deltas))
+            yield SimpleNamespace(
+                choices=[SimpleNamespace(delta=SimpleNamespace(content=delta))],
+                usage=None,
+            )
+        yield SimpleNamespace(choices=[], usage=self.usage(messages, content))
+
+
+class FakeOpenAI:
+    """
+    OpenAI client stand-in (chat.completions.create only).
+    """
+
+    def __init__(self, latency: Optional[LatencyModel] = None, answer_words: int = 120):
+        self.backend = _FakeLLMBackend(latency or LatencyModel(), answer_words)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    @property
+    def calls(self) -> Dict[str, int]:
+        return self.backend.calls
+
+    def _create(self, *, messages: List[Dict], stream: bool = False, **kwargs):
+        content = self.backend.respond(messages)
+        if stream:
+            return self.backend.stream(messages, content, self.backend.latency.sample_ms())
+        self.backend.latency.sleep()
+        return self.backend.completion(content, self.backend.usage(messages, content))
+
+
+class FakeAsyncOpenAI:
+    """
+    AsyncOpenAI client stand-in sharing a FakeOpenAI's latency and counters.
+    """
+
+    def __init__(self, sync_client: FakeOpenAI):
+        self.backend = sync_client.backend
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, *, messages: List[Dict], **kwargs):
+        content = self.backend.respond(messages)
+        await self.backend.latency.asleep()
+        return self.backend.completion(content, self.backend.usage(messages, content))
+
+
+class FakeTavilyClient:
+    """
+    TavilyClient stand-in returning canned, domain-relevant results.
+    """
+
+    def __init__(self, latency: Optional[LatencyModel] = None):
+        self.latency = latency or LatencyModel()
+        self.calls = 0
+
+    def _response(self, query: str, max_results: int) -> Dict:
+        self.calls += 1
+        return {
+            "results": [
+                {
+                    "title": f"Notice {i + 1}: {query[:40]}",
+                    "url": f"https://example.edu/notices/{abs(hash((query, i))) % 10000}",
+                    "content": f"Latest college notice about {query}. Students should check the portal "
+                               f"for scholarship and exam form deadlines.",
+                    "score": round(0.9 - 0.1 * i, 2),
+                }
+                for i in range(max_results)
+            ]
+        }
+
+    def search(self, query: str, max_results: int = 3, **kwargs) -> Dict:
+        self.latency.sleep()
+        return self._response(query, max_results)
+
+
+class FakeAsyncTavilyClient:
+    """
+    AsyncTavilyClient stand-in sharing a FakeTavilyClient's latency and counter.
+    """
+
+    def __init__(self, sync_client: FakeTavilyClient):
+        self._sync = sync_client
+
+    async def search(self, query: str, max_results: int = 3, **kwargs) -> Dict:
+        await self._sync.latency.asleep()
+        return self._sync._response(query, max_results)
+
+
+FILLER_WORDS = [
+    "students", "must", "submit", "before", "deadline", "office", "details",
+    "process", "required", "contact", "available", "online", "apply", "check",
+]
+
+OUT_OF_DOMAIN_QUERIES = [
+    "what is the weather today",
+    "recommend a good movie",
+    "who won the cricket match yesterday",
+]
+
+
+def build_corpus(embedding_model: FakeEmbeddingModel, chunks_per_section: int = 25, seed: int = 7) -> List[Dict]:
+    """
+    Generate a synthetic chunk collection from the section keyword lists.
+
+    Args:
+        embedding_model: Model used to embed the chunks
+        chunks_per_section: Number of chunks per section
+        seed: Random seed
+
+    Returns:
+        Documents shaped like the Atlas collection (_id, section_name, content, metadata, embedding)
+    """
+    rng = random.Random(seed)
+    documents = []
+    for section, keywords in ResultValidator.SECTION_KEYWORDS.items():
+        for i in range(chunks_per_section):
+            words = (
+                rng.sample(keywords, min(4, len(keywords)))
+                + rng.sample(ResultValidator.CAMPUS_KEYWORDS, 2)
+                + rng.sample(FILLER_WORDS, 6)
+            )
+            rng.shuffle(words)
+            documents.append({
+                "_id": f"{section}-{i}",
+                "section_name": section,
+                "content": f"{section.replace('_', ' ').title()}: " + " ".join(words) + ".",
+                "metadata": {"source": "synthetic", "chunk": i},
+            })
+
+    embeddings = embedding_model.encode([doc["content"] for doc in documents])
+    for doc, embedding in zip(documents, embeddings):
+        doc["embedding"] = embedding.tolist()
+    return documents
+
+
+def build_workload(count: int, multi_section_ratio: float = 0.3, out_of_domain_ratio: float = 0.1, seed: int = 11) -> List[str]:
+    """
+    Generate benchmark queries.
+
+    Args:
+        count: Number of queries
+        multi_section_ratio: Share of queries mentioning two sections
+        out_of_domain_ratio: Share of out-of-domain queries (fallback path)
+        seed: Random seed
+
+    Returns:
+        List of query strings (unique, so memo layers only hit when enabled on purpose)
+    """
+    rng = random.Random(seed)
+    sections = list(ResultValidator.SECTION_KEYWORDS)
+    queries = []
+    for i in range(count):
+        roll = rng.random()
+        if roll < out_of_domain_ratio:
+            query = rng.choice(OUT_OF_DOMAIN_QUERIES)
+        else:
+            picked = rng.sample(sections, 2 if roll < out_of_domain_ratio + multi_section_ratio else 1)
+            topics = [rng.choice(ResultValidator.SECTION_KEYWORDS[section]) for section in picked]
+            query = f"how do i handle {' and '.join(topics)} {rng.choice(FILLER_WORDS)}"
+        queries.append(f"{query} #{i}")
+    return queries
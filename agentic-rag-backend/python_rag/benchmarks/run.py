@@ -0,0 +1,317 @@
+"""
+Offline Benchmark Runner
+========================
+Drives AgenticOrchestrator (built on benchmarks.fakes) at several
+concurrency levels and reports per-stage and end-to-end latency
+percentiles, throughput and token usage as JSON.
+
+Stage timings come from the pipeline's own metrics traces, so the numbers
+cover exactly the spans the production "timings" metadata reports.
+
+Usage (from python_rag/):
+    python -m benchmarks.run --concurrency 1,4,16 --requests 200 --output bench.json
+    python -m benchmarks.run --mode async --baseline bench.json
+    python -m benchmarks.run --pipeline-mode direct --baseline bench.json
+
+Author: RAG Research Team
+Date: November 2025
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Pipeline modules are imported by bare name, like the wrapper does
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import metrics
+from benchmarks.fakes import (
+    FakeAsyncMongoClient,
+    FakeAsyncOpenAI,
+    FakeAsyncTavilyClient,
+    FakeCollection,
+    FakeEmbeddingModel,
+    FakeMongoClient,
+    FakeOpenAI,
+    FakeTavilyClient,
+    LatencyModel,
+    build_corpus,
+    build_workload,
+)
+from llm_utils import LLMManager
+from metrics import LatencyHistogram
+from orchestrator import AgenticOrchestrator
+from retriever import Retriever
+from ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+RESULTS_VERSION = 1
+
+
+def build_orchestrator(args) -> AgenticOrchestrator:
+    """
+    Build an orchestrator whose external services are all stand-ins.
+
+    Args:
+        args: Parsed CLI arguments (latency specs, corpus size, caches)
+
+    Returns:
+        AgenticOrchestrator wired to fakes
+    """
+    embedding_model = FakeEmbeddingModel(latency=LatencyModel.parse(args.embed_latency, args.seed))
+    collection = FakeCollection(
+        build_corpus(embedding_model, args.chunks_per_section, args.seed),
+        latency=LatencyModel.parse(args.db_latency, args.seed + 1),
+    )
+    openai_client = FakeOpenAI(latency=LatencyModel.parse(args.llm_latency, args.seed + 2))
+    tavily_client = FakeTavilyClient(latency=LatencyModel.parse(args.web_latency, args.seed + 3))
+
+    # Never write the shared embedding store from benchmark runs
+    Retriever.EMBEDDING_STORE_DIR = ""
+    retriever = Retriever(
+        db_client=FakeMongoClient(collection),
+        embedding_model=embedding_model,
+        backend=args.backend,
+        async_db_client=FakeAsyncMongoClient(collection),
+        web_client=tavily_client,
+        async_web_client=FakeAsyncTavilyClient(tavily_client),
+    )
+    llm_manager = LLMManager(client=openai_client, async_client=FakeAsyncOpenAI(openai_client))
+    orchestrator = AgenticOrchestrator(llm_manager=llm_manager, retriever=retriever)
+
+    if not args.caches:
+        # Measure the uncached pipeline: every query pays every stage
+        orchestrator.semantic_cache = None
+        llm_manager.decompose_cache = TTLCache(max_entries=0, ttl_seconds=0)
+        retriever.web_cache = TTLCache(max_entries=0, ttl_seconds=0)
+        retriever.embedding_cache = None
+        orchestrator.query_flight = None
+        retriever.search_flight = None
+
+    return orchestrator
+
+
+def run_level(
+    orchestrator: AgenticOrchestrator,
+    queries: List[str],
+    concurrency: int,
+    mode: str,
+    pipeline_mode: Optional[str] = None
+) -> Dict:
+    """
+    Run one workload at a fixed concurrency.
+
+    Args:
+        orchestrator: Orchestrator under test
+        queries: Queries to process
+        concurrency: Maximum queries in flight
+        mode: "thread" (process_query_with_contexts on a thread pool) or
+            "async" (aprocess_query_with_contexts on one event loop)
+        pipeline_mode: Optional pipeline mode ("agentic", "direct", "auto")
+
+    Returns:
+        Summary dictionary for this level
+    """
+    def run_one(query: str) -> Dict:
+        with metrics.request_trace() as trace:
+            orchestrator.process_query_with_contexts(query, mode=pipeline_mode)
+        return trace.to_dict()
+
+    async def run_all_async() -> List[Dict]:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_one_async(query: str) -> Dict:
+            async with semaphore:
+                with metrics.request_trace() as trace:
+                    await orchestrator.aprocess_query_with_contexts(query, mode=pipeline_mode)
+                return trace.to_dict()
+
+        return await asyncio.gather(*(run_one_async(query) for query in queries))
+
+    started = time.perf_counter()
+    if mode == "async":
+        traces = asyncio.run(run_all_async())
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="bench") as executor:
+            traces = list(executor.map(run_one, queries))
+    wall_seconds = time.perf_counter() - started
+
+    return summarize(traces, wall_seconds, concurrency, mode)
+
+
+def summarize(traces: List[Dict], wall_seconds: float, concurrency: int, mode: str) -> Dict:
+    """
+    Aggregate request traces into latency percentiles and throughput.
+
+    Stage percentiles are over each request's total time in that stage,
+    counting only requests that ran the stage.
+    """
+    histograms: Dict[str, LatencyHistogram] = {"total": LatencyHistogram(window=len(traces))}
+    tokens = {"prompt": 0, "completion": 0}
+    pipeline_modes: Dict[str, int] = {}
+    web_gate: Dict[str, int] = {}
+    partial = 0
+
+    for trace in traces:
+        pipeline_mode = trace.get("tags", {}).get("mode", "unknown")
+        pipeline_modes[pipeline_mode] = pipeline_modes.get(pipeline_mode, 0) + 1
+        for decision in trace.get("decisions", []):
+            if decision["kind"] == "web_gate":
+                web_gate[decision["decision"]] = web_gate.get(decision["decision"], 0) + 1
+        if any(decision["kind"] == "deadline" for decision in trace.get("decisions", [])):
+            partial += 1
+        histograms["total"].observe(trace["totalMs"])
+        for stage, ms in trace["stages"].items():
+            if stage not in histograms:
+                histograms[stage] = LatencyHistogram(window=len(traces))
+            histograms[stage].observe(ms)
+        tokens["prompt"] += trace["tokens"]["prompt"]
+        tokens["completion"] += trace["tokens"]["completion"]
+
+    return {
+        "mode": mode,
+        "concurrency": concurrency,
+        "requests": len(traces),
+        "wallSeconds": round(wall_seconds, 3),
+        "throughputQps": round(len(traces) / wall_seconds, 2) if wall_seconds else 0.0,
+        "latency": {stage: histogram.snapshot() for stage, histogram in sorted(histograms.items())},
+        "tokens": tokens,
+        "pipelineModes": pipeline_modes,
+        "webGate": web_gate,
+        "partialRequests": partial,
+    }
+
+
+def git_commit() -> str:
+    """Current commit hash (or None outside a git checkout)."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(current: Dict, baseline: Dict) -> List[str]:
+    """
+    Format throughput and p95 changes against a baseline results file.
+
+    Returns:
+        Report lines, one per (mode, concurrency) level present in both runs
+    """
+    previous = {(r["mode"], r["concurrency"]): r for r in baseline.get("results", [])}
+    lines = [f"Baseline {baseline.get('commit')} -> current {current.get('commit')}"]
+
+    for result in current["results"]:
+        before = previous.get((result["mode"], result["concurrency"]))
+        if before is None:
+            continue
+        qps_delta = (result["throughputQps"] / before["throughputQps"] - 1) * 100 if before["throughputQps"] else 0.0
+        p95, p95_before = result["latency"]["total"]["p95Ms"], before["latency"]["total"]["p95Ms"]
+        p95_delta = (p95 / p95_before - 1) * 100 if p95_before else 0.0
+        lines.append(
+            f"  {result['mode']:>6} c={result['concurrency']:<4} "
+            f"qps {before['throughputQps']:>8.2f} -> {result['throughputQps']:>8.2f} ({qps_delta:+.1f}%)  "
+            f"p95 {p95_before:>8.1f} -> {p95:>8.1f} ms ({p95_delta:+.1f}%)"
+        )
+    return lines
+
+
+def main():
+    """
+    Main entry point for CLI execution.
+    """
+    parser = argparse.ArgumentParser(description='Offline benchmark of the agentic RAG pipeline')
+    parser.add_argument('--concurrency', type=str, default='1,4,16',
+                        help='Comma-separated concurrency levels')
+    parser.add_argument('--requests', type=int, default=100,
+                        help='Queries per concurrency level')
+    parser.add_argument('--warmup', type=int, default=5,
+                        help='Unmeasured queries before the first level')
+    parser.add_argument('--mode', choices=['thread', 'async'], default='thread',
+                        help='Sync pipeline on a thread pool, or async pipeline on one event loop')
+    parser.add_argument('--pipeline-mode', dest='pipeline_mode', choices=['agentic', 'direct', 'auto'], default=None,
+                        help='Pipeline mode of every request (default: PIPELINE_MODE)')
+    parser.add_argument('--backend', choices=['atlas', 'local'], default='atlas',
+                        help='Vector backend (local builds the in-process index from the fake collection)')
+    parser.add_argument('--llm-latency', type=str, default='lognormal:500,0.35',
+                        help='LLM call latency spec (ms)')
+    parser.add_argument('--embed-latency', type=str, default='normal:8,2',
+                        help='Embedding call latency spec (ms)')
+    parser.add_argument('--db-latency', type=str, default='lognormal:40,0.3',
+                        help='Vector search latency spec (ms)')
+    parser.add_argument('--web-latency', type=str, default='lognormal:900,0.4',
+                        help='Web search latency spec (ms)')
+    parser.add_argument('--chunks-per-section', type=int, default=25,
+                        help='Synthetic corpus size per section')
+    parser.add_argument('--caches', action='store_true',
+                        help='Keep semantic/decomposition/web caches and query/search coalescing enabled')
+    parser.add_argument('--seed', type=int, default=7,
+                        help='Random seed for corpus, workload and latencies')
+    parser.add_argument('--output', type=str, default=None,
+                        help='Write JSON results to this file (default: stdout)')
+    parser.add_argument('--baseline', type=str, default=None,
+                        help='Previous results file to compare against (report on stderr)')
+    parser.add_argument('--verbose', action='store_true',
+                        help='Show pipeline logs')
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.ERROR,
+        format='%(asctime)s [%(levelname)s] %(message)s',
+        stream=sys.stderr
+    )
+
+    levels = [int(level) for level in args.concurrency.split(',') if level.strip()]
+    orchestrator = build_orchestrator(args)
+    orchestrator.wait_until_warm()
+
+    if args.warmup:
+        run_level(orchestrator, build_workload(args.warmup, seed=args.seed + 100), 1, args.mode, args.pipeline_mode)
+
+    results = []
+    for i, concurrency in enumerate(levels):
+        queries = build_workload(args.requests, seed=args.seed + i)
+        result = run_level(orchestrator, queries, concurrency, args.mode, args.pipeline_mode)
+        print(
+            f"{args.mode} c={concurrency}: {result['throughputQps']} qps, "
+            f"p50 {result['latency']['total']['p50Ms']} ms, p95 {result['latency']['total']['p95Ms']} ms",
+            file=sys.stderr
+        )
+        results.append(result)
+
+    report = {
+        "version": RESULTS_VERSION,
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "config": {
+            key: value for key, value in vars(args).items()
+            if key not in ("output", "baseline", "verbose")
+        },
+        "results": results,
+    }
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        print("\n".join(compare(report, baseline)), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
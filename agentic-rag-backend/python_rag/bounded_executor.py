@@ -0,0 +1,168 @@
+"""
+Bounded Executor Module
+=======================
+Long-lived thread pool shared by all requests, with a bounded backlog
+and queue/saturation accounting, plus deadline-based collection of its
+futures so a slow task can be abandoned instead of stalling its caller.
+
+Features:
+- Fixed worker count; submissions beyond max_queue waiting tasks are
+  rejected (ExecutorSaturated) instead of piling up
+- Queue depth, active workers, saturation and peak counters
+- Queue wait (submit -> start) latency distribution
+- gather_until splits futures into done and late at a deadline; abandon
+  cancels late futures still queued and leaves running ones to finish
+  unobserved
+
+Author: RAG Research Team
+Date: November 2025
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Dict, Hashable, Iterable, Tuple
+
+from metrics import LatencyHistogram
+
+
+class ExecutorSaturated(RuntimeError):
+    """Raised when a submission would exceed the executor's backlog limit."""
+
+
+class BoundedExecutor(ThreadPoolExecutor):
+    """
+    ThreadPoolExecutor with a bounded backlog and load statistics.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int = 0, thread_name_prefix: str = ""):
+        """
+        Initialize the pool.
+
+        Args:
+            max_workers: Number of worker threads
+            max_queue: Maximum tasks waiting for a worker (0 = unbounded)
+            thread_name_prefix: Worker thread name prefix
+        """
+        super().__init__(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+
+        self._stats_lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._queue_wait = LatencyHistogram()
+        self.stats = {
+            "submitted": 0,
+            "completed": 0,
+            "rejected": 0,
+            "cancelled": 0,
+            "abandoned": 0,
+            "peakQueued": 0,
+            "peakActive": 0,
+        }
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """
+        Schedule fn(*args, **kwargs) on a worker.
+
+        Raises:
+            ExecutorSaturated: If max_queue tasks are already waiting
+        """
+        with self._stats_lock:
+            if self.max_queue and self._queued >= self.max_queue:
+                self.stats["rejected"] += 1
+                raise ExecutorSaturated(
+                    f"{self._thread_name_prefix or 'executor'} backlog full ({self._queued} queued)"
+                )
+            self._queued += 1
+            self.stats["submitted"] += 1
+            self.stats["peakQueued"] = max(self.stats["peakQueued"], self._queued)
+
+        try:
+            future = super().submit(self._run, time.perf_counter(), fn, args, kwargs)
+        except BaseException:
+            with self._stats_lock:
+                self._queued -= 1
+            raise
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _run(self, submitted: float, fn, args, kwargs):
+        """Worker-side wrapper: move the task from queued to active."""
+        with self._stats_lock:
+            self._queued -= 1
+            self._active += 1
+            self.stats["peakActive"] = max(self.stats["peakActive"], self._active)
+            self._queue_wait.observe((time.perf_counter() - submitted) * 1000)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._stats_lock:
+                self._active -= 1
+                self.stats["completed"] += 1
+
+    def _on_done(self, future: Future):
+        """Account for tasks cancelled before a worker picked them up."""
+        if future.cancelled():
+            with self._stats_lock:
+                self._queued -= 1
+                self.stats["cancelled"] += 1
+
+    def abandon(self, futures: Iterable[Future]) -> int:
+        """
+        Give up on futures past their deadline.
+
+        Queued futures are cancelled; running ones cannot be interrupted
+        and finish in the background with their result discarded.
+
+        Args:
+            futures: Futures from this executor
+
+        Returns:
+            Number of futures that were already running
+        """
+        running = sum(1 for future in futures if not future.cancel())
+        with self._stats_lock:
+            self.stats["abandoned"] += running
+        return running
+
+    @property
+    def queue_depth(self) -> int:
+        """Tasks waiting for a worker."""
+        return self._queued
+
+    def get_stats(self) -> Dict:
+        """
+        Get load statistics.
+
+        Returns:
+            Dictionary with queue depth, active workers, saturation
+            (active / max workers), queue wait percentiles and counters
+        """
+        with self._stats_lock:
+            return {
+                "maxWorkers": self.max_workers,
+                "maxQueue": self.max_queue,
+                "queued": self._queued,
+                "active": self._active,
+                "saturation": round(self._active / self.max_workers, 4),
+                "queueWait": self._queue_wait.snapshot(),
+                **self.stats,
+            }
+
+
+def gather_until(futures: Dict[Future, Hashable], deadline: float) -> Tuple[Dict[Hashable, Future], Dict[Hashable, Future]]:
+    """
+    Wait for futures until a deadline.
+
+    Args:
+        futures: Dictionary of future -> key
+        deadline: time.perf_counter() value to stop waiting at
+
+    Returns:
+        (done, late): key -> future for the futures finished by the
+        deadline (result or exception) and for those still pending
+    """
+    done, pending = wait(futures, timeout=max(0.0, deadline - time.perf_counter()))
+    return {futures[future]: future for future in done}, {futures[future]: future for future in pending}
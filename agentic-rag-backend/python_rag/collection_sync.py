@@ -0,0 +1,236 @@
+"""
+Collection Sync Module
+======================
+Shared loading and change detection for the in-process indexes mirrored
+from the FYP.Main collection (LocalVectorIndex, LexicalIndex).
+
+Every chunk gets a signature: its updatedAt timestamp when the document
+carries one, otherwise a SHA-1 digest of the indexed fields. The periodic
+refresh compares signatures with the source collection, so new, removed
+and edited chunks (content, metadata or embedding) are all picked up and
+only the changed ones are handed to the index. corpus_signature digests
+the same signatures into one token for cache invalidation.
+
+Author: RAG Research Team
+Date: November 2025
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def document_signature(doc: Dict, fields: Iterable[str]) -> str:
+    """
+    Change-detection signature of a source document.
+
+    Args:
+        doc: Document from the source collection
+        fields: Indexed fields hashed when the document has no updatedAt
+
+    Returns:
+        "t:<updatedAt>" for timestamped documents, else "h:<sha1 of fields>"
+    """
+    updated_at = doc.get("updatedAt")
+    if updated_at is not None:
+        return f"t:{updated_at}"
+
+    payload = json.dumps(
+        {field: doc.get(field) for field in fields if field not in ("_id", "updatedAt")},
+        sort_keys=True,
+        default=str,
+    )
+    return "h:" + hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def collection_signatures(collection, projection: Dict) -> Tuple[Dict[str, object], Dict[str, str], Dict[str, Dict]]:
+    """
+    Signatures of every document in a collection.
+
+    A first pass reads only _id and updatedAt; documents without updatedAt
+    are then fetched with the projection and hashed.
+
+    Args:
+        collection: pymongo collection
+        projection: Indexed fields (hashed for unstamped documents)
+
+    Returns:
+        (ids, signatures, fetched): original _id values and signatures keyed
+        by string id, and the documents fetched along the way
+    """
+    stubs = list(collection.find({}, {"_id": 1, "updatedAt": 1}))
+    ids = {str(doc["_id"]): doc["_id"] for doc in stubs}
+    signatures: Dict[str, str] = {}
+    fetched: Dict[str, Dict] = {}
+
+    unstamped = [doc["_id"] for doc in stubs if doc.get("updatedAt") is None]
+    for doc in stubs:
+        if doc.get("updatedAt") is not None:
+            signatures[str(doc["_id"])] = document_signature(doc, projection)
+    if unstamped:
+        query = {} if len(unstamped) == len(stubs) else {"_id": {"$in": unstamped}}
+        for doc in collection.find(query, {**projection, "updatedAt": 1}):
+            doc_id = str(doc["_id"])
+            fetched[doc_id] = doc
+            signatures[doc_id] = document_signature(doc, projection)
+    return ids, signatures, fetched
+
+
+def corpus_signature(collection, projection: Dict) -> str:
+    """
+    Digest of a whole collection that changes whenever a document is
+    added, removed or edited (also when the document count stays the same).
+
+    Args:
+        collection: pymongo collection
+        projection: Fields whose edits should change the digest
+
+    Returns:
+        SHA-1 hex digest over every document's id and signature
+    """
+    _, signatures, _ = collection_signatures(collection, projection)
+    digest = hashlib.sha1()
+    for doc_id in sorted(signatures):
+        digest.update(f"{doc_id}={signatures[doc_id]}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class SyncedIndex:
+    """
+    Base class for indexes loaded from, and kept in sync with, a source
+    collection.
+
+    Subclasses set PROJECTION and SYNC_NAME, expose a size property and
+    implement _replace_documents (full load) and _apply_changes (sync).
+    """
+
+    # Fields loaded from the source collection (and hashed for change detection)
+    PROJECTION: Dict = {}
+    SYNC_NAME = "Index"
+
+    def __init__(self, collection=None, refresh_interval: float = 0):
+        """
+        Initialize sync state, optionally bound to a source collection.
+
+        Args:
+            collection: Optional pymongo collection to load and sync from
+            refresh_interval: Seconds between background diff syncs (0 = disabled)
+        """
+        self.collection = collection
+        self.refresh_interval = refresh_interval
+
+        self._lock = threading.RLock()
+        self._signatures: Dict[str, str] = {}
+
+        self._stop_event = threading.Event()
+        self._sync_thread = None
+
+    # ------------------------------------------------------------------
+    # Hooks
+    # ------------------------------------------------------------------
+
+    def _replace_documents(self, documents: List[Dict]):
+        """Replace the whole index with documents."""
+        raise NotImplementedError
+
+    def _apply_changes(self, documents: List[Dict], removed_ids: Set[str]):
+        """Index new or edited documents and drop removed ids."""
+        raise NotImplementedError
+
+    # ------------------------------------------------------------------
+    # Loading and sync
+    # ------------------------------------------------------------------
+
+    def load(self) -> int:
+        """
+        Load every chunk from the source collection, replacing the index.
+
+        Returns:
+            Number of indexed chunks
+        """
+        if self.collection is None:
+            raise ValueError(f"No source collection configured for {self.SYNC_NAME.lower()}")
+
+        start_time = time.time()
+        documents = self._fetch({})
+        signatures = {str(doc["_id"]): document_signature(doc, self.PROJECTION) for doc in documents}
+        with self._lock:
+            self._replace_documents(documents)
+            self._signatures = signatures
+
+        logger.info(f"{self.SYNC_NAME} loaded {self.size} chunks in {time.time() - start_time:.2f}s")
+        return self.size
+
+    def refresh(self) -> bool:
+        """
+        Diff the index against the source collection by signature (see
+        collection_signatures). Only new and edited documents are
+        re-indexed, removed ids are dropped.
+
+        Returns:
+            True if the index changed, False otherwise
+        """
+        if self.collection is None:
+            return False
+
+        # remote_ids keeps the original _id types for the $in lookup
+        remote_ids, remote, fetched = collection_signatures(self.collection, self.PROJECTION)
+
+        with self._lock:
+            local = dict(self._signatures)
+
+        changed = [doc_id for doc_id, signature in remote.items() if local.get(doc_id) != signature]
+        removed = local.keys() - remote.keys()
+        if not changed and not removed:
+            logger.debug(f"{self.SYNC_NAME} up to date")
+            return False
+
+        missing = [remote_ids[doc_id] for doc_id in changed if doc_id not in fetched]
+        if missing:
+            for doc in self._fetch({"_id": {"$in": missing}}):
+                fetched[str(doc["_id"])] = doc
+        documents = [fetched[doc_id] for doc_id in changed if doc_id in fetched]
+
+        with self._lock:
+            self._apply_changes(documents, set(removed))
+            for doc_id in removed:
+                self._signatures.pop(doc_id, None)
+            self._signatures.update({doc_id: remote[doc_id] for doc_id in changed})
+
+        added = sum(1 for doc_id in changed if doc_id not in local)
+        logger.info(
+            f"{self.SYNC_NAME} synced: +{added} ~{len(changed) - added} -{len(removed)} chunks "
+            f"(total {self.size})"
+        )
+        return True
+
+    def start_sync(self):
+        """Start the background diff-sync thread (if refresh_interval > 0)."""
+        if self.refresh_interval <= 0 or self._sync_thread is not None:
+            return
+
+        def _loop():
+            while not self._stop_event.wait(self.refresh_interval):
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logger.error(f"{self.SYNC_NAME} sync failed: {e}", exc_info=True)
+
+        thread_name = self.SYNC_NAME.lower().replace(" ", "-") + "-sync"
+        self._sync_thread = threading.Thread(target=_loop, name=thread_name, daemon=True)
+        self._sync_thread.start()
+        logger.debug(f"{self.SYNC_NAME} sync every {self.refresh_interval}s")
+
+    def stop_sync(self):
+        """Stop the background diff-sync thread."""
+        self._stop_event.set()
+        self._sync_thread = None
+
+    def _fetch(self, query: Dict) -> List[Dict]:
+        """Fetch documents with the indexed fields and updatedAt."""
+        return list(self.collection.find(query, {**self.PROJECTION, "updatedAt": 1}))
@@ -0,0 +1,272 @@
+"""
+Context Packer Module
+=====================
+Packs validated results into the synthesis prompt: fewer, shorter,
+non-redundant contexts mean fewer input tokens on every request.
+
+Runs between result validation and answer synthesis:
+1. Near-duplicate removal with MMR (maximal marginal relevance) over the
+   result embeddings (returned by the vector search; web snippets are
+   embedded in one batch)
+2. Sentence trimming: long chunks keep only the sentences that share terms
+   with the query
+3. Prompt-token budget: contexts are admitted in MMR order until the
+   budget is spent (the last one may be cut at a sentence boundary)
+
+Packed results are new dictionaries: the retriever's cached web results
+are shared between requests and are never modified.
+
+Features:
+- Configurable duplicate threshold, MMR lambda, sentence cap and budget
+- Section grouping and within-section rank order preserved
+- Packing statistics (tokens in/out, duplicates dropped, chunks trimmed)
+
+Author: RAG Research Team
+Date: November 2025
+"""
+
+import logging
+import re
+import threading
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Sentence boundaries: end punctuation followed by whitespace, or line breaks
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+_TERM_PATTERN = re.compile(r"\w+")
+
+# Query words that carry no retrieval signal
+_STOPWORDS = frozenset(
+    "a an and are at be by can do does for from how i in is it me my of on or "
+    "the to what when where which who why will with you your".split()
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count (about 4 characters per token for English)."""
+    return (len(text) + 3) // 4
+
+
+class ContextPacker:
+    """
+    Deduplicates, trims and budgets synthesis contexts.
+    """
+
+    def __init__(
+        self,
+        embed_texts: Callable[[List[str]], List[List[float]]],
+        token_budget: int = 1500,
+        duplicate_threshold: float = 0.92,
+        mmr_lambda: float = 0.7,
+        max_sentences: int = 6,
+        max_per_section: int = 3
+    ):
+        """
+        Initialize packer with configuration.
+
+        Args:
+            embed_texts: Batch embedding function (Retriever.embed_queries)
+            token_budget: Maximum estimated tokens across all contexts
+            duplicate_threshold: Cosine similarity at which a result counts
+                as a near-duplicate of an already selected one
+            mmr_lambda: Relevance vs. novelty trade-off of the MMR order
+            max_sentences: Sentences kept per trimmed chunk
+            max_per_section: Results considered per section (the synthesis
+                prompt shows at most this many)
+        """
+        self.embed_texts = embed_texts
+        self.token_budget = token_budget
+        self.duplicate_threshold = duplicate_threshold
+        self.mmr_lambda = mmr_lambda
+        self.max_sentences = max_sentences
+        self.max_per_section = max_per_section
+
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "tokensIn": 0, "tokensOut": 0, "duplicatesDropped": 0,
+                      "trimmed": 0, "overBudget": 0}
+
+    def pack(
+        self,
+        query: str,
+        section_results: Dict[str, List[Dict]],
+        query_embedding: Optional[List[float]] = None
+    ) -> Dict[str, List[Dict]]:
+        """
+        Pack validated results for synthesis.
+
+        Args:
+            query: User query
+            section_results: Validated results per section
+            query_embedding: Optional precomputed query embedding
+
+        Returns:
+            Packed results per section (new dictionaries; empty sections removed)
+        """
+        candidates = []
+        for section, results in section_results.items():
+            for result in results[:self.max_per_section]:
+                text = result.get("content") or result.get("text") or result.get("snippet") or ""
+                if text:
+                    candidates.append({"section": section, "result": result, "text": text})
+        if not candidates:
+            return {}
+
+        vectors = self._embed(query, query_embedding, candidates)
+        order, duplicates = self._mmr_order(vectors)
+        query_terms = self._terms(query)
+
+        tokens_in = sum(estimate_tokens(c["text"]) for c in candidates)
+        remaining = self.token_budget
+        packed_ids = {}
+        trimmed = over_budget = 0
+
+        for index in order:
+            candidate = candidates[index]
+            text = self._trim(candidate["text"], query_terms)
+            if text != candidate["text"]:
+                trimmed += 1
+
+            cost = estimate_tokens(text)
+            if cost > remaining:
+                text = self._cut_to_budget(text, remaining)
+                over_budget += 1
+                if not text:
+                    continue
+                cost = estimate_tokens(text)
+            remaining -= cost
+            packed_ids[index] = text
+
+        # Restore section grouping and rank order
+        packed: Dict[str, List[Dict]] = {}
+        for index, candidate in enumerate(candidates):
+            if index not in packed_ids:
+                continue
+            result = {key: value for key, value in candidate["result"].items() if key != "embedding"}
+            result["content"] = packed_ids[index]
+            packed.setdefault(candidate["section"], []).append(result)
+
+        tokens_out = sum(estimate_tokens(text) for text in packed_ids.values())
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["tokensIn"] += tokens_in
+            self.stats["tokensOut"] += tokens_out
+            self.stats["duplicatesDropped"] += duplicates
+            self.stats["trimmed"] += trimmed
+            self.stats["overBudget"] += over_budget
+
+        logger.debug(
+            f"Packed {len(packed_ids)}/{len(candidates)} contexts: ~{tokens_in} -> ~{tokens_out} tokens "
+            f"({duplicates} duplicates, {trimmed} trimmed)"
+        )
+        return packed
+
+    def _embed(self, query: str, query_embedding: Optional[List[float]], candidates: List[Dict]) -> np.ndarray:
+        """
+        Unit vectors for [query, *candidates], embedding only what is missing.
+
+        Returns:
+            Matrix with the query in row 0
+        """
+        vectors: List[Optional[List[float]]] = [query_embedding] + [
+            c["result"].get("embedding") for c in candidates
+        ]
+        texts = [query] + [c["text"] for c in candidates]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            for i, vector in zip(missing, self.embed_texts([texts[i] for i in missing])):
+                vectors[i] = vector
+
+        matrix = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.clip(norms, 1e-12, None)
+
+    def _mmr_order(self, vectors: np.ndarray):
+        """
+        Greedy MMR ranking of the candidates, dropping near-duplicates.
+
+        Args:
+            vectors: Unit vectors, query first
+
+        Returns:
+            (candidate indices in selection order, number of duplicates dropped)
+        """
+        relevance = vectors[1:] @ vectors[0]
+        similarity = vectors[1:] @ vectors[1:].T
+
+        remaining = list(range(len(relevance)))
+        selected: List[int] = []
+        duplicates = 0
+        while remaining:
+            if selected:
+                redundancy = similarity[np.ix_(remaining, selected)].max(axis=1)
+            else:
+                redundancy = np.zeros(len(remaining), dtype=np.float32)
+
+            keep = redundancy < self.duplicate_threshold
+            duplicates += int((~keep).sum())
+            remaining = [index for index, kept in zip(remaining, keep) if kept]
+            redundancy = redundancy[keep]
+            if not remaining:
+                break
+
+            scores = self.mmr_lambda * relevance[remaining] - (1 - self.mmr_lambda) * redundancy
+            selected.append(remaining.pop(int(np.argmax(scores))))
+        return selected, duplicates
+
+    @staticmethod
+    def _terms(text: str) -> set:
+        return {term for term in _TERM_PATTERN.findall(text.lower()) if term not in _STOPWORDS}
+
+    def _trim(self, text: str, query_terms: set) -> str:
+        """
+        Keep the query-relevant sentences of a long chunk.
+
+        Up to max_sentences sentences sharing terms with the query are kept
+        (most shared terms first, emitted in their original order); a chunk
+        with no overlapping sentence keeps its opening sentences (it matched
+        on meaning, not wording).
+        """
+        sentences = [s.strip() for s in _SENTENCE_SPLIT.split(text) if s.strip()]
+        if len(sentences) <= self.max_sentences:
+            return text
+
+        overlaps = [len(query_terms & self._terms(sentence)) for sentence in sentences]
+        if not any(overlaps):
+            keep = range(self.max_sentences)
+        else:
+            ranked = sorted(range(len(sentences)), key=lambda i: (-overlaps[i], i))
+            keep = sorted(i for i in ranked[:self.max_sentences] if overlaps[i])
+        return " ".join(sentences[i] for i in keep)
+
+    @staticmethod
+    def _cut_to_budget(text: str, budget: int) -> str:
+        """Longest sentence prefix of text within budget tokens ("" if none)."""
+        kept = []
+        used = 0
+        for sentence in _SENTENCE_SPLIT.split(text):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            cost = estimate_tokens(sentence) + (1 if kept else 0)
+            if used + cost > budget:
+                break
+            kept.append(sentence)
+            used += cost
+        return " ".join(kept)
+
+    def get_stats(self) -> Dict:
+        """
+        Get packing statistics.
+
+        Returns:
+            Dictionary with request count, token totals and drop/trim counts
+        """
+        with self._lock:
+            stats = dict(self.stats)
+        stats["tokenReduction"] = (
+            round(1 - stats["tokensOut"] / stats["tokensIn"], 4) if stats["tokensIn"] else 0.0
+        )
+        return stats
@@ -0,0 +1,305 @@
+"""
+Embedding Cache Module
+======================
+Two-tier cache of query embeddings, so repeated subqueries ("MahaDBT
+scholarship eligibility", ...) skip the model's forward pass.
+
+Tier 1 is an in-process LRU (TTLCache) keyed by normalized text. Tier 2 is
+a persistent, memory-mapped float32 store with an open-addressing hash
+index that several worker processes share: lookups are lock-free reads of
+the mapped file, inserts take a file lock.
+
+Both tiers are versioned by the embedding model id (model name + backend):
+the store file name and header carry it, so swapping models starts a new
+store instead of serving vectors from the old one.
+
+Store layout (one file per model id and dimension):
+    header (4 KiB): magic, dimension, slot count, model id
+    keys:    uint64[slots]        (0 = empty slot)
+    vectors: float32[slots, dim]
+
+Features:
+- Text normalization (case and whitespace; the model is uncased)
+- Batch lookups for embed_queries
+- Seqlock-style reads: a slot is used only if its key is unchanged after
+  the vector is copied, so readers never see a half-written vector
+- Per-tier hit/miss statistics
+
+Author: RAG Research Team
+Date: November 2025
+"""
+
+import hashlib
+import logging
+import os
+import re
+import struct
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ttl_cache import TTLCache
+
+try:
+    import fcntl
+except ImportError:  # Windows: the store is then only safe within one process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_STORE_MAGIC = b"RAGEMB01"
+_HEADER_BYTES = 4096
+_HEADER_FORMAT = "<8sII"
+
+# Slots inspected per lookup/insert before evicting the home slot
+_MAX_PROBES = 8
+
+
+def normalize_text(text: str) -> str:
+    """Cache key form of a query: lowercased, whitespace collapsed."""
+    return " ".join(text.lower().split())
+
+
+class MmapEmbeddingStore:
+    """
+    Fixed-size, memory-mapped hash table of float32 vectors shared across
+    processes.
+    """
+
+    def __init__(self, directory: str, model_id: str, dimension: int, slots: int = 16384):
+        """
+        Open (or create) the store for one model.
+
+        Args:
+            directory: Directory holding store files
+            model_id: Embedding model identifier (part of the file name)
+            dimension: Vector dimension
+            slots: Table capacity (used only when creating the file)
+        """
+        self.model_id = model_id
+        self.dimension = dimension
+
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_id).strip("_")
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        self.path = Path(directory) / f"embeddings-{slug}-{dimension}d.f32"
+
+        self._thread_lock = threading.Lock()
+        self._lock_file = open(f"{self.path}.lock", "a+b")
+
+        with self._write_lock():
+            if not self.path.exists():
+                self._create(slots)
+            self.slots = self._read_header()
+
+        self.keys = np.memmap(self.path, dtype=np.uint64, mode="r+", offset=_HEADER_BYTES, shape=(self.slots,))
+        self.vectors = np.memmap(
+            self.path, dtype=np.float32, mode="r+",
+            offset=_HEADER_BYTES + self.slots * 8, shape=(self.slots, dimension)
+        )
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        logger.info(f"Embedding store opened: {self.path} ({self.slots} slots)")
+
+    @contextmanager
+    def _write_lock(self):
+        """Exclusive lock across threads and (where fcntl exists) processes."""
+        with self._thread_lock:
+            if fcntl is not None:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _create(self, slots: int):
+        """Write an empty store atomically (temp file + rename)."""
+        model_bytes = self.model_id.encode("utf-8")
+        header = struct.pack(_HEADER_FORMAT, _STORE_MAGIC, self.dimension, slots)
+        header += struct.pack("<H", len(model_bytes)) + model_bytes
+
+        tmp_path = self.path.with_suffix(f".tmp{os.getpid()}")
+        with open(tmp_path, "wb") as f:
+            f.write(header.ljust(_HEADER_BYTES, b"\0"))
+            f.truncate(_HEADER_BYTES + slots * 8 + slots * self.dimension * 4)
+        os.replace(tmp_path, self.path)
+
+    def _read_header(self) -> int:
+        """Validate the header against this model; return the slot count."""
+        with open(self.path, "rb") as f:
+            header = f.read(_HEADER_BYTES)
+
+        magic, dimension, slots = struct.unpack_from(_HEADER_FORMAT, header)
+        offset = struct.calcsize(_HEADER_FORMAT)
+        (length,) = struct.unpack_from("<H", header, offset)
+        model_id = header[offset + 2:offset + 2 + length].decode("utf-8", errors="replace")
+
+        if magic != _STORE_MAGIC or dimension != self.dimension or model_id != self.model_id:
+            raise ValueError(
+                f"Embedding store {self.path} belongs to {model_id} ({dimension}d), "
+                f"not {self.model_id} ({self.dimension}d)"
+            )
+        return slots
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        value = int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+        return value or 1
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """
+        Look up a vector without locking.
+
+        Args:
+            key: Normalized text
+
+        Returns:
+            Copy of the stored vector, or None
+        """
+        hashed = self._hash(key)
+        home = hashed % self.slots
+        for probe in range(_MAX_PROBES):
+            slot = (home + probe) % self.slots
+            stored = int(self.keys[slot])
+            if stored == 0:
+                break
+            if stored == hashed:
+                vector = np.array(self.vectors[slot])
+                # A concurrent overwrite clears/changes the key first
+                if int(self.keys[slot]) == hashed:
+                    self.hits += 1
+                    return vector
+                break
+        self.misses += 1
+        return None
+
+    def put(self, key: str, vector: np.ndarray):
+        """
+        Insert a vector (no-op if already present).
+
+        Args:
+            key: Normalized text
+            vector: Vector of the store's dimension
+        """
+        hashed = self._hash(key)
+        home = hashed % self.slots
+        with self._write_lock():
+            target = home
+            for probe in range(_MAX_PROBES):
+                slot = (home + probe) % self.slots
+                stored = int(self.keys[slot])
+                if stored == hashed:
+                    return
+                if stored == 0:
+                    target = slot
+                    break
+
+            # Unpublish, write, publish: readers re-check the key after copying
+            self.keys[target] = 0
+            self.vectors[target] = vector
+            self.keys[target] = hashed
+            self.writes += 1
+
+    def get_stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "path": str(self.path),
+            "slots": self.slots,
+            "used": int(np.count_nonzero(self.keys)),
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "hitRate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+    def close(self):
+        self.keys.flush()
+        self.vectors.flush()
+        self._lock_file.close()
+
+
+class EmbeddingCache:
+    """
+    In-process LRU in front of an optional shared MmapEmbeddingStore.
+    """
+
+    def __init__(
+        self,
+        model_id: str,
+        max_entries: int = 4096,
+        store_dir: Optional[str] = None,
+        dimension: Optional[int] = None,
+        store_slots: int = 16384
+    ):
+        """
+        Initialize both tiers.
+
+        Args:
+            model_id: Embedding model identifier (versions both tiers)
+            max_entries: LRU capacity of tier 1
+            store_dir: Directory of the shared store (None = tier 1 only)
+            dimension: Vector dimension (required for the store)
+            store_slots: Capacity of a newly created store
+        """
+        self.model_id = model_id
+        self.memory = TTLCache(max_entries=max_entries, ttl_seconds=float("inf"))
+        self.store: Optional[MmapEmbeddingStore] = None
+
+        if store_dir and dimension:
+            try:
+                self.store = MmapEmbeddingStore(store_dir, model_id, dimension, store_slots)
+            except Exception as e:
+                logger.warning(f"Shared embedding store unavailable, using in-process cache only: {e}")
+
+    def get(self, text: str) -> Optional[List[float]]:
+        """
+        Cached embedding of a text, or None.
+
+        Args:
+            text: Query text (normalized internally)
+
+        Returns:
+            Embedding vector or None
+        """
+        key = normalize_text(text)
+        vector = self.memory.get(key, None)
+        if vector is None and self.store is not None:
+            vector = self.store.get(key)
+            if vector is not None:
+                self.memory.set(key, vector)
+        return vector.tolist() if vector is not None else None
+
+    def put(self, text: str, embedding: List[float]):
+        """
+        Cache an embedding in both tiers.
+
+        Args:
+            text: Query text (normalized internally)
+            embedding: Embedding vector
+        """
+        key = normalize_text(text)
+        vector = np.asarray(embedding, dtype=np.float32)
+        self.memory.set(key, vector)
+        if self.store is not None:
+            try:
+                self.store.put(key, vector)
+            except Exception as e:
+                logger.warning(f"Embedding store write failed: {e}")
+
+    def get_stats(self) -> Dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with model id and per-tier statistics
+        """
+        return {
+            "modelId": self.model_id,
+            "memory": self.memory.get_stats(),
+            "store": self.store.get_stats() if self.store is not None else None,
+        }
@@ -0,0 +1,363 @@
+"""
+Embedding Backends Module
+=========================
+Query embedding models for the Retriever.
+
+The "torch" backend is sentence-transformers' all-MiniLM-L6-v2 (full
+PyTorch). The "onnx" backend runs an exported, int8-quantized ONNX copy
+of the same model on onnxruntime with the model's own fast tokenizer, so
+a worker needs neither torch nor transformers at runtime.
+
+Both backends expose SentenceTransformer's encode() contract (str -> 1-D
+array, list -> 2-D array) and produce mean-pooled, L2-normalized 384-d
+vectors, so ONNX queries search the existing mainindex unchanged.
+
+Features:
+- OnnxEmbeddingModel: onnxruntime + tokenizers, batched, thread-safe
+- export_onnx(): one-off export and dynamic int8 quantization (needs
+  torch/transformers/onnx on the exporting machine only)
+- check_parity(): cosine agreement of ONNX vs torch embeddings
+- create_embedding_model(): backend factory used by the Retriever
+
+Usage:
+    python embeddings.py --export models/all-MiniLM-L6-v2-onnx
+    python embeddings.py --check-parity models/all-MiniLM-L6-v2-onnx
+
+Author: RAG Research Team
+Date: November 2025
+"""
+
+import os
+import sys
+import json
+import logging
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Model the mainindex vectors were built with
+DEFAULT_MODEL_NAME = "all-MiniLM-L6-v2"
+
+# sentence-transformers truncates all-MiniLM-L6-v2 inputs at 256 tokens
+DEFAULT_MAX_SEQ_LENGTH = 256
+
+# Files written by export_onnx
+QUANTIZED_MODEL_FILE = "model_int8.onnx"
+FULL_MODEL_FILE = "model.onnx"
+TOKENIZER_FILE = "tokenizer.json"
+CONFIG_FILE = "embedding_config.json"
+
+# Sentences used by check_parity when none are given
+PARITY_SENTENCES = [
+    "What are the admission requirements for first year engineering?",
+    "How do I apply for the post-matric scholarship on the MahaDBT portal?",
+    "Where is my exam center for the winter semester?",
+    "What is the fee structure for the hostel?",
+    "How can I reset my student portal ERP password?",
+    "Who is the head of the computer engineering department?",
+    "Is there a library late fine for returning books after the due date?",
+    "Canteen timings on weekends",
+    "placement statistics 2024 average package",
+    "syllabus for third year information technology",
+]
+
+
+class OnnxEmbeddingModel:
+    """
+    Sentence embedding model on onnxruntime (no PyTorch).
+
+    Reproduces the sentence-transformers pipeline of all-MiniLM-L6-v2:
+    WordPiece tokenization, transformer forward pass, attention-masked
+    mean pooling and L2 normalization.
+    """
+
+    def __init__(
+        self,
+        model_dir: Union[str, Path],
+        max_seq_length: Optional[int] = None,
+        batch_size: int = 32,
+        num_threads: Optional[int] = None
+    ):
+        """
+        Load the ONNX session and tokenizer exported by export_onnx().
+
+        Args:
+            model_dir: Directory with model_int8.onnx (or model.onnx),
+                tokenizer.json and embedding_config.json
+            max_seq_length: Truncation length (default: from the config)
+            batch_size: Sentences per forward pass
+            num_threads: onnxruntime intra-op threads (default: runtime choice)
+        """
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        self.model_dir = Path(model_dir)
+        config_path = self.model_dir / CONFIG_FILE
+        config = json.loads(config_path.read_text()) if config_path.exists() else {}
+
+        self.model_name = config.get("model_name", DEFAULT_MODEL_NAME)
+        self.max_seq_length = max_seq_length or config.get("max_seq_length", DEFAULT_MAX_SEQ_LENGTH)
+        self.batch_size = batch_size
+
+        model_path = self.model_dir / QUANTIZED_MODEL_FILE
+        self.quantized = model_path.exists()
+        if not self.quantized:
+            model_path = self.model_dir / FULL_MODEL_FILE
+        if not model_path.exists():
+            raise FileNotFoundError(
+                f"No ONNX model in {self.model_dir}; run: python embeddings.py --export {self.model_dir}"
+            )
+
+        options = onnxruntime.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = onnxruntime.InferenceSession(
+            str(model_path), sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {node.name for node in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(str(self.model_dir / TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=self.max_seq_length)
+        self.tokenizer.enable_padding(
+            pad_id=config.get("pad_token_id", 0),
+            pad_token=config.get("pad_token", "[PAD]")
+        )
+
+        logger.info(
+            f"ONNX embedding model loaded: {model_path.name} "
+            f"({'int8' if self.quantized else 'fp32'}, max_seq_length={self.max_seq_length})"
+        )
+
+    @property
+    def model_id(self) -> str:
+        """Identifier of the vectors this model produces (model + precision)."""
+        return f"{self.model_name}:onnx-{'int8' if self.quantized else 'fp32'}"
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return int(self.session.get_outputs()[0].shape[-1])
+
+    def encode(self, sentences: Union[str, List[str]], **kwargs) -> np.ndarray:
+        """
+        Embed one sentence or a list of sentences.
+
+        Args:
+            sentences: Text or list of texts
+            **kwargs: Accepted for SentenceTransformer compatibility (ignored)
+
+        Returns:
+            1-D vector for a single string, else (n, dim) array
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, self.get_sentence_embedding_dimension()), dtype=np.float32)
+
+        batches = [
+            self._encode_batch(texts[start:start + self.batch_size])
+            for start in range(0, len(texts), self.batch_size)
+        ]
+        embeddings = np.concatenate(batches, axis=0)
+        return embeddings[0] if single else embeddings
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        """Tokenize, run the transformer, mean-pool and normalize one batch."""
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        # Mean over real (non-padding) tokens
+        mask = attention_mask[:, :, None].astype(np.float32)
+        summed = (token_embeddings * mask).sum(axis=1)
+        pooled = summed / np.clip(mask.sum(axis=1), 1e-9, None)
+
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return (pooled / np.clip(norms, 1e-12, None)).astype(np.float32)
+
+
+def create_embedding_model(
+    backend: str = "torch",
+    model_name: str = DEFAULT_MODEL_NAME,
+    onnx_dir: Optional[Union[str, Path]] = None,
+    num_threads: Optional[int] = None
+):
+    """
+    Build the configured embedding model.
+
+    Args:
+        backend: "torch" (sentence-transformers) or "onnx"
+        model_name: sentence-transformers model name (torch backend)
+        onnx_dir: Directory produced by export_onnx (onnx backend)
+        num_threads: onnxruntime intra-op threads (onnx backend)
+
+    Returns:
+        Model exposing encode()
+    """
+    if backend == "onnx":
+        if onnx_dir is None:
+            raise ValueError("onnx embedding backend requires an export directory (EMBEDDING_ONNX_DIR)")
+        return OnnxEmbeddingModel(onnx_dir, num_threads=num_threads)
+
+    if backend != "torch":
+        raise ValueError(f"Unknown embedding backend: {backend}")
+
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(model_name)
+
+
+def export_onnx(
+    output_dir: Union[str, Path],
+    model_name: str = DEFAULT_MODEL_NAME,
+    quantize: bool = True,
+    opset: int = 14
+) -> Path:
+    """
+    Export the sentence-transformers model to ONNX and quantize it to int8.
+
+    Runs once on a build machine; requires torch, sentence-transformers and
+    onnxruntime (quantization tools).
+
+    Args:
+        output_dir: Destination directory
+        model_name: sentence-transformers model name
+        quantize: Also write the dynamically int8-quantized model
+        opset: ONNX opset version
+
+    Returns:
+        Path of the model the onnx backend will load
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    st_model = SentenceTransformer(model_name, device="cpu")
+    transformer = st_model[0].auto_model.eval()
+    tokenizer = st_model.tokenizer
+
+    dummy = tokenizer(["export sample"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in dummy]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    full_path = output_dir / FULL_MODEL_FILE
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            tuple(dummy[name] for name in input_names),
+            str(full_path),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+        )
+    logger.info(f"Exported {model_name} to {full_path}")
+
+    tokenizer.backend_tokenizer.save(str(output_dir / TOKENIZER_FILE))
+    (output_dir / CONFIG_FILE).write_text(json.dumps({
+        "model_name": model_name,
+        "max_seq_length": st_model.max_seq_length,
+        "dimension": st_model.get_sentence_embedding_dimension(),
+        "pad_token": tokenizer.pad_token,
+        "pad_token_id": tokenizer.pad_token_id,
+        "pooling": "mean",
+        "normalize": True,
+    }, indent=2))
+
+    if not quantize:
+        return full_path
+
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantized_path = output_dir / QUANTIZED_MODEL_FILE
+    quantize_dynamic(str(full_path), str(quantized_path), weight_type=QuantType.QInt8)
+    logger.info(
+        f"Quantized to {quantized_path} "
+        f"({full_path.stat().st_size / 1e6:.1f} MB -> {quantized_path.stat().st_size / 1e6:.1f} MB)"
+    )
+    return quantized_path
+
+
+def check_parity(
+    onnx_dir: Union[str, Path],
+    model_name: str = DEFAULT_MODEL_NAME,
+    sentences: Optional[List[str]] = None
+) -> Dict:
+    """
+    Compare ONNX embeddings against the torch model they replace.
+
+    Args:
+        onnx_dir: Directory produced by export_onnx
+        model_name: sentence-transformers reference model
+        sentences: Texts to compare (default: PARITY_SENTENCES)
+
+    Returns:
+        Dictionary with min/mean cosine similarity and whether each
+        sentence's nearest reference vector is its own
+    """
+    from sentence_transformers import SentenceTransformer
+
+    sentences = sentences or PARITY_SENTENCES
+    reference = SentenceTransformer(model_name, device="cpu").encode(sentences, normalize_embeddings=True)
+    candidate = OnnxEmbeddingModel(onnx_dir).encode(sentences)
+
+    # Both sides are unit vectors: rows of the product are cosine similarities
+    similarity = candidate @ reference.T
+    cosines = np.diag(similarity)
+
+    return {
+        "sentences": len(sentences),
+        "minCosine": round(float(cosines.min()), 5),
+        "meanCosine": round(float(cosines.mean()), 5),
+        "rankPreserved": bool((similarity.argmax(axis=1) == np.arange(len(sentences))).all()),
+    }
+
+
+def main():
+    """
+    Main entry point for CLI execution.
+    """
+    parser = argparse.ArgumentParser(description='Export and verify the ONNX embedding backend')
+    parser.add_argument('--export', type=str, metavar='DIR',
+                        help='Export the model to ONNX (and int8) into DIR')
+    parser.add_argument('--check-parity', type=str, metavar='DIR',
+                        help='Compare the ONNX model in DIR with the torch model')
+    parser.add_argument('--model', type=str, default=DEFAULT_MODEL_NAME,
+                        help='sentence-transformers model name')
+    parser.add_argument('--no-quantize', action='store_true',
+                        help='Export fp32 only')
+    parser.add_argument('--min-cosine', type=float, default=float(os.getenv("EMBEDDING_PARITY_MIN_COSINE", "0.98")),
+                        help='Parity check fails below this per-sentence cosine')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+
+    if not args.export and not args.check_parity:
+        parser.error("nothing to do: pass --export and/or --check-parity")
+
+    if args.export:
+        export_onnx(args.export, model_name=args.model, quantize=not args.no_quantize)
+
+    if args.check_parity:
+        report = check_parity(args.check_parity, model_name=args.model)
+        print(json.dumps(report, indent=2))
+        if report["minCosine"] < args.min_cosine or not report["rankPreserved"]:
+            print(f"Parity check FAILED (min cosine {report['minCosine']} < {args.min_cosine} "
+                  f"or nearest-neighbour mismatch)", file=sys.stderr)
+            sys.exit(1)
+        print("Parity check passed", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
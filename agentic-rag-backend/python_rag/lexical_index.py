@@ -0,0 +1,313 @@
+"""
+Lexical Index Module
+====================
+In-process BM25 inverted index over the FYP.Main chunks, used alongside
+vector search. Acronym-heavy queries ("ATKT", "LC", "PRN", "DSE",
+"MahaDBT") are matched exactly on their terms, which sentence embeddings
+handle poorly.
+
+Features:
+- Okapi BM25 scoring over an inverted index (term -> {doc: tf})
+- In-process section pre-filtering
+- Incremental updates: documents are added/removed one by one, and the
+  periodic diff sync against the source collection (see collection_sync)
+  only re-indexes new and edited documents
+- Keyword-query detection (few terms, all in the vocabulary, at least one
+  acronym or rare term) so such lookups can be answered locally without
+  an embedding pass
+- Reciprocal rank fusion (RRF) of several rankings
+
+Author: RAG Research Team
+Date: November 2025
+"""
+
+import logging
+import math
+import re
+from typing import Dict, Iterable, List, Optional, Set
+
+from collection_sync import SyncedIndex
+
+logger = logging.getLogger(__name__)
+
+_TERM_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Query words written with two or more capitals ("ATKT", "LC", "MahaDBT")
+_ACRONYM_PATTERN = re.compile(r"\b(?=(?:[a-z0-9]*[A-Z]){2})[A-Za-z0-9]+\b")
+
+# Words that carry no retrieval signal
+_STOPWORDS = frozenset(
+    "a an and are at be by can do does for from how i in is it me my of on or "
+    "the to what when where which who why will with you your".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase word tokens of a text, stopwords removed.
+
+    Args:
+        text: Query or chunk text
+
+    Returns:
+        List of terms (repeated terms kept, in order)
+    """
+    return [term for term in _TERM_PATTERN.findall(text.lower()) if term not in _STOPWORDS]
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = 60) -> Dict[str, float]:
+    """
+    Fuse several rankings with reciprocal rank fusion.
+
+    Each item scores sum(1 / (k + rank)) over the rankings it appears in
+    (rank starting at 1), so items ranked well by several retrievers rise
+    to the top regardless of how each retriever scales its scores.
+
+    Args:
+        rankings: Item keys per ranking, best first
+        k: Rank smoothing constant (60 in the original RRF paper)
+
+    Returns:
+        Dictionary of item key -> fused score
+    """
+    fused: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, 1):
+            fused[key] = fused.get(key, 0.0) + 1.0 / (k + rank)
+    return fused
+
+
+class LexicalIndex(SyncedIndex):
+    """
+    Incrementally updated BM25 index with section filtering.
+    """
+
+    # Fields loaded from the source collection (no embeddings)
+    PROJECTION = {"section_name": 1, "content": 1, "metadata": 1}
+    SYNC_NAME = "Lexical index"
+
+    def __init__(self, collection=None, refresh_interval: float = 0, k1: float = 1.2, b: float = 0.75):
+        """
+        Initialize an empty index, optionally bound to a source collection.
+
+        Args:
+            collection: Optional pymongo collection to load and sync from
+            refresh_interval: Seconds between background diff syncs (0 = disabled)
+            k1: BM25 term-frequency saturation
+            b: BM25 document-length normalization
+        """
+        super().__init__(collection, refresh_interval)
+        self.k1 = k1
+        self.b = b
+
+        self._docs: Dict[str, Dict] = {}
+        self._doc_terms: Dict[str, Dict[str, int]] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+        self._version = 0
+        self.stats = {"searches": 0}
+
+    @property
+    def size(self) -> int:
+        """Number of indexed chunks."""
+        return len(self._docs)
+
+    @property
+    def version(self) -> int:
+        """Monotonic counter, bumped every time the indexed corpus changes."""
+        return self._version
+
+    # ------------------------------------------------------------------
+    # Loading and incremental updates
+    # ------------------------------------------------------------------
+
+    def _replace_documents(self, documents: List[Dict]):
+        """Re-index from a full load."""
+        with self._lock:
+            self._clear()
+            self.add_documents(documents)
+
+    def _apply_changes(self, documents: List[Dict], removed_ids: Set[str]):
+        """Drop removed ids and re-index new or edited documents."""
+        with self._lock:
+            self.remove_documents(removed_ids)
+            self.add_documents(documents)
+
+    def add_documents(self, documents: Iterable[Dict]) -> int:
+        """
+        Index (or re-index) documents.
+
+        Args:
+            documents: Documents with _id, section_name, content and metadata
+
+        Returns:
+            Number of documents indexed
+        """
+        count = 0
+        with self._lock:
+            for doc in documents:
+                doc_id = str(doc.get("_id", len(self._docs)))
+                if doc_id in self._docs:
+                    self._remove(doc_id)
+
+                terms: Dict[str, int] = {}
+                for term in tokenize(doc.get("content", "")):
+                    terms[term] = terms.get(term, 0) + 1
+                for term, tf in terms.items():
+                    self._postings.setdefault(term, {})[doc_id] = tf
+
+                self._docs[doc_id] = {
+                    "_id": doc_id,
+                    "section_name": doc.get("section_name"),
+                    "content": doc.get("content", ""),
+                    "metadata": doc.get("metadata", {}),
+                    "length": sum(terms.values()),
+                }
+                self._doc_terms[doc_id] = terms
+                self._total_length += self._docs[doc_id]["length"]
+                count += 1
+            if count:
+                self._version += 1
+        return count
+
+    def remove_documents(self, doc_ids: Iterable[str]) -> int:
+        """
+        Drop documents from the index.
+
+        Args:
+            doc_ids: Document ids (as strings)
+
+        Returns:
+            Number of documents removed
+        """
+        count = 0
+        with self._lock:
+            for doc_id in doc_ids:
+                if doc_id in self._docs:
+                    self._remove(doc_id)
+                    count += 1
+            if count:
+                self._version += 1
+        return count
+
+    def _remove(self, doc_id: str):
+        """Unlink one document from the postings (caller holds the lock)."""
+        for term in self._doc_terms.pop(doc_id, {}):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._docs.pop(doc_id)["length"]
+
+    def _clear(self):
+        """Empty the index (caller holds the lock)."""
+        self._docs.clear()
+        self._doc_terms.clear()
+        self._postings.clear()
+        self._total_length = 0
+        self._version += 1
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def is_keyword_query(self, query: str, max_terms: int = 3, min_idf: float = 0.0) -> bool:
+        """
+        True if a query is a short lookup of distinctive indexed terms.
+
+        Short questions made only of common words ("library timings") still
+        need the vector search; a lookup qualifies only when at least one
+        term is an acronym in the query (two or more capitals, unless the
+        whole query is upper-case) or, with min_idf > 0, a rare term.
+
+        Args:
+            query: Query text
+            max_terms: Maximum number of (non-stopword) terms
+            min_idf: BM25 IDF at or above which a term counts as rare (0 = off)
+
+        Returns:
+            True if the query has 1..max_terms terms, all in the vocabulary,
+            and at least one of them is an acronym or rare term
+        """
+        terms = set(tokenize(query))
+        if not terms or len(terms) > max_terms:
+            return False
+        acronyms = set() if query.isupper() else {word.lower() for word in _ACRONYM_PATTERN.findall(query)}
+
+        with self._lock:
+            if not all(term in self._postings for term in terms):
+                return False
+            if acronyms & terms:
+                return True
+            return min_idf > 0 and any(
+                self._idf(len(self._postings[term])) >= min_idf for term in terms
+            )
+
+    def search(self, query: str, section_name: Optional[str] = None, top_k: int = 3) -> List[Dict]:
+        """
+        BM25 search with optional section pre-filter.
+
+        Args:
+            query: Query text
+            section_name: Optional section to restrict the search to
+            top_k: Number of results to return
+
+        Returns:
+            Documents shaped like the Atlas $project stage output
+            (_id, section_name, content, metadata) with the raw BM25 "score"
+        """
+        terms = set(tokenize(query))
+        scores: Dict[str, float] = {}
+
+        with self._lock:
+            count = len(self._docs)
+            if not count or not terms:
+                return []
+            average_length = self._total_length / count
+
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = self._idf(len(postings))
+                for doc_id, tf in postings.items():
+                    doc = self._docs[doc_id]
+                    if section_name and doc["section_name"] != section_name:
+                        continue
+                    norm = self.k1 * (1.0 - self.b + self.b * doc["length"] / average_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1.0) / (tf + norm)
+
+            ranked = sorted(scores.items(), key=lambda item: -item[1])[:top_k]
+            results = [
+                {
+                    "_id": doc_id,
+                    "section_name": self._docs[doc_id]["section_name"],
+                    "content": self._docs[doc_id]["content"],
+                    "metadata": self._docs[doc_id]["metadata"],
+                    "score": score,
+                }
+                for doc_id, score in ranked
+            ]
+            self.stats["searches"] += 1
+        return results
+
+    def _idf(self, document_frequency: int) -> float:
+        """BM25 inverse document frequency of a term (caller holds the lock)."""
+        count = len(self._docs)
+        return math.log(1.0 + (count - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    def get_stats(self) -> Dict:
+        """
+        Get index statistics.
+
+        Returns:
+            Dictionary with document/term counts and search counters
+        """
+        with self._lock:
+            return {
+                "documents": len(self._docs),
+                "terms": len(self._postings),
+                "version": self._version,
+                **self.stats,
+            }
@@ -5,6 +5,18 @@ Manages all LLM interactions including query decomposition,
 validation, and answer synthesis with detailed section context.
 
 Supports multiple LLM providers with fallback mechanisms.
+Query decompositions are memoized (LRU + TTL) per normalized query and
+section definitions. Async variants (adecompose_query, asynthesize_answer)
+use an AsyncOpenAI client created lazily per event loop. Token usage of every completion
+is reported to the pipeline metrics. The openai package is imported and the
+clients are created on first use, keeping process startup fast.
+
+Synthesis can also run with a built-in domain check (domain_check=True):
+the single-call "direct" pipeline skips decomposition, so the answering
+call itself replies with OUT_OF_DOMAIN_MARKER for off-topic questions.
+
+Async calls can be throttled with an AsyncRateLimiter (rate_limiter
+attribute), e.g. by batch evaluation runs that fire many calls at once.
 
 Author: RAG Research Team
 Date: November 2025
@@ -12,38 +24,130 @@ Date: November 2025
 
 import os
 import json
+import time
+import asyncio
+import hashlib
 import logging
-from typing import Dict, List
-from openai import OpenAI
+import threading
+from contextlib import nullcontext
+from typing import Dict, Iterator, List, Optional
 # import google.generativeai as genai
 from dotenv import load_dotenv
 
+from metrics import record_tokens
+from ttl_cache import TTLCache
+
 load_dotenv()
 logger = logging.getLogger(__name__)
 
 
+class AsyncRateLimiter:
+    """
+    Async limiter for API calls: a minimum spacing between call starts
+    (requests per second) and a cap on calls in flight.
+    """
+    
+    def __init__(self, rate: float = 0, max_concurrent: int = 0):
+        """
+        Initialize limiter.
+        
+        Args:
+            rate: Maximum call starts per second (0 = unlimited)
+            max_concurrent: Maximum calls in flight (0 = unlimited)
+        """
+        self.rate = rate
+        self.max_concurrent = max_concurrent
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._semaphore = asyncio.Semaphore(max_concurrent) if max_concurrent > 0 else None
+        self._next_start = 0.0
+        self.stats = {"calls": 0, "throttled": 0, "waitMs": 0.0}
+    
+    async def __aenter__(self):
+        started = time.perf_counter()
+        if self._semaphore is not None:
+            await self._semaphore.acquire()
+        
+        if self._interval:
+            # Reserve the next start slot (the event loop is single-threaded)
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self._interval
+            if start > now:
+                await asyncio.sleep(start - now)
+        
+        waited_ms = (time.perf_counter() - started) * 1000
+        self.stats["calls"] += 1
+        if waited_ms >= 1:
+            self.stats["throttled"] += 1
+            self.stats["waitMs"] += waited_ms
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        if self._semaphore is not None:
+            self._semaphore.release()
+        return False
+    
+    def get_stats(self) -> Dict:
+        """
+        Get limiter statistics.
+        
+        Returns:
+            Dictionary with limits, call count, throttled calls and total wait
+        """
+        return {
+            "rate": self.rate,
+            "maxConcurrent": self.max_concurrent,
+            **self.stats,
+            "waitMs": round(self.stats["waitMs"], 1),
+        }
+
+
 class LLMManager:
     """
     Manages LLM interactions for the agentic system.
     """
     
-    def __init__(self, provider: str = "openai"):
+    # Exact reply of a domain-checked synthesis for off-topic questions
+    OUT_OF_DOMAIN_MARKER = "OUT_OF_DOMAIN"
+    
+    # Decomposition memo configuration
+    DECOMPOSE_CACHE_MAX_ENTRIES = int(os.getenv("DECOMPOSE_CACHE_MAX_ENTRIES", "1024"))
+    DECOMPOSE_CACHE_TTL = float(os.getenv("DECOMPOSE_CACHE_TTL", "21600"))
+    
+    def __init__(self, provider: str = "openai", client=None, async_client=None):
         """
         Initialize LLM manager with specified provider.
         
         Args:
             provider: LLM provider ("openai", "gemini")
+            client: Optional OpenAI-compatible client (for dependency injection)
+            async_client: Optional AsyncOpenAI-compatible client (for dependency injection)
         """
         logger.info(f"Initializing LLM Manager with provider: {provider}")
         
         self.provider = provider
+        self.rate_limiter: Optional[AsyncRateLimiter] = None
+        self.decompose_cache = TTLCache(
+            max_entries=self.DECOMPOSE_CACHE_MAX_ENTRIES,
+            ttl_seconds=self.DECOMPOSE_CACHE_TTL
+        )
         
         try:
             if provider == "openai":
-                api_key = os.getenv("GPT_API_KEY")
-                if not api_key:
-                    raise ValueError("OPENAI_API_KEY not found")
-                self.client = OpenAI(api_key=api_key)
+                if client is None:
+                    api_key = os.getenv("GPT_API_KEY")
+                    if not api_key:
+                        raise ValueError("OPENAI_API_KEY not found")
+                    self.api_key = api_key
+                else:
+                    self.api_key = None
+                    logger.debug("Using injected OpenAI client")
+                self._client = client
+                self._client_lock = threading.Lock()
+                self._async_client = async_client
+                # Event loop the lazily created AsyncOpenAI client belongs to
+                # (None for injected clients, which are never replaced)
+                self._async_client_loop = None
                 self.model = "gpt-4o-mini"
                 logger.debug(f"OpenAI client initialized with model: {self.model}")
                 
@@ -64,10 +168,73 @@ class LLMManager:
             logger.error(f"Failed to initialize LLM Manager: {e}", exc_info=True)
             raise
     
+    @property
+    def client(self):
+        """OpenAI client, created on first use."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    from openai import OpenAI
+                    
+                    self._client = OpenAI(api_key=self.api_key)
+                    logger.debug("OpenAI client initialized")
+        return self._client
+    
+    @property
+    def async_client(self):
+        """
+        AsyncOpenAI client of the running event loop.
+        
+        Created on first use inside each event loop: a client's connection
+        pool is bound to the loop it was created on, so a later loop (e.g. a
+        second process_queries_batch call) gets a fresh client.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop not in (None, loop):
+            from openai import AsyncOpenAI
+            
+            self._async_client = AsyncOpenAI(api_key=self.api_key)
+            self._async_client_loop = loop
+            logger.debug("AsyncOpenAI client initialized")
+        return self._async_client
+    
+    def _rate_limited(self):
+        """Async context manager throttling one API call (no-op without a limiter)."""
+        return self.rate_limiter if self.rate_limiter is not None else nullcontext()
+    
+    def warm_up_connection(self):
+        """
+        Open the HTTPS connection to the API ahead of the first query.
+        
+        Lists models (no tokens consumed) so DNS, TCP and TLS setup are paid
+        at startup instead of by the first user.
+        """
+        models = getattr(self.client, "models", None)
+        if models is not None:
+            models.list()
+            logger.debug("OpenAI connection warmed up")
+    
+    @staticmethod
+    def _decompose_cache_key(user_query: str, section_definitions: Dict[str, str]) -> tuple:
+        """
+        Build the memo key for a decomposition.
+        
+        Combines the whitespace/case-normalized query with a hash of the
+        section definitions, so editing a definition invalidates old entries.
+        """
+        normalized_query = " ".join(user_query.lower().split())
+        definitions_hash = hashlib.sha1(
+            json.dumps(section_definitions, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        return (normalized_query, definitions_hash)
+    
     def decompose_query(self, user_query: str, section_definitions: Dict[str, str]) -> Dict[str, str]:
         """
         Decompose user query into section-specific subqueries with detailed context.
         
+        Successful decompositions (including out-of-domain {}) are memoized;
+        LLM or parsing failures are not, so they are retried next time.
+        
         Args:
             user_query: Original user question
             section_definitions: Dictionary of section names to descriptions
@@ -75,6 +242,117 @@ class LLMManager:
         Returns:
             Dictionary mapping sections to subqueries, or {} if no match/out of domain
         """
+        cache_key = self._decompose_cache_key(user_query, section_definitions)
+        cached = self.decompose_cache.get(cache_key)
+        if cached is not TTLCache.MISSING:
+            logger.debug(f"Decomposition memo hit for query: '{user_query}'")
+            return dict(cached)
+        
+        try:
+            parsed = self._request_decomposition(user_query, section_definitions)
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse LLM JSON response: {e}")
+            # Fallback: return empty dict to trigger fallback retrieval
+            return {}
+        except Exception as e:
+            logger.error(f"Query decomposition failed: {e}", exc_info=True)
+            # Fallback: return empty dict
+            return {}
+        
+        self.decompose_cache.set(cache_key, parsed)
+        return dict(parsed)
+    
+    def get_decompose_cache_stats(self) -> Dict:
+        """
+        Get decomposition memo statistics.
+        
+        Returns:
+            Dictionary with size, hits, misses and hit rate
+        """
+        return self.decompose_cache.get_stats()
+    
+    def _request_decomposition(self, user_query: str, section_definitions: Dict[str, str]) -> Dict[str, str]:
+        """
+        Ask the LLM to decompose a query (uncached).
+        
+        Args:
+            user_query: Original user question
+            section_definitions: Dictionary of section names to descriptions
+            
+        Returns:
+            Parsed section -> subquery mapping ({} for out-of-domain)
+            
+        Raises:
+            json.JSONDecodeError: If the LLM response is not valid JSON
+            Exception: If the LLM call fails
+        """
+        messages = self._build_decomposition_messages(user_query, section_definitions)
+        
+        if self.provider == "openai":
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=0.1,
+                max_tokens=500
+            )
+            record_tokens(response.usage)
+            result = response.choices[0].message.content.strip()
+            
+        # elif self.provider == "gemini":
+        #     response = self.model.generate_content(prompt)
+        #     result = response.text.strip()
+        
+        return self._parse_decomposition(result)
+    
+    async def adecompose_query(self, user_query: str, section_definitions: Dict[str, str]) -> Dict[str, str]:
+        """
+        Async variant of decompose_query (shares the same memo).
+        
+        Args:
+            user_query: Original user question
+            section_definitions: Dictionary of section names to descriptions
+            
+        Returns:
+            Dictionary mapping sections to subqueries, or {} if no match/out of domain
+        """
+        cache_key = self._decompose_cache_key(user_query, section_definitions)
+        cached = self.decompose_cache.get(cache_key)
+        if cached is not TTLCache.MISSING:
+            logger.debug(f"Decomposition memo hit for query: '{user_query}'")
+            return dict(cached)
+        
+        try:
+            messages = self._build_decomposition_messages(user_query, section_definitions)
+            async with self._rate_limited():
+                response = await self.async_client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=0.1,
+                    max_tokens=500
+                )
+            record_tokens(response.usage)
+            parsed = self._parse_decomposition(response.choices[0].message.content.strip())
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse LLM JSON response: {e}")
+            return {}
+        except Exception as e:
+            logger.error(f"Async query decomposition failed: {e}", exc_info=True)
+            return {}
+        
+        self.decompose_cache.set(cache_key, parsed)
+        return dict(parsed)
+    
+    def _build_decomposition_messages(self, user_query: str, section_definitions: Dict[str, str]) -> List[Dict]:
+        """
+        Build the chat messages for query decomposition.
+        
+        Args:
+            user_query: Original user question
+            section_definitions: Dictionary of section names to descriptions
+            
+        Returns:
+            OpenAI chat messages (system + user prompt)
+        """
         logger.debug(f"Decomposing query: '{user_query}'")
         
         # Build section context string
@@ -123,65 +401,61 @@ Response: {{"fees_payment": "Paying College Fees in Installments", "studentporta
 
 **Response (JSON only):**"""
 
-        try:
-            if self.provider == "openai":
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": "You are a precise query analyzer. Return ONLY valid JSON or empty dict {{}}."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.1,
-                    max_tokens=500
-                )
-                result = response.choices[0].message.content.strip()
-                
-            # elif self.provider == "gemini":
-            #     response = self.model.generate_content(prompt)
-            #     result = response.text.strip()
+        return [
+            {"role": "system", "content": "You are a precise query analyzer. Return ONLY valid JSON or empty dict {{}}."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def _parse_decomposition(self, result: str) -> Dict[str, str]:
+        """
+        Parse the LLM decomposition response.
+        
+        Args:
+            result: Raw LLM response text
             
-            logger.debug(f"LLM response: {result}")
+        Returns:
+            Parsed section -> subquery mapping ({} for out-of-domain)
             
-            # Parse response
-            try:
-                # Clean up response (remove markdown code blocks if present)
-                result = result.replace("``````", "").strip()
-                parsed = json.loads(result)
-                
-                if not parsed or parsed == {}:
-                    logger.debug("Query classified as non-specific or out-of-domain (empty dict)")
-                    return {}
-                
-                logger.debug(f"Parsed {len(parsed)} subqueries")
-                return parsed
-                
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse LLM JSON response: {e}")
-                logger.debug(f"Raw response: {result}")
-                # Fallback: return empty dict to trigger fallback retrieval
-                return {}
+        Raises:
+            json.JSONDecodeError: If the response is not valid JSON
+        """
+        logger.debug(f"LLM response: {result}")
         
-        except Exception as e:
-            logger.error(f"Query decomposition failed: {e}", exc_info=True)
-            # Fallback: return empty dict
+        # Parse response
+        try:
+            # Clean up response (remove markdown code blocks if present)
+            result = result.replace("``````", "").strip()
+            parsed = json.loads(result)
+        except json.JSONDecodeError:
+            logger.debug(f"Raw response: {result}")
+            raise
+        
+        if not parsed or parsed == {}:
+            logger.debug("Query classified as non-specific or out-of-domain (empty dict)")
             return {}
+        
+        logger.debug(f"Parsed {len(parsed)} subqueries")
+        return parsed
     
-    def synthesize_answer(
+    def _build_synthesis_messages(
         self, 
         query: str, 
         section_results: Dict[str, List[Dict]],
-        conversation_history: List[Dict] = None
-    ) -> str:
+        conversation_history: List[Dict] = None,
+        domain_check: bool = False
+    ) -> List[Dict]:
         """
-        Synthesize final answer from multi-section results with insufficiency detection.
+        Build the chat messages for answer synthesis.
         
         Args:
             query: Original user query
             section_results: Retrieved and validated results per section
             conversation_history: Optional list of recent messages for context
+            domain_check: Ask the model to reply with OUT_OF_DOMAIN_MARKER
+                instead of answering off-topic questions
             
         Returns:
-            Synthesized natural language answer
+            OpenAI chat messages (system + user prompt)
         """
         logger.debug(f"Synthesizing answer for query: '{query}'")
         
@@ -206,6 +480,14 @@ Response: {{"fees_payment": "Paying College Fees in Installments", "studentporta
         
         context = "\n".join(context_parts)
         
+        # Direct mode: the domain validation normally done by decomposition
+        domain_instruction = ""
+        if domain_check:
+            domain_instruction = (
+                f"0. **FIRST:** If the question is NOT related to college, campus, education or "
+                f"administration topics, reply with exactly {self.OUT_OF_DOMAIN_MARKER} and nothing else\n"
+            )
+        
         # Build synthesis prompt with insufficiency handling
         prompt = f"""You are a helpful college administration assistant.
 {history_context}
@@ -215,7 +497,7 @@ Response: {{"fees_payment": "Paying College Fees in Installments", "studentporta
 {context}
 
 **Instructions:**
-1. Answer the student's question directly and comprehensively using the retrieved information
+{domain_instruction}1. Answer the student's question directly and comprehensively using the retrieved information
 2. **Use conversation history** to understand context if the current question refers to previous topics
 3. **IMPORTANT:** If the retrieved information does NOT contain sufficient details to answer the question, respond with: "I don't have sufficient information in my knowledge base to answer this question completely. Please contact the administration office directly or visit the official website."
 4. Do NOT invent details that are not supported by the retrieved information.
@@ -226,17 +508,41 @@ Response: {{"fees_payment": "Paying College Fees in Installments", "studentporta
 
 **Your Answer:**"""
 
+        return [
+            {"role": "system", "content": "You are a helpful college administration assistant. If context is insufficient, clearly state it."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def synthesize_answer(
+        self, 
+        query: str, 
+        section_results: Dict[str, List[Dict]],
+        conversation_history: List[Dict] = None,
+        domain_check: bool = False
+    ) -> str:
+        """
+        Synthesize final answer from multi-section results with insufficiency detection.
+        
+        Args:
+            query: Original user query
+            section_results: Retrieved and validated results per section
+            conversation_history: Optional list of recent messages for context
+            domain_check: Reply with OUT_OF_DOMAIN_MARKER for off-topic questions
+            
+        Returns:
+            Synthesized natural language answer
+        """
+        messages = self._build_synthesis_messages(query, section_results, conversation_history, domain_check)
+
         try:
             if self.provider == "openai":
                 response = self.client.chat.completions.create(
                     model=self.model,
-                    messages=[
-                        {"role": "system", "content": "You are a helpful college administration assistant. If context is insufficient, clearly state it."},
-                        {"role": "user", "content": prompt}
-                    ],
+                    messages=messages,
                     temperature=0.3,
                     max_tokens=600
                 )
+                record_tokens(response.usage)
                 answer = response.choices[0].message.content.strip()
                 
             # elif self.provider == "gemini":
@@ -249,4 +555,117 @@ Response: {{"fees_payment": "Paying College Fees in Installments", "studentporta
         except Exception as e:
             logger.error(f"Answer synthesis failed: {e}", exc_info=True)
             raise
-            
\ No newline at end of file
+    
+    async def asynthesize_answer(
+        self, 
+        query: str, 
+        section_results: Dict[str, List[Dict]],
+        conversation_history: List[Dict] = None,
+        domain_check: bool = False
+    ) -> str:
+        """
+        Async variant of synthesize_answer.
+        
+        Args:
+            query: Original user query
+            section_results: Retrieved and validated results per section
+            conversation_history: Optional list of recent messages for context
+            domain_check: Reply with OUT_OF_DOMAIN_MARKER for off-topic questions
+            
+        Returns:
+            Synthesized natural language answer
+        """
+        messages = self._build_synthesis_messages(query, section_results, conversation_history, domain_check)
+
+        try:
+            async with self._rate_limited():
+                response = await self.async_client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=0.3,
+                    max_tokens=600
+                )
+            record_tokens(response.usage)
+            answer = response.choices[0].message.content.strip()
+            
+            logger.debug(f"Synthesized answer length: {len(answer)} chars")
+            return answer
+            
+        except Exception as e:
+            logger.error(f"Async answer synthesis failed: {e}", exc_info=True)
+            raise
+    
+    def synthesize_answer_stream(
+        self, 
+        query: str, 
+        section_results: Dict[str, List[Dict]],
+        conversation_history: List[Dict] = None,
+        domain_check: bool = False
+    ) -> Iterator[str]:
+        """
+        Streaming variant of synthesize_answer.
+        
+        Yields answer text deltas as the model generates them, so callers
+        can forward the first tokens while the rest is still being written.
+        
+        Args:
+            query: Original user query
+            section_results: Retrieved and validated results per section
+            conversation_history: Optional list of recent messages for context
+            domain_check: Reply with OUT_OF_DOMAIN_MARKER for off-topic questions
+            
+        Yields:
+            Answer text deltas (concatenate for the full answer)
+        """
+        messages = self._build_synthesis_messages(query, section_results, conversation_history, domain_check)
+
+        try:
+            if self.provider == "openai":
+                stream = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=0.3,
+                    max_tokens=600,
+                    stream=True,
+                    stream_options={"include_usage": True}
+                )
+                for chunk in stream:
+                    if not chunk.choices:
+                        # Final usage-only chunk
+                        record_tokens(getattr(chunk, "usage", None))
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        yield delta
+            
+        except Exception as e:
+            logger.error(f"Streaming answer synthesis failed: {e}", exc_info=True)
+            raise
+    
+    @staticmethod
+    def normalize_domain_reply(answer: str) -> str:
+        """
+        Normalize a (possibly partial) synthesis reply for comparison with
+        OUT_OF_DOMAIN_MARKER: surrounding whitespace, periods, quotes and
+        markdown emphasis are dropped and the text is upper-cased.
+        
+        Args:
+            answer: Synthesized answer text (or a streamed prefix of it)
+            
+        Returns:
+            Normalized text
+        """
+        return answer.strip().strip(".\"'`* \n\t").upper()
+    
+    @classmethod
+    def is_out_of_domain(cls, answer: str) -> bool:
+        """
+        Check whether a domain-checked synthesis rejected the question.
+        
+        Args:
+            answer: Synthesized answer text
+            
+        Returns:
+            True if the answer is the out-of-domain marker
+        """
+        return cls.normalize_domain_reply(answer) == cls.OUT_OF_DOMAIN_MARKER
@@ -0,0 +1,242 @@
+"""
+Local Vector Index Module
+=========================
+In-process alternative to the Atlas $vectorSearch index. Keeps every
+chunk of FYP.Main in a contiguous float32 matrix and answers nearest
+neighbour queries with an exact NumPy dot product.
+
+Features:
+- Exact cosine search over L2-normalized float32 embeddings
+- In-process section pre-filtering (per-section row sets)
+- Periodic diff sync against the source collection (see collection_sync):
+  new, removed and edited chunks are picked up
+- JSONL snapshots for fully offline operation
+
+Scores are reported on the same (1 + cosine) / 2 scale that Atlas uses
+for vectorSearchScore, so thresholds tuned on one backend carry over.
+
+Author: RAG Research Team
+Date: November 2025
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from collection_sync import SyncedIndex
+
+logger = logging.getLogger(__name__)
+
+
+class LocalVectorIndex(SyncedIndex):
+    """
+    Exact in-memory vector index with section filtering.
+    """
+
+    # Fields loaded from the source collection
+    PROJECTION = {"embedding": 1, "section_name": 1, "content": 1, "metadata": 1}
+    SYNC_NAME = "Local index"
+
+    def __init__(self, collection=None, refresh_interval: float = 0):
+        """
+        Initialize an empty index, optionally bound to a source collection.
+
+        Args:
+            collection: Optional pymongo collection to load and sync from
+            refresh_interval: Seconds between background diff syncs (0 = disabled)
+        """
+        super().__init__(collection, refresh_interval)
+
+        self._ids: List[str] = []
+        self._docs: List[Dict] = []
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._section_rows: Dict[str, np.ndarray] = {}
+        self._version = 0
+
+    @property
+    def size(self) -> int:
+        """Number of indexed chunks."""
+        return len(self._ids)
+
+    @property
+    def version(self) -> int:
+        """Monotonic counter, bumped every time the indexed corpus changes."""
+        return self._version
+
+    # ------------------------------------------------------------------
+    # Loading and sync
+    # ------------------------------------------------------------------
+
+    def _replace_documents(self, documents: List[Dict]):
+        """Rebuild the index from a full load."""
+        self._rebuild(documents)
+
+    def _apply_changes(self, documents: List[Dict], removed_ids: Set[str]):
+        """Rebuild with unchanged rows kept and new or edited documents swapped in."""
+        replaced = removed_ids | {str(doc["_id"]) for doc in documents}
+        with self._lock:
+            kept = [
+                {**doc, "embedding": self._matrix[row]}
+                for row, doc in enumerate(self._docs)
+                if doc["_id"] not in replaced
+            ]
+            self._rebuild(kept + documents)
+
+    def _rebuild(self, documents: Iterable[Dict]):
+        """
+        Rebuild the matrix and section row sets from documents.
+
+        Documents without an embedding are skipped.
+        """
+        ids, docs, vectors = [], [], []
+        for doc in documents:
+            embedding = doc.get("embedding")
+            if embedding is None or len(embedding) == 0:
+                continue
+            ids.append(str(doc.get("_id", len(ids))))
+            docs.append({
+                "_id": ids[-1],
+                "section_name": doc.get("section_name"),
+                "content": doc.get("content", ""),
+                "metadata": doc.get("metadata", {}),
+            })
+            vectors.append(embedding)
+
+        matrix = np.ascontiguousarray(vectors, dtype=np.float32) if vectors else np.zeros((0, 0), dtype=np.float32)
+        if matrix.size:
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            matrix /= norms
+
+        sections: Dict[str, List[int]] = {}
+        for row, doc in enumerate(docs):
+            sections.setdefault(doc["section_name"], []).append(row)
+
+        with self._lock:
+            self._ids = ids
+            self._docs = docs
+            self._matrix = matrix
+            self._section_rows = {
+                name: np.asarray(rows, dtype=np.int64) for name, rows in sections.items()
+            }
+            self._version += 1
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def search(
+        self,
+        query_embedding: List[float],
+        section_name: Optional[str] = None,
+        top_k: int = 3
+    ) -> List[Dict]:
+        """
+        Exact nearest-neighbour search with optional section pre-filter.
+
+        Args:
+            query_embedding: Query vector (same model as the indexed chunks)
+            section_name: Optional section to restrict the search to
+            top_k: Number of results to return
+
+        Returns:
+            Documents shaped like the Atlas $project stage output
+            (section_name, content, metadata, score) plus the unit-norm
+            chunk embedding
+        """
+        with self._lock:
+            matrix = self._matrix
+            docs = self._docs
+            rows = self._section_rows.get(section_name) if section_name else None
+
+        if not matrix.size or (section_name and rows is None):
+            return []
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+
+        candidates = matrix if rows is None else matrix[rows]
+        similarities = candidates @ query
+
+        k = min(top_k, similarities.shape[0])
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top])]
+
+        results = []
+        for position in top:
+            row = position if rows is None else rows[position]
+            doc = docs[row]
+            results.append({
+                "section_name": doc["section_name"],
+                "content": doc["content"],
+                "metadata": doc["metadata"],
+                "score": float((1.0 + similarities[position]) / 2.0),
+                "embedding": matrix[row],
+            })
+        return results
+
+    def documents(self) -> List[Dict]:
+        """
+        Indexed chunks without their embeddings.
+
+        Returns:
+            List of {_id, section_name, content, metadata} dictionaries
+        """
+        with self._lock:
+            return list(self._docs)
+
+    def section_centroids(self) -> Dict[str, np.ndarray]:
+        """
+        Mean normalized embedding of each section's chunks.
+
+        Returns:
+            Dictionary of section name -> centroid vector
+        """
+        with self._lock:
+            return {
+                name: self._matrix[rows].mean(axis=0)
+                for name, rows in self._section_rows.items()
+                if name is not None and len(rows)
+            }
+
+    # ------------------------------------------------------------------
+    # Offline snapshots
+    # ------------------------------------------------------------------
+
+    def save(self, path: str):
+        """
+        Write the indexed corpus to a JSONL snapshot.
+
+        Args:
+            path: Destination file path
+        """
+        with self._lock:
+            docs = list(self._docs)
+            matrix = self._matrix.copy()
+
+        with open(path, "w", encoding="utf-8") as f:
+            for doc, vector in zip(docs, matrix):
+                f.write(json.dumps({**doc, "embedding": vector.tolist()}) + "\n")
+        logger.info(f"Local index snapshot written: {path} ({len(docs)} chunks)")
+
+    @classmethod
+    def from_snapshot(cls, path: str) -> "LocalVectorIndex":
+        """
+        Build an offline index from a JSONL snapshot written by save().
+
+        Args:
+            path: Snapshot file path
+
+        Returns:
+            Loaded LocalVectorIndex with no source collection
+        """
+        index = cls()
+        with open(Path(path), encoding="utf-8") as f:
+            index._rebuild(json.loads(line) for line in f if line.strip())
+        logger.info(f"Local index loaded {index.size} chunks from snapshot {path}")
+        return index
@@ -0,0 +1,330 @@
+"""
+Pipeline Metrics Module
+=======================
+Per-request stage timing and process-wide latency aggregates for the
+agentic RAG pipeline.
+
+Each request runs under a Trace held in a context variable, so spans
+recorded anywhere below it (retriever, LLM manager, validator) land on
+the right request. asyncio tasks and asyncio.to_thread inherit the trace
+automatically; thread-pool submissions go through submit_in_context.
+
+Features:
+- span()/timed() stage timing (decompose, embed, vector/web search,
+  validate, synthesize, ...)
+- LLM token counts per request
+- Request tags (e.g. the pipeline mode that ran), with per-mode
+  end-to-end latency histograms (total.<mode>)
+- Per-request decision log (e.g. whether each web search ran or was
+  skipped by the confidence gate)
+- Sliding-window latency histograms (p50/p95/p99) per stage
+- Snapshot for the interactive "stats" command
+
+Author: RAG Research Team
+Date: November 2025
+"""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# Number of most recent samples kept per stage for percentile estimates
+HISTOGRAM_WINDOW = 2048
+
+_current_trace: contextvars.ContextVar[Optional["Trace"]] = contextvars.ContextVar(
+    "rag_trace", default=None
+)
+
+
+class Trace:
+    """
+    Spans and token counts recorded for a single request.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: List[Dict] = []
+        self.tokens = {"prompt": 0, "completion": 0}
+        self.tags: Dict[str, str] = {}
+        self.decisions: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def set_tag(self, key: str, value: str):
+        """Label the request (last value wins)."""
+        with self._lock:
+            self.tags[key] = value
+
+    def add_decision(self, kind: str, **attrs):
+        """Record one pipeline decision."""
+        with self._lock:
+            self.decisions.append({"kind": kind, **attrs})
+
+    def add_span(self, stage: str, duration_ms: float, **attrs):
+        """Record one timed stage."""
+        with self._lock:
+            self.spans.append({"stage": stage, "ms": round(duration_ms, 2), **attrs})
+
+    def add_tokens(self, prompt: int, completion: int):
+        """Accumulate LLM token usage."""
+        with self._lock:
+            self.tokens["prompt"] += prompt
+            self.tokens["completion"] += completion
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def to_dict(self) -> Dict:
+        """
+        Serialize for the response metadata.
+
+        Returns:
+            Dictionary with total time, per-stage totals, raw spans, tokens,
+            tags and decisions
+        """
+        with self._lock:
+            stages: Dict[str, float] = {}
+            for span_ in self.spans:
+                stages[span_["stage"]] = round(stages.get(span_["stage"], 0.0) + span_["ms"], 2)
+            return {
+                "totalMs": round(self.elapsed_ms, 2),
+                "stages": stages,
+                "spans": list(self.spans),
+                "tokens": dict(self.tokens),
+                "tags": dict(self.tags),
+                "decisions": list(self.decisions),
+            }
+
+
+class LatencyHistogram:
+    """
+    Latency distribution over the most recent samples of one stage.
+    """
+
+    def __init__(self, window: int = HISTOGRAM_WINDOW):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total_ms = 0.0
+
+    def observe(self, duration_ms: float):
+        self.samples.append(duration_ms)
+        self.count += 1
+        self.total_ms += duration_ms
+
+    def snapshot(self) -> Dict:
+        """Percentiles over the window, count/mean over the process lifetime."""
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {"count": 0}
+
+        def percentile(p: float) -> float:
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 2)
+
+        return {
+            "count": self.count,
+            "meanMs": round(self.total_ms / self.count, 2),
+            "p50Ms": percentile(0.50),
+            "p95Ms": percentile(0.95),
+            "p99Ms": percentile(0.99),
+            "maxMs": round(ordered[-1], 2),
+        }
+
+
+class MetricsRegistry:
+    """
+    Process-wide aggregates across all requests.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self.started = time.time()
+        self.requests = 0
+        self.errors = 0
+        self.tokens = {"prompt": 0, "completion": 0}
+
+    def observe(self, stage: str, duration_ms: float):
+        """Add one stage latency sample."""
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = LatencyHistogram()
+            histogram.observe(duration_ms)
+
+    def add_tokens(self, prompt: int, completion: int):
+        with self._lock:
+            self.tokens["prompt"] += prompt
+            self.tokens["completion"] += completion
+
+    def record_request(self, trace: Trace, success: bool = True):
+        """Count a finished request and its end-to-end latency (also per pipeline mode)."""
+        elapsed_ms = trace.elapsed_ms
+        self.observe("total", elapsed_ms)
+        mode = trace.tags.get("mode")
+        if mode:
+            self.observe(f"total.{mode}", elapsed_ms)
+        with self._lock:
+            self.requests += 1
+            if not success:
+                self.errors += 1
+
+    def snapshot(self) -> Dict:
+        """
+        Get aggregated metrics.
+
+        Returns:
+            Dictionary with request counts, token totals and per-stage histograms
+        """
+        with self._lock:
+            return {
+                "uptimeSeconds": round(time.time() - self.started, 1),
+                "requests": self.requests,
+                "errors": self.errors,
+                "tokens": dict(self.tokens),
+                "latency": {stage: h.snapshot() for stage, h in sorted(self._histograms.items())},
+            }
+
+
+# Process-wide registry
+registry = MetricsRegistry()
+
+
+@contextmanager
+def request_trace():
+    """
+    Run the enclosed block as one request with its own Trace.
+
+    Yields:
+        The Trace installed as the current trace for the block
+    """
+    trace = Trace()
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+def current_trace() -> Optional[Trace]:
+    """Trace of the current request, or None outside a request."""
+    return _current_trace.get()
+
+
+def record_span(stage: str, duration_ms: float, **attrs):
+    """
+    Record a stage duration on the current trace and the registry.
+
+    Args:
+        stage: Stage name
+        duration_ms: Duration in milliseconds
+        **attrs: Extra span attributes (e.g. section)
+    """
+    registry.observe(stage, duration_ms)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add_span(stage, duration_ms, **attrs)
+
+
+def tag(key: str, value: str):
+    """
+    Tag the current request (no-op outside a request).
+
+    Args:
+        key: Tag name (e.g. "mode")
+        value: Tag value
+    """
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.set_tag(key, value)
+
+
+def record_decision(kind: str, **attrs):
+    """
+    Log a pipeline decision on the current request (no-op outside a request).
+
+    Args:
+        kind: Decision kind (e.g. "web_gate")
+        **attrs: Decision details (e.g. section, decision, reason)
+    """
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add_decision(kind, **attrs)
+
+
+@contextmanager
+def span(stage: str, **attrs):
+    """Time the enclosed block as one stage."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(stage, (time.perf_counter() - started) * 1000, **attrs)
+
+
+def timed(stage: str, label: Optional[str] = None):
+    """
+    Decorator timing every call of a sync or async function as one stage.
+
+    Args:
+        stage: Stage name
+        label: Optional parameter name whose value is recorded on the span
+    """
+    def decorator(func):
+        position = list(inspect.signature(func).parameters).index(label) if label else None
+
+        def attrs(args, kwargs) -> Dict:
+            if label is None:
+                return {}
+            if label in kwargs:
+                return {label: kwargs[label]}
+            if position < len(args):
+                return {label: args[position]}
+            return {}
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(stage, **attrs(args, kwargs)):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage, **attrs(args, kwargs)):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def record_tokens(usage):
+    """
+    Record LLM token usage from an OpenAI-style usage object.
+
+    Args:
+        usage: Object with prompt_tokens/completion_tokens (None is ignored)
+    """
+    if usage is None:
+        return
+    prompt = getattr(usage, "prompt_tokens", 0) or 0
+    completion = getattr(usage, "completion_tokens", 0) or 0
+    registry.add_tokens(prompt, completion)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add_tokens(prompt, completion)
+
+
+def submit_in_context(executor, fn, *args, **kwargs):
+    """
+    Submit to a thread pool carrying the caller's trace along.
+
+    Returns:
+        Future from executor.submit
+    """
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
@@ -10,22 +10,77 @@ Key Features:
 - Parallel retrieval from multiple sources
 - Fallback retrieval for ambiguous queries
 - Result validation and synthesis
+- Semantic answer cache for near-duplicate questions
+- Local embedding router that skips LLM decomposition when confident
+- Streaming synthesis (contexts first, then answer deltas)
+- Native asyncio variant of the pipeline (aprocess_query_with_contexts)
+- Speculative fallback retrieval overlapping query decomposition
+- Grouped retrieval: one multi-section vector search per shared vector
+- Background warm-up (embedding model, router centroids, API/DB
+  connections, BM25 index) with a per-phase startup report
+- Context packing before synthesis (MMR dedup, sentence trimming,
+  prompt-token budget)
+- Single-call "direct" pipeline mode (raw-query retrieval, one LLM call
+  that checks the domain and answers), chosen per request or by heuristic
+- Confidence-gated web search: skipped (or abandoned mid-flight) when the
+  vector search is already confident and the query is not time-sensitive
+- Single-flight coalescing: concurrent identical queries (same normalized
+  text, conversation history and mode) share one pipeline run
+- Batch evaluation API (process_queries_batch): wave-wide batched
+  encoding, rate-limited concurrent LLM calls, resumable JSONL checkpoint
+- Long-lived bounded retrieval, web and speculation pools with an enforced
+  retrieval deadline: sections (and their web searches) that miss it are
+  abandoned and the answer uses the rest
 
 Author: RAG Research Team
 Date: November 2025
 """
 
+import os
+import re
+import json
+import asyncio
+import hashlib
 import logging
-from typing import Dict, List, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+from contextlib import nullcontext
+from typing import Dict, Iterator, List, Optional, Tuple
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 import time
 
-from llm_utils import LLMManager
+from llm_utils import AsyncRateLimiter, LLMManager
 from retriever import Retriever
 from validation import ResultValidator
+from semantic_cache import SemanticCache
+from section_router import SectionRouter
+from context_packer import ContextPacker
+from single_flight import SingleFlight
+from bounded_executor import BoundedExecutor, ExecutorSaturated, gather_until
+from metrics import record_decision, record_span, registry, request_trace, submit_in_context, tag, timed
 
 logger = logging.getLogger(__name__)
 
+# Queries that look like several questions in one (auto mode keeps these agentic)
+_MULTI_PART_PATTERN = re.compile(r"\b(?:and|also|plus|then)\b|[;,]|\?.*\?", re.IGNORECASE)
+
+# Cues that a question needs fresh information (the web search always runs).
+# Dates need a full d/m/yyyy shape or a day next to a month name, so
+# decimals ("7.5 CGPA") and bare month words do not count.
+_MONTH = (
+    r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+    r"|sept?(?:ember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)"
+)
+_TIME_SENSITIVE_PATTERN = re.compile(
+    r"\b(?:19|20)\d{2}\b"
+    r"|\b\d{1,2}([/.-])\d{1,2}\1\d{2,4}\b"
+    rf"|\b\d{{1,2}}(?:st|nd|rd|th)?\s+(?:of\s+)?{_MONTH}\b"
+    rf"|\b{_MONTH}\s+\d{{1,2}}(?:st|nd|rd|th)?\b"
+    r"|\b(?:today|tomorrow|yesterday|latest|upcoming|current(?:ly)?|recent(?:ly)?)\b"
+    r"|\b(?:this|next|coming) (?:year|month|week|semester|sem)\b"
+    r"|\b(?:last date|deadlines?|due date|extended|announced|notifications?)\b",
+    re.IGNORECASE
+)
+
 
 class AgenticOrchestrator:
     """
@@ -48,190 +103,1554 @@ class AgenticOrchestrator:
     }
 
     
-    # Sections that require web search augmentation
-    WEB_SEARCH_SECTIONS = ['scholarship', 'exam_center']
+    # Sections that require web search augmentation
+    WEB_SEARCH_SECTIONS = ['scholarship', 'exam_center']
+    
+    # Retrieval deadline in seconds: sections (and web searches) not done
+    # by then are abandoned and the query continues with partial results
+    SECTION_TIMEOUT = float(os.getenv("SECTION_TIMEOUT", "12"))
+    
+    # Shared section retrieval pool: worker threads and maximum waiting
+    # tasks (0 = unbounded); sections submitted beyond that are dropped
+    RETRIEVAL_WORKERS = int(os.getenv("RETRIEVAL_WORKERS", "16"))
+    RETRIEVAL_QUEUE_LIMIT = int(os.getenv("RETRIEVAL_QUEUE_LIMIT", "128"))
+    
+    # User-facing messages for queries that cannot be answered
+    NO_RESULTS_MESSAGE = (
+        "I apologize, but I couldn't find relevant information to answer your query. "
+        "Please try rephrasing or ask about college administration topics."
+    )
+    VALIDATION_FAILED_MESSAGE = (
+        "I found some information, but it appears to contain errors or may not be reliable. "
+        "Please rephrase or contact the administration directly."
+    )
+    ERROR_MESSAGE = (
+        "I encountered an error while processing your request. "
+        "Please try again or contact support."
+    )
+    
+    # Semantic answer cache configuration
+    SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() != "false"
+    SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+    SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "512"))
+    SEMANTIC_CACHE_TTL = float(os.getenv("SEMANTIC_CACHE_TTL", "3600"))
+    
+    # Section router configuration ("off", "shadow" or "on")
+    SECTION_ROUTER_MODE = os.getenv("SECTION_ROUTER_MODE", "shadow")
+    SECTION_ROUTER_MIN_SCORE = float(os.getenv("SECTION_ROUTER_MIN_SCORE", "0.45"))
+    SECTION_ROUTER_MIN_MARGIN = float(os.getenv("SECTION_ROUTER_MIN_MARGIN", "0.10"))
+    
+    # Speculative retrieval: run the unfiltered fallback search while the
+    # LLM decomposes the query, so the {} case needs no extra round trip
+    SPECULATIVE_RETRIEVAL = os.getenv("SPECULATIVE_RETRIEVAL", "true").lower() != "false"
+    SPECULATIVE_WORKERS = 4
+    # Speculative searches waiting for a worker beyond this are not started
+    SPECULATIVE_QUEUE_LIMIT = int(os.getenv("SPECULATIVE_QUEUE_LIMIT", "16"))
+    
+    # Retrieval grouping ("off", "shared" or "merged"):
+    # - shared: sections with identical subqueries share one $vectorSearch
+    # - merged: all sections share one search on the mean subquery vector
+    RETRIEVAL_GROUPING = os.getenv("RETRIEVAL_GROUPING", "shared")
+    
+    # Open OpenAI/MongoDB connections during background warm-up
+    WARM_UP_CONNECTIONS = os.getenv("WARM_UP_CONNECTIONS", "true").lower() == "true"
+    
+    # Context packing between validation and synthesis
+    CONTEXT_PACKING = os.getenv("CONTEXT_PACKING", "true").lower() != "false"
+    CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1500"))
+    CONTEXT_DUPLICATE_THRESHOLD = float(os.getenv("CONTEXT_DUPLICATE_THRESHOLD", "0.92"))
+    CONTEXT_MMR_LAMBDA = float(os.getenv("CONTEXT_MMR_LAMBDA", "0.7"))
+    CONTEXT_MAX_SENTENCES = int(os.getenv("CONTEXT_MAX_SENTENCES", "6"))
+    
+    # Pipeline mode ("agentic", "direct" or "auto"), overridable per request:
+    # - agentic: LLM decomposition, per-section retrieval, synthesis
+    # - direct: raw-query retrieval across the collection (confident router
+    #   section boosted), one LLM call that checks the domain and answers
+    # - auto: direct for short single-topic queries, agentic otherwise
+    PIPELINE_MODES = ("agentic", "direct", "auto")
+    PIPELINE_MODE = os.getenv("PIPELINE_MODE", "agentic")
+    DIRECT_TOP_K = int(os.getenv("DIRECT_TOP_K", "4"))
+    DIRECT_SECTION_BOOST = float(os.getenv("DIRECT_SECTION_BOOST", "0.05"))
+    DIRECT_MAX_WORDS = int(os.getenv("DIRECT_MAX_WORDS", "12"))
+    
+    # Web search gating for WEB_SEARCH_SECTIONS ("off", "gate" or "race"):
+    # - off: always search the web alongside the database
+    # - gate: search the database first and skip the web when its best
+    #   vector similarity (Atlas 0-1 scale) clears WEB_GATE_MIN_SCORE
+    # - race: start both, stop waiting for the web once the database is sufficient
+    # Time-sensitive queries (dates, "this year", "last date", "deadline", ...)
+    # always search the web, started alongside the database. BM25-only
+    # keyword lookups (no vector score) count as confident matches.
+    WEB_SEARCH_GATES = ("off", "gate", "race")
+    WEB_SEARCH_GATE = os.getenv("WEB_SEARCH_GATE", "gate")
+    WEB_GATE_MIN_SCORE = float(os.getenv("WEB_GATE_MIN_SCORE", "0.80"))
+    WEB_SEARCH_WORKERS = 8
+    
+    # Concurrent identical queries await the first one's result
+    QUERY_COALESCING = os.getenv("QUERY_COALESCING", "true").lower() != "false"
+    
+    # Batch evaluation (process_queries_batch): queries per wave (encoded,
+    # decomposed and in flight together) and limits on the LLM calls
+    BATCH_SIZE = int(os.getenv("BATCH_SIZE", "32"))
+    BATCH_LLM_RATE = float(os.getenv("BATCH_LLM_RATE", "8"))
+    BATCH_LLM_CONCURRENCY = int(os.getenv("BATCH_LLM_CONCURRENCY", "16"))
+    
+    def __init__(self, llm_manager: Optional[LLMManager] = None, retriever: Optional[Retriever] = None):
+        """
+        Initialize orchestrator with required components.
+        
+        Construction is cheap; the embedding model, router centroids and
+        network connections are warmed up in background threads (see
+        wait_until_warm). Queries arriving earlier wait for the model.
+        
+        Args:
+            llm_manager: Optional LLMManager (for dependency injection)
+            retriever: Optional Retriever (for dependency injection)
+        
+        Raises:
+            Exception: If initialization of any component fails
+        """
+        logger.info("Initializing Agentic Orchestrator")
+        
+        if self.PIPELINE_MODE not in self.PIPELINE_MODES:
+            raise ValueError(f"Unsupported pipeline mode: {self.PIPELINE_MODE}")
+        if self.WEB_SEARCH_GATE not in self.WEB_SEARCH_GATES:
+            raise ValueError(f"Unsupported web search gate: {self.WEB_SEARCH_GATE}")
+        
+        try:
+            self.llm_manager = llm_manager or LLMManager()
+            logger.debug("LLM Manager initialized")
+            
+            self.retriever = retriever or Retriever()
+            logger.debug("Retriever initialized")
+            
+            self.validator = ResultValidator()
+            logger.debug("Result Validator initialized")
+            
+            self.semantic_cache = None
+            if self.SEMANTIC_CACHE_ENABLED:
+                self.semantic_cache = SemanticCache(
+                    threshold=self.SEMANTIC_CACHE_THRESHOLD,
+                    max_entries=self.SEMANTIC_CACHE_MAX_ENTRIES,
+                    ttl_seconds=self.SEMANTIC_CACHE_TTL
+                )
+                logger.debug("Semantic Cache initialized")
+            
+            self.section_router = SectionRouter(
+                self.retriever,
+                self.SECTION_DEFINITIONS,
+                mode=self.SECTION_ROUTER_MODE,
+                min_score=self.SECTION_ROUTER_MIN_SCORE,
+                min_margin=self.SECTION_ROUTER_MIN_MARGIN,
+                lazy=True
+            )
+            logger.debug("Section Router initialized")
+            
+            self.context_packer = None
+            if self.CONTEXT_PACKING:
+                self.context_packer = ContextPacker(
+                    self.retriever.embed_queries,
+                    token_budget=self.CONTEXT_TOKEN_BUDGET,
+                    duplicate_threshold=self.CONTEXT_DUPLICATE_THRESHOLD,
+                    mmr_lambda=self.CONTEXT_MMR_LAMBDA,
+                    max_sentences=self.CONTEXT_MAX_SENTENCES
+                )
+                # Let vector search return chunk embeddings for deduplication
+                self.retriever.include_embeddings = True
+                logger.debug("Context Packer initialized")
+            
+            self._speculation_executor = None
+            if self.SPECULATIVE_RETRIEVAL:
+                self._speculation_executor = BoundedExecutor(
+                    max_workers=self.SPECULATIVE_WORKERS,
+                    max_queue=self.SPECULATIVE_QUEUE_LIMIT,
+                    thread_name_prefix="rag-speculative"
+                )
+            # Counters below are updated from request and pool threads
+            self._stats_lock = threading.Lock()
+            self.speculation_stats = {"used": 0, "discarded": 0, "rejected": 0}
+            
+            # Section retrievals and the web searches started alongside
+            # vector searches (both shared by all requests)
+            self._retrieval_executor = BoundedExecutor(
+                max_workers=self.RETRIEVAL_WORKERS,
+                max_queue=self.RETRIEVAL_QUEUE_LIMIT,
+                thread_name_prefix="rag-retrieval"
+            )
+            self._web_executor = BoundedExecutor(
+                max_workers=self.WEB_SEARCH_WORKERS,
+                thread_name_prefix="rag-web"
+            )
+            self.deadline_stats = {"partial": 0, "late": 0, "rejected": 0}
+            self.web_gate_stats = {"searched": 0, "skipped": 0, "cancelled": 0}
+            
+            self.query_flight = SingleFlight() if self.QUERY_COALESCING else None
+            
+            self.state = "warming"
+            self.startup_phases: Dict[str, float] = {}
+            self._warm = threading.Event()
+            threading.Thread(target=self._warm_up, name="rag-warm-up", daemon=True).start()
+            
+            logger.info("Orchestrator initialization complete")
+            
+        except Exception as e:
+            logger.error(f"Failed to initialize orchestrator: {e}", exc_info=True)
+            raise
+    
+    def process_query(self, user_query: str, conversation_history: List[Dict] = None, mode: Optional[str] = None) -> str:
+        """
+        Main entry point for query processing.
+        
+        Implements the full agentic workflow:
+        1. Query validation and decomposition
+        2. Parallel multi-section retrieval OR fallback retrieval
+        3. Result validation
+        4. Synthesis into final answer
+        
+        In direct mode steps 1-2 become a single raw-query retrieval and the
+        domain check moves into the synthesis call. Concurrent identical
+        queries share one run (see _coalesced).
+        
+        Args:
+            user_query: User's natural language question
+            conversation_history: Optional list of recent messages for context
+            mode: Optional pipeline mode override ("agentic", "direct", "auto")
+            
+        Returns:
+            Final synthesized answer string
+        """
+        return self._coalesced("answer", self._process_query, user_query, conversation_history, mode)
+    
+    def _process_query(self, user_query: str, conversation_history: List[Dict] = None, mode: Optional[str] = None) -> str:
+        """
+        Run the pipeline for process_query.
+        """
+        logger.info(f"Processing query: '{user_query}'")
+        if conversation_history:
+            logger.debug(f"Conversation history: {len(conversation_history)} messages")
+        start_time = time.time()
+        
+        try:
+            # Step 0: Serve near-duplicate questions from the semantic cache
+            query_embedding, cached = self._semantic_cache_lookup(user_query, conversation_history)
+            if cached:
+                tag("mode", "cache")
+                logger.info(f"Query served from semantic cache in {time.time() - start_time:.2f}s")
+                return cached["answer"]
+            
+            # Steps 1-3: Decompose (agentic only), retrieve and validate
+            mode = self._select_mode(user_query, query_embedding, mode)
+            if mode == "direct":
+                validated_results, failure_message = self._direct_retrieve_validated(user_query, query_embedding)
+            else:
+                validated_results, failure_message = self._retrieve_validated(user_query, query_embedding)
+            if failure_message:
+                return failure_message
+            
+            # Step 4: Synthesize final answer (with conversation history)
+            logger.debug("Step 4: Answer synthesis")
+            final_answer, synthesized = self._synthesize_answer(
+                user_query, validated_results, conversation_history, domain_check=mode == "direct"
+            )
+            if self._rejected_out_of_domain(mode, final_answer):
+                return self.NO_RESULTS_MESSAGE
+            if synthesized:
+                self._semantic_cache_store(user_query, query_embedding, final_answer, self._collect_contexts(validated_results))
+            
+            elapsed_time = time.time() - start_time
+            logger.info(f"Query processed successfully in {elapsed_time:.2f}s")
+            
+            return final_answer
+            
+        except Exception as e:
+            logger.error(f"Error processing query: {e}", exc_info=True)
+            return self.ERROR_MESSAGE
+    
+    def process_query_with_contexts(self, userquery: str, conversation_history: List[Dict] = None, mode: Optional[str] = None):
+        """
+        Agentic workflow but returns both final answer and validated contexts
+        for evaluation.
+        
+        Args:
+            userquery: User's question
+            conversation_history: Optional recent messages for context
+            mode: Optional pipeline mode override ("agentic", "direct", "auto")
+            
+        Returns:
+            finalanswer: str
+            contexts: List[str]  # all validated DB / web snippets used
+        """
+        return self._coalesced("contexts", self._process_query_with_contexts, userquery, conversation_history, mode)
+    
+    def _process_query_with_contexts(self, userquery: str, conversation_history: List[Dict] = None, mode: Optional[str] = None):
+        """
+        Run the pipeline for process_query_with_contexts.
+        """
+        import time
+
+        logger.info(f"[EVAL] Processing query with contexts: {userquery}")
+        if conversation_history:
+            logger.debug(f"[EVAL] Conversation history: {len(conversation_history)} messages")
+        starttime = time.time()
+        try:
+            # 0) Semantic cache
+            query_embedding, cached = self._semantic_cache_lookup(userquery, conversation_history)
+            if cached:
+                tag("mode", "cache")
+                logger.info(f"[EVAL] Query served from semantic cache in {time.time() - starttime:.2f}s")
+                return cached["answer"], cached["contexts"]
+
+            # 1-3) Decomposition, retrieval (parallel, fallback or direct) and validation
+            mode = self._select_mode(userquery, query_embedding, mode)
+            if mode == "direct":
+                validatedresults, failure_message = self._direct_retrieve_validated(userquery, query_embedding)
+            else:
+                validatedresults, failure_message = self._retrieve_validated(userquery, query_embedding)
+            if failure_message:
+                return failure_message, []
+
+            # 3b) Collect contexts as plain strings
+            contexts = self._collect_contexts(validatedresults)
+
+            # 4) Synthesis (with conversation history)
+            finalanswer, synthesized = self._synthesize_answer(
+                userquery, validatedresults, conversation_history, domain_check=mode == "direct"
+            )
+            if self._rejected_out_of_domain(mode, finalanswer):
+                return self.NO_RESULTS_MESSAGE, []
+            if synthesized:
+                self._semantic_cache_store(userquery, query_embedding, finalanswer, contexts)
+            elapsedtime = time.time() - starttime
+            logger.info(f"[EVAL] Query processed in {elapsedtime:.2f}s with {len(contexts)} contexts")
+
+            return finalanswer, contexts
+
+        except Exception as e:
+            logger.error(f"[EVAL] Error in process_query_with_contexts: {e}", exc_info=True)
+            return self.ERROR_MESSAGE, []
+
+    def process_query_stream(self, user_query: str, conversation_history: List[Dict] = None, mode: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Streaming variant of process_query_with_contexts.
+        
+        Yields events as soon as each is available:
+        - {"event": "contexts", "contexts": [...]} once retrieval/validation is done
+        - {"event": "chunk", "text": "..."} for each answer delta
+        - {"event": "final", "answer": "...", "contexts": [...]} at the end
+        
+        In direct mode the contexts event is held back until the first
+        deltas show the answer is not the out-of-domain marker.
+        
+        Args:
+            user_query: User's question
+            conversation_history: Optional recent messages for context
+            mode: Optional pipeline mode override ("agentic", "direct", "auto")
+            
+        Yields:
+            Event dictionaries (always ends with a "final" event)
+        """
+        logger.info(f"Processing streaming query: '{user_query}'")
+        start_time = time.time()
+        
+        try:
+            query_embedding, cached = self._semantic_cache_lookup(user_query, conversation_history)
+            if cached:
+                tag("mode", "cache")
+                yield {"event": "contexts", "contexts": cached["contexts"]}
+                yield {"event": "chunk", "text": cached["answer"]}
+                yield {"event": "final", "answer": cached["answer"], "contexts": cached["contexts"]}
+                return
+            
+            mode = self._select_mode(user_query, query_embedding, mode)
+            if mode == "direct":
+                validated_results, failure_message = self._direct_retrieve_validated(user_query, query_embedding)
+            else:
+                validated_results, failure_message = self._retrieve_validated(user_query, query_embedding)
+            if failure_message:
+                yield {"event": "final", "answer": failure_message, "contexts": []}
+                return
+            
+            contexts = self._collect_contexts(validated_results)
+            domain_check = mode == "direct"
+            released = not domain_check
+            if released:
+                yield {"event": "contexts", "contexts": contexts}
+            
+            parts = []
+            synthesis_started = time.perf_counter()
+            try:
+                for delta in self.llm_manager.synthesize_answer_stream(
+                    query=user_query,
+                    section_results=validated_results,
+                    conversation_history=conversation_history,
+                    domain_check=domain_check
+                ):
+                    parts.append(delta)
+                    if released:
+                        yield {"event": "chunk", "text": delta}
+                    elif not self._may_be_out_of_domain("".join(parts)):
+                        released = True
+                        yield {"event": "contexts", "contexts": contexts}
+                        yield {"event": "chunk", "text": "".join(parts)}
+                final_answer = "".join(parts).strip()
+                
+                if not released:
+                    if LLMManager.is_out_of_domain(final_answer):
+                        record_span("synthesize", (time.perf_counter() - synthesis_started) * 1000, streamed=True)
+                        yield {"event": "final", "answer": self.NO_RESULTS_MESSAGE, "contexts": []}
+                        return
+                    released = True
+                    yield {"event": "contexts", "contexts": contexts}
+                    yield {"event": "chunk", "text": final_answer}
+                self._semantic_cache_store(user_query, query_embedding, final_answer, contexts)
+                
+            except Exception as e:
+                logger.error(f"Streaming synthesis failed: {e}", exc_info=True)
+                if parts and released:
+                    # Deltas already reached the client; finish with what we have
+                    final_answer = "".join(parts).strip()
+                else:
+                    if not released:
+                        yield {"event": "contexts", "contexts": contexts}
+                    final_answer = self._fallback_synthesis(validated_results)
+                    yield {"event": "chunk", "text": final_answer}
+            record_span("synthesize", (time.perf_counter() - synthesis_started) * 1000, streamed=True)
+            logger.info(f"Streaming query processed in {time.time() - start_time:.2f}s")
+            yield {"event": "final", "answer": final_answer, "contexts": contexts}
+            
+        except Exception as e:
+            logger.error(f"Error in process_query_stream: {e}", exc_info=True)
+            yield {"event": "final", "answer": self.ERROR_MESSAGE, "contexts": []}
+
+    def _retrieve_validated(self, user_query: str, query_embedding: Optional[List[float]] = None) -> Tuple[Dict[str, List[Dict]], Optional[str]]:
+        """
+        Decompose, retrieve and validate (workflow steps 1-3).
+        
+        Args:
+            user_query: User's question
+            query_embedding: Optional precomputed embedding of user_query
+            
+        Returns:
+            (validated_results, failure_message); failure_message is the
+            user-facing answer when nothing usable was retrieved, else None
+        """
+        # Start the fallback search speculatively while decomposition runs
+        speculative = None
+        if self._speculation_executor is not None:
+            try:
+                speculative = submit_in_context(self._speculation_executor, self._fallback_retrieval, user_query, query_embedding)
+            except ExecutorSaturated as e:
+                # Optional work: the fallback runs inline later if it is needed
+                self._count(self.speculation_stats, "rejected")
+                logger.debug(f"Speculative retrieval not started: {e}")
+        
+        # Step 1: Decompose query and identify sections
+        logger.debug("Step 1: Query decomposition")
+        subqueries = self._decompose_query(user_query, query_embedding)
+        
+        # Check if empty dict (no relevant sections or out of domain)
+        if not subqueries:
+            logger.warning("No specific sections identified, using fallback retrieval")
+            # Fallback: retrieve top 3 from entire collection
+            section_results = self._resolve_speculative(speculative, user_query, query_embedding)
+        else:
+            self._discard_speculative(speculative)
+            logger.info(f"Identified {len(subqueries)} sections: {list(subqueries.keys())}")
+            # Step 2: Parallel retrieval from identified sections
+            logger.debug("Step 2: Parallel retrieval")
+            section_results = self._parallel_retrieval(subqueries)
+        
+        if not section_results:
+            logger.warning("No results retrieved")
+            return {}, self.NO_RESULTS_MESSAGE
+        
+        # Step 3: Validate results (error detection and basic filtering)
+        logger.debug("Step 3: Result validation")
+        validated_results = self._validate_results(section_results)
+        
+        if not validated_results:
+            logger.warning("No results passed validation")
+            return {}, self.VALIDATION_FAILED_MESSAGE
+        
+        # Step 3b: Deduplicate, trim and budget the contexts
+        return self._pack_contexts(user_query, validated_results, query_embedding), None
+
+    def _coalesced(self, kind: str, run, user_query: str, conversation_history: List[Dict] = None, mode: Optional[str] = None):
+        """
+        Run a query pipeline once for all concurrent identical requests.
+        
+        Requests arriving while an identical one (see _flight_key) is in
+        flight wait for its result instead of starting their own pipeline.
+        
+        Args:
+            kind: Result kind ("answer" or "contexts"), part of the key
+            run: Pipeline function taking (query, history, mode)
+            user_query: User's question
+            conversation_history: Optional recent messages for context
+            mode: Optional pipeline mode override
+            
+        Returns:
+            Result of run (shared with the coalesced requests)
+        """
+        if self.query_flight is None:
+            return run(user_query, conversation_history, mode)
+        
+        result, shared = self.query_flight.do(
+            self._flight_key(kind, user_query, conversation_history, mode),
+            run, user_query, conversation_history, mode
+        )
+        if shared:
+            self._mark_coalesced(user_query)
+        return result
+    
+    @staticmethod
+    def _flight_key(kind: str, user_query: str, conversation_history: List[Dict] = None, mode: Optional[str] = None) -> Tuple:
+        """
+        Coalescing key: normalized query text, history fingerprint and mode.
+        
+        Case, whitespace and trailing punctuation are ignored; the history
+        is hashed so follow-ups only coalesce within the same conversation state.
+        """
+        normalized = " ".join(user_query.lower().split()).rstrip("?!. ")
+        history = ""
+        if conversation_history:
+            history = hashlib.sha1(
+                json.dumps(conversation_history, sort_keys=True, default=str).encode("utf-8")
+            ).hexdigest()
+        return kind, normalized, history, mode
+    
+    @staticmethod
+    def _mark_coalesced(user_query: str):
+        """Tag a request answered by another request's pipeline run."""
+        tag("mode", "coalesced")
+        logger.info(f"Query coalesced with an identical in-flight request: '{user_query}'")
+    
+    def _select_mode(self, user_query: str, query_embedding: Optional[List[float]] = None, mode: Optional[str] = None) -> str:
+        """
+        Resolve the pipeline mode of a request and tag its trace.
+        
+        "auto" picks direct for short, single-part queries that (once the
+        router centroids are built) map confidently to one section.
+        
+        Args:
+            user_query: User's question
+            query_embedding: Optional precomputed embedding of user_query
+            mode: Requested mode (None = PIPELINE_MODE)
+            
+        Returns:
+            "agentic" or "direct"
+        """
+        if mode not in self.PIPELINE_MODES:
+            if mode is not None:
+                logger.warning(f"Unknown pipeline mode '{mode}', using '{self.PIPELINE_MODE}'")
+            mode = self.PIPELINE_MODE
+        
+        if mode == "auto":
+            mode = "direct" if self._is_direct_candidate(user_query, query_embedding) else "agentic"
+        
+        tag("mode", mode)
+        logger.debug(f"Pipeline mode: {mode}")
+        return mode
+    
+    def _is_direct_candidate(self, user_query: str, query_embedding: Optional[List[float]] = None) -> bool:
+        """True if a query looks short and single-topic enough for direct mode."""
+        if len(user_query.split()) > self.DIRECT_MAX_WORDS or _MULTI_PART_PATTERN.search(user_query):
+            return False
+        if not self.section_router.ready:
+            return True
+        try:
+            return self.section_router.classify(user_query, query_embedding) is not None
+        except Exception as e:
+            logger.error(f"Section classification failed, using agentic mode: {e}", exc_info=True)
+            return False
+    
+    @staticmethod
+    def _may_be_out_of_domain(text: str) -> bool:
+        """True while a streamed answer could still be the out-of-domain marker."""
+        return LLMManager.OUT_OF_DOMAIN_MARKER.startswith(LLMManager.normalize_domain_reply(text))
+    
+    def _rejected_out_of_domain(self, mode: str, answer: str) -> bool:
+        """True if a direct-mode synthesis answered with the out-of-domain marker."""
+        if mode == "direct" and LLMManager.is_out_of_domain(answer):
+            logger.info("Direct synthesis classified the query as out-of-domain")
+            return True
+        return False
+    
+    def _direct_retrieve_validated(self, user_query: str, query_embedding: Optional[List[float]] = None) -> Tuple[Dict[str, List[Dict]], Optional[str]]:
+        """
+        Direct-mode retrieval and validation (no decomposition call).
+        
+        Args:
+            user_query: User's question
+            query_embedding: Optional precomputed embedding of user_query
+            
+        Returns:
+            (validated_results, failure_message) as in _retrieve_validated
+        """
+        if query_embedding is None:
+            query_embedding = self.retriever.embed_query(user_query)
+        
+        section_results = self._direct_retrieval(user_query, query_embedding)
+        if not section_results:
+            logger.warning("No results retrieved")
+            return {}, self.NO_RESULTS_MESSAGE
+        
+        validated_results = self._validate_results(section_results)
+        if not validated_results:
+            logger.warning("No results passed validation")
+            return {}, self.VALIDATION_FAILED_MESSAGE
+        
+        return self._pack_contexts(user_query, validated_results, query_embedding), None
+    
+    def _classify_section(self, user_query: str, query_embedding: Optional[List[float]] = None) -> Optional[str]:
+        """Confident router section of a query, or None (errors are logged)."""
+        try:
+            return self.section_router.classify(user_query, query_embedding)
+        except Exception as e:
+            logger.error(f"Section classification failed, retrieving without boost: {e}", exc_info=True)
+            return None
+    
+    @timed("direct_retrieval")
+    def _direct_retrieval(self, user_query: str, query_embedding: Optional[List[float]] = None) -> Dict[str, List[Dict]]:
+        """
+        Retrieve with the raw query across the whole collection.
+        
+        When the section router is confident, results of that section get
+        a score boost (and, for web sections, a web search runs alongside).
+        
+        Args:
+            user_query: Original user question
+            query_embedding: Optional precomputed embedding of user_query
+            
+        Returns:
+            Dictionary of section -> list of results
+        """
+        boosted = self._classify_section(user_query, query_embedding)
+        logger.info(f"Executing direct retrieval (boosted section: {boosted})")
+        
+        top_k = self.DIRECT_TOP_K * 2 if boosted else self.DIRECT_TOP_K
+        web_results: List[Dict] = []
+        
+        web_future = None
+        if boosted in self.WEB_SEARCH_SECTIONS and self._web_search_early(user_query):
+            web_future = submit_in_context(self._web_executor, self.retriever.web_search, user_query, boosted)
+        
+        try:
+            db_results = self.retriever.vector_search(
+                query=user_query,
+                section_name=None,
+                top_k=top_k,
+                query_embedding=query_embedding
+            )
+        except Exception as e:
+            logger.error(f"Direct vector search failed: {e}", exc_info=True)
+            db_results = []
+        
+        if boosted in self.WEB_SEARCH_SECTIONS:
+            section_hits = [result for result in db_results if result.get('section') == boosted]
+            web_results = self._finish_web_search(boosted, user_query, section_hits, web_future)
+        
+        return self._group_direct_results(db_results, web_results, boosted)
+    
+    def _group_direct_results(self, db_results: List[Dict], web_results: List[Dict], boosted: Optional[str]) -> Dict[str, List[Dict]]:
+        """
+        Rerank direct-mode hits with the section boost and group them by section.
+        
+        Args:
+            db_results: Unfiltered vector search results
+            web_results: Web results for the boosted section (may be empty)
+            boosted: Confident router section, or None
+            
+        Returns:
+            Dictionary of section -> list of results
+        """
+        def boosted_score(result: Dict) -> float:
+            bonus = self.DIRECT_SECTION_BOOST if boosted and result.get('section') == boosted else 0.0
+            return result.get('score', 0.0) + bonus
+        
+        ranked = sorted(db_results, key=boosted_score, reverse=True)[:self.DIRECT_TOP_K]
+        
+        by_section: Dict[str, List[Dict]] = {}
+        for result in ranked:
+            by_section.setdefault(result.get('section') or 'general', []).append(result)
+        if web_results:
+            by_section.setdefault(boosted, [])
+        
+        section_results = {}
+        for section, results in by_section.items():
+            combined = self._combine_sources(results, web_results if section == boosted else [])
+            if combined:
+                section_results[section] = combined
+        
+        logger.debug(f"Direct retrieval: {len(ranked)} results across {list(section_results.keys())}")
+        return section_results
+    
+    def wait_until_warm(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until background warm-up has finished.
+        
+        Args:
+            timeout: Maximum seconds to wait (None = no limit)
+            
+        Returns:
+            True if warm-up finished within the timeout
+        """
+        return self._warm.wait(timeout)
+    
+    def _warm_up(self):
+        """
+        Background warm-up: model load and first forward pass, router
+        centroids, and (concurrently) OpenAI/MongoDB connection setup, the
+        BM25 index load and the background corpus fingerprint refresh.
+        
+        Each phase's duration is recorded in startup_phases; failures are
+        logged and leave the pipeline working lazily.
+        """
+        started = time.perf_counter()
+        
+        def run_phase(name, step):
+            phase_started = time.perf_counter()
+            try:
+                step()
+            except Exception as e:
+                logger.warning(f"Warm-up phase '{name}' failed: {e}")
+            self.startup_phases[name] = round((time.perf_counter() - phase_started) * 1000, 1)
+        
+        def warm_connections():
+            run_phase("openai_connection", self.llm_manager.warm_up_connection)
+            run_phase("mongo_connection", self.retriever.warm_up_connection)
+            run_phase("lexical_index", self.retriever.load_lexical_index)
+            if self.semantic_cache is not None:
+                run_phase("corpus_fingerprint", self.retriever.start_fingerprint_refresh)
+        
+        connections = None
+        if self.WARM_UP_CONNECTIONS:
+            connections = threading.Thread(target=warm_connections, name="rag-warm-connections", daemon=True)
+            connections.start()
+        else:
+            run_phase("lexical_index", self.retriever.load_lexical_index)
+            if self.semantic_cache is not None:
+                run_phase("corpus_fingerprint", self.retriever.start_fingerprint_refresh)
+        
+        run_phase("embedding_model", self.retriever.load_embedding_model)
+        run_phase("embedding_first_pass", lambda: self.retriever.embed_query("warm up"))
+        run_phase("section_router", self.section_router.build)
+        
+        if connections is not None:
+            connections.join()
+        
+        self.startup_phases["warm_up_total"] = round((time.perf_counter() - started) * 1000, 1)
+        self.state = "ready"
+        self._warm.set()
+        logger.info(f"Warm-up complete: {self.startup_phases}")
+    
+    def get_stats(self) -> Dict:
+        """
+        Get cache and routing statistics of the pipeline components.
+        
+        Returns:
+            Dictionary of per-component statistics (hit rates, bypass rate, ...)
+        """
+        return {
+            "semanticCache": self.semantic_cache.get_stats() if self.semantic_cache else None,
+            "decomposeCache": self.llm_manager.get_decompose_cache_stats(),
+            "webCache": self.retriever.get_web_cache_stats(),
+            "embeddingCache": self.retriever.get_embedding_cache_stats(),
+            "lexicalIndex": self.retriever.get_lexical_index_stats(),
+            "sectionRouter": self.section_router.get_stats(),
+            "speculation": self._snapshot(self.speculation_stats),
+            "contextPacking": self.context_packer.get_stats() if self.context_packer else None,
+            "pipelineMode": self.PIPELINE_MODE,
+            "webGate": {
+                "mode": self.WEB_SEARCH_GATE,
+                "minScore": self.WEB_GATE_MIN_SCORE,
+                **self._snapshot(self.web_gate_stats),
+            },
+            "coalescing": {
+                "queries": self.query_flight.get_stats() if self.query_flight is not None else None,
+                **self.retriever.get_coalescing_stats(),
+            },
+            "executors": {
+                "retrieval": self._retrieval_executor.get_stats(),
+                "web": self._web_executor.get_stats(),
+                "speculative": self._speculation_executor.get_stats() if self._speculation_executor is not None else None,
+                "deadlineSeconds": self.SECTION_TIMEOUT,
+                **self._snapshot(self.deadline_stats),
+            },
+        }
+    
+    def _count(self, stats: Dict[str, int], key: str, amount: int = 1):
+        """Increment a counter of one of the stats dictionaries (thread-safe)."""
+        with self._stats_lock:
+            stats[key] += amount
+    
+    def _snapshot(self, stats: Dict[str, int]) -> Dict[str, int]:
+        """Consistent copy of a stats dictionary."""
+        with self._stats_lock:
+            return dict(stats)
+    
+    def _resolve_speculative(self, speculative, user_query: str, query_embedding: Optional[List[float]] = None) -> Dict[str, List[Dict]]:
+        """
+        Use the speculative fallback results, or run the fallback search now.
+        
+        Args:
+            speculative: Future from the speculation executor (or None)
+            user_query: Original user question
+            query_embedding: Optional precomputed embedding of user_query
+            
+        Returns:
+            Fallback retrieval results
+        """
+        if speculative is not None:
+            try:
+                results = speculative.result(timeout=self.SECTION_TIMEOUT)
+                self._count(self.speculation_stats, "used")
+                logger.debug("Using speculative fallback retrieval results")
+                return results
+            except Exception as e:
+                logger.warning(f"Speculative retrieval failed, retrying fallback: {e}")
+        
+        return self._fallback_retrieval(user_query, query_embedding)
+    
+    def _discard_speculative(self, speculative):
+        """Drop speculative fallback results once sections were identified."""
+        if speculative is not None:
+            speculative.cancel()
+            self._count(self.speculation_stats, "discarded")
+    
+    async def aprocess_query_with_contexts(self, userquery: str, conversation_history: List[Dict] = None, mode: Optional[str] = None):
+        """
+        Async variant of process_query_with_contexts.
+        
+        LLM, Mongo and web calls are awaited on async clients and sections
+        are retrieved with asyncio.gather, so a single event loop can keep
+        many queries in flight without a thread per section. CPU-bound
+        embedding work runs in worker threads.
+        
+        Args:
+            userquery: User's question
+            conversation_history: Optional recent messages for context
+            mode: Optional pipeline mode override ("agentic", "direct", "auto")
+            
+        Returns:
+            finalanswer: str
+            contexts: List[str]  # all validated DB / web snippets used
+        """
+        if self.query_flight is None:
+            return await self._aprocess_query_with_contexts(userquery, conversation_history, mode)
+        
+        result, shared = await self.query_flight.ado(
+            self._flight_key("contexts", userquery, conversation_history, mode),
+            lambda: self._aprocess_query_with_contexts(userquery, conversation_history, mode)
+        )
+        if shared:
+            self._mark_coalesced(userquery)
+        return result
+    
+    async def _aprocess_query_with_contexts(self, userquery: str, conversation_history: List[Dict] = None, mode: Optional[str] = None):
+        """
+        Run the pipeline for aprocess_query_with_contexts.
+        """
+        logger.info(f"[ASYNC] Processing query with contexts: {userquery}")
+        starttime = time.time()
+        try:
+            query_embedding, cached = await asyncio.to_thread(
+                self._semantic_cache_lookup, userquery, conversation_history
+            )
+            if cached:
+                tag("mode", "cache")
+                logger.info(f"[ASYNC] Query served from semantic cache in {time.time() - starttime:.2f}s")
+                return cached["answer"], cached["contexts"]
+            
+            mode = await asyncio.to_thread(self._select_mode, userquery, query_embedding, mode)
+            if mode == "direct":
+                validatedresults, failure_message = await self._adirect_retrieve_validated(userquery, query_embedding)
+            else:
+                validatedresults, failure_message = await self._aretrieve_validated(userquery, query_embedding)
+            if failure_message:
+                return failure_message, []
+            
+            contexts = self._collect_contexts(validatedresults)
+            finalanswer, synthesized = await self._asynthesize_answer(
+                userquery, validatedresults, conversation_history, domain_check=mode == "direct"
+            )
+            if self._rejected_out_of_domain(mode, finalanswer):
+                return self.NO_RESULTS_MESSAGE, []
+            if synthesized:
+                await asyncio.to_thread(self._semantic_cache_store, userquery, query_embedding, finalanswer, contexts)
+            
+            logger.info(f"[ASYNC] Query processed in {time.time() - starttime:.2f}s with {len(contexts)} contexts")
+            return finalanswer, contexts
+            
+        except Exception as e:
+            logger.error(f"[ASYNC] Error in aprocess_query_with_contexts: {e}", exc_info=True)
+            return self.ERROR_MESSAGE, []
+    
+    def process_queries_batch(
+        self,
+        queries: List,
+        checkpoint_path: Optional[str] = None,
+        mode: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        llm_rate: Optional[float] = None,
+        llm_concurrency: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Answer many evaluation queries with high throughput.
+        
+        Runs aprocess_queries_batch on a new event loop; call that directly
+        from async code. Lazily created async API clients are bound to the
+        loop that created them, so every call gets fresh ones.
+        
+        Args:
+            queries: Questions (see aprocess_queries_batch)
+            checkpoint_path: Optional JSONL checkpoint/output file
+            mode: Optional pipeline mode for every query
+            batch_size: Queries per wave (default BATCH_SIZE)
+            llm_rate: LLM call starts per second (default BATCH_LLM_RATE, 0 = unlimited)
+            llm_concurrency: LLM calls in flight (default BATCH_LLM_CONCURRENCY, 0 = unlimited)
+            
+        Returns:
+            One result record per query, in input order
+        """
+        return asyncio.run(self.aprocess_queries_batch(
+            queries, checkpoint_path, mode, batch_size, llm_rate, llm_concurrency
+        ))
+    
+    async def aprocess_queries_batch(
+        self,
+        queries: List,
+        checkpoint_path: Optional[str] = None,
+        mode: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        llm_rate: Optional[float] = None,
+        llm_concurrency: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Async batch evaluation API.
+        
+        Queries run in waves of batch_size: a wave's questions are encoded
+        in one batched pass and decomposed concurrently, then all of the
+        wave's subqueries are encoded in one pass before retrieval and
+        synthesis. LLM calls share one rate limiter. The semantic cache and
+        request coalescing are bypassed, so every answer comes from a full
+        pipeline run.
+        
+        With a checkpoint_path, each finished query is appended to that
+        JSONL file as soon as it completes; queries already recorded there
+        successfully are skipped, so an interrupted run resumes where it
+        stopped (failed queries are retried).
+        
+        Args:
+            queries: Question strings, or dicts with "query" (or "question"),
+                optional "id" and "history", and any extra fields (e.g. a
+                reference answer) to copy into the result record
+            checkpoint_path: Optional JSONL checkpoint/output file
+            mode: Optional pipeline mode for every query
+            batch_size: Queries per wave (default BATCH_SIZE)
+            llm_rate: LLM call starts per second (default BATCH_LLM_RATE, 0 = unlimited)
+            llm_concurrency: LLM calls in flight (default BATCH_LLM_CONCURRENCY, 0 = unlimited)
+            
+        Returns:
+            One record per query, in input order: the input's extra fields
+            plus id, query, answer, contexts, pipelineMode, timings and
+            success (and error when the query failed)
+        """
+        items = self._batch_items(queries)
+        records = self.load_batch_checkpoint(checkpoint_path) if checkpoint_path else {}
+        pending = [item for item in items if item["id"] not in records]
+        batch_size = max(1, batch_size or self.BATCH_SIZE)
+        logger.info(
+            f"[BATCH] {len(items)} queries, {len(items) - len(pending)} already checkpointed, "
+            f"waves of {batch_size}"
+        )
+        
+        limiter = AsyncRateLimiter(
+            self.BATCH_LLM_RATE if llm_rate is None else llm_rate,
+            self.BATCH_LLM_CONCURRENCY if llm_concurrency is None else llm_concurrency
+        )
+        previous_limiter, self.llm_manager.rate_limiter = self.llm_manager.rate_limiter, limiter
+        started = time.time()
+        
+        try:
+            with self._open_checkpoint(checkpoint_path) if checkpoint_path else nullcontext() as checkpoint:
+                def on_record(record: Dict):
+                    records[record["id"]] = record
+                    if checkpoint is not None:
+                        checkpoint.write(json.dumps(record, default=str) + "\n")
+                        checkpoint.flush()
+                
+                for start in range(0, len(pending), batch_size):
+                    await self._abatch_wave(pending[start:start + batch_size], mode, on_record)
+                    logger.info(f"[BATCH] {min(start + batch_size, len(pending))}/{len(pending)} queries done")
+        finally:
+            self.llm_manager.rate_limiter = previous_limiter
+        
+        logger.info(f"[BATCH] Finished in {time.time() - started:.1f}s, LLM limiter: {limiter.get_stats()}")
+        return [records[item["id"]] for item in items]
+    
+    async def _abatch_wave(self, items: List[Dict], mode: Optional[str], on_record):
+        """
+        Process one wave of batch queries concurrently.
+        
+        Args:
+            items: Normalized batch items (see _batch_items)
+            mode: Optional pipeline mode for every query
+            on_record: Called with each result record as its query finishes
+        """
+        try:
+            query_embeddings = await asyncio.to_thread(
+                self.retriever.embed_queries, [item["query"] for item in items]
+            )
+        except Exception as e:
+            logger.error(f"[BATCH] Query encoding failed, encoding per query: {e}", exc_info=True)
+            query_embeddings = [None] * len(items)
+        
+        # Subqueries are encoded in one pass once every query has decomposed
+        submitted: Dict[int, List[str]] = {}
+        encoded: Dict[str, List[float]] = {}
+        all_submitted = asyncio.Event()
+        
+        async def encode_subqueries(index: int, texts: List[str]) -> Dict[str, List[float]]:
+            submitted[index] = texts
+            if len(submitted) == len(items):
+                unique = list(dict.fromkeys(text for group in submitted.values() for text in group))
+                if unique:
+                    try:
+                        encoded.update(zip(unique, await asyncio.to_thread(self.retriever.embed_queries, unique)))
+                    except Exception as e:
+                        logger.error(f"[BATCH] Subquery encoding failed, encoding per section: {e}", exc_info=True)
+                all_submitted.set()
+            await all_submitted.wait()
+            return encoded
+        
+        async def run_one(index: int, item: Dict):
+            with request_trace() as trace:
+                try:
+                    answer, contexts = await self._abatch_query(
+                        item, query_embeddings[index], mode, lambda texts: encode_subqueries(index, texts)
+                    )
+                    result = {"answer": answer, "contexts": contexts, "success": True}
+                except Exception as e:
+                    logger.error(f"[BATCH] Query '{item['id']}' failed: {e}", exc_info=True)
+                    if index not in submitted:
+                        await encode_subqueries(index, [])
+                    result = {"answer": None, "contexts": [], "success": False, "error": str(e)}
+            
+            registry.record_request(trace, success=result["success"])
+            on_record({
+                **item["extra"],
+                "id": item["id"],
+                "query": item["query"],
+                **result,
+                "pipelineMode": trace.tags.get("mode"),
+                "timings": trace.to_dict(),
+            })
+        
+        await asyncio.gather(*(run_one(index, item) for index, item in enumerate(items)))
+    
+    async def _abatch_query(self, item: Dict, query_embedding: Optional[List[float]], mode: Optional[str], encode_subqueries):
+        """
+        Full pipeline for one batch query, with its subqueries encoded wave-wide.
+        
+        Args:
+            item: Normalized batch item
+            query_embedding: Embedding of the query from the wave's batched pass
+            mode: Optional pipeline mode override
+            encode_subqueries: Coroutine function taking this query's subquery
+                texts (called exactly once) and returning text -> embedding
+            
+        Returns:
+            (answer, contexts)
+        """
+        query = item["query"]
+        if not query:
+            raise ValueError("Query cannot be empty")
+        
+        mode = await asyncio.to_thread(self._select_mode, query, query_embedding, mode)
+        if mode == "direct":
+            await encode_subqueries([])
+            validated_results, failure_message = await self._adirect_retrieve_validated(query, query_embedding)
+        else:
+            subqueries = await self._adecompose_query(query, query_embedding)
+            encoded = await encode_subqueries(list(subqueries.values()))
+            validated_results, failure_message = await self._aretrieve_subqueries(
+                query,
+                subqueries,
+                query_embedding,
+                subquery_embeddings={
+                    section: encoded[text] for section, text in subqueries.items() if text in encoded
+                }
+            )
+        if failure_message:
+            return failure_message, []
+        
+        contexts = self._collect_contexts(validated_results)
+        answer, _ = await self._asynthesize_answer(
+            query, validated_results, item["history"], domain_check=mode == "direct"
+        )
+        if self._rejected_out_of_domain(mode, answer):
+            return self.NO_RESULTS_MESSAGE, []
+        return answer, contexts
+    
+    @staticmethod
+    def _batch_items(queries: List) -> List[Dict]:
+        """
+        Normalize batch input into {id, query, history, extra} items.
+        
+        Raises:
+            ValueError: If two queries share an id
+        """
+        items = []
+        seen = set()
+        for index, entry in enumerate(queries):
+            if isinstance(entry, str):
+                entry = {"query": entry}
+            item_id = str(entry.get("id", index))
+            if item_id in seen:
+                raise ValueError(f"Duplicate batch query id: {item_id}")
+            seen.add(item_id)
+            items.append({
+                "id": item_id,
+                "query": (entry.get("query") or entry.get("question") or "").strip(),
+                "history": entry.get("history"),
+                "extra": {
+                    key: value for key, value in entry.items()
+                    if key not in ("id", "query", "question", "history")
+                },
+            })
+        return items
+    
+    @staticmethod
+    def _open_checkpoint(path: str):
+        """Open a batch checkpoint for appending, terminating a truncated last line."""
+        truncated = False
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                truncated = f.read(1) != b"\n"
+        
+        checkpoint = open(path, "a", encoding="utf-8")
+        if truncated:
+            checkpoint.write("\n")
+        return checkpoint
+    
+    @staticmethod
+    def load_batch_checkpoint(path: str) -> Dict[str, Dict]:
+        """
+        Successful records of an earlier batch run, by id (later lines win).
+        
+        A truncated last line (run killed mid-write) is ignored.
+        """
+        records: Dict[str, Dict] = {}
+        if not os.path.exists(path):
+            return records
+        
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"[BATCH] Skipping malformed checkpoint line in {path}")
+                    continue
+                if record.get("success"):
+                    records[str(record["id"])] = record
+                else:
+                    records.pop(str(record.get("id")), None)
+        return records
+    
+    async def _aretrieve_validated(self, user_query: str, query_embedding: Optional[List[float]] = None) -> Tuple[Dict[str, List[Dict]], Optional[str]]:
+        """
+        Async variant of _retrieve_validated (workflow steps 1-3).
+        """
+        speculative = None
+        if self.SPECULATIVE_RETRIEVAL:
+            speculative = asyncio.ensure_future(self._afallback_retrieval(user_query, query_embedding))
+        
+        subqueries = await self._adecompose_query(user_query, query_embedding)
+        return await self._aretrieve_subqueries(user_query, subqueries, query_embedding, speculative)
+    
+    async def _aretrieve_subqueries(
+        self,
+        user_query: str,
+        subqueries: Dict[str, str],
+        query_embedding: Optional[List[float]] = None,
+        speculative=None,
+        subquery_embeddings: Optional[Dict[str, List[float]]] = None
+    ) -> Tuple[Dict[str, List[Dict]], Optional[str]]:
+        """
+        Retrieve, validate and pack for decomposed subqueries (steps 2-3).
+        
+        Args:
+            user_query: User's question
+            subqueries: Output of decomposition ({} = fallback retrieval)
+            query_embedding: Optional precomputed embedding of user_query
+            speculative: Optional task already running the fallback search
+            subquery_embeddings: Optional precomputed section -> subquery embedding
+            
+        Returns:
+            (validated_results, failure_message), as for _aretrieve_validated
+        """
+        if not subqueries:
+            logger.warning("No specific sections identified, using fallback retrieval")
+            if speculative is not None:
+                self._count(self.speculation_stats, "used")
+                try:
+                    section_results = await asyncio.wait_for(speculative, timeout=self.SECTION_TIMEOUT)
+                except Exception as e:
+                    logger.error(f"Async speculative retrieval failed: {e!r}")
+                    section_results = {}
+            else:
+                section_results = await self._afallback_retrieval(user_query, query_embedding)
+        else:
+            if speculative is not None:
+                speculative.cancel()
+                self._count(self.speculation_stats, "discarded")
+            logger.info(f"Identified {len(subqueries)} sections: {list(subqueries.keys())}")
+            section_results = await self._aparallel_retrieval(subqueries, subquery_embeddings)
+        
+        if not section_results:
+            logger.warning("No results retrieved")
+            return {}, self.NO_RESULTS_MESSAGE
+        
+        validated_results = self._validate_results(section_results)
+        if not validated_results:
+            logger.warning("No results passed validation")
+            return {}, self.VALIDATION_FAILED_MESSAGE
+        
+        return await asyncio.to_thread(self._pack_contexts, user_query, validated_results, query_embedding), None
+    
+    async def _adirect_retrieve_validated(self, user_query: str, query_embedding: Optional[List[float]] = None) -> Tuple[Dict[str, List[Dict]], Optional[str]]:
+        """
+        Async variant of _direct_retrieve_validated.
+        """
+        if query_embedding is None:
+            query_embedding = await asyncio.to_thread(self.retriever.embed_query, user_query)
+        
+        section_results = await self._adirect_retrieval(user_query, query_embedding)
+        if not section_results:
+            logger.warning("No results retrieved")
+            return {}, self.NO_RESULTS_MESSAGE
+        
+        validated_results = self._validate_results(section_results)
+        if not validated_results:
+            logger.warning("No results passed validation")
+            return {}, self.VALIDATION_FAILED_MESSAGE
+        
+        return await asyncio.to_thread(self._pack_contexts, user_query, validated_results, query_embedding), None
+    
+    @timed("direct_retrieval")
+    async def _adirect_retrieval(self, user_query: str, query_embedding: Optional[List[float]] = None) -> Dict[str, List[Dict]]:
+        """
+        Async variant of _direct_retrieval (vector and web search gathered).
+        """
+        boosted = await asyncio.to_thread(self._classify_section, user_query, query_embedding)
+        top_k = self.DIRECT_TOP_K * 2 if boosted else self.DIRECT_TOP_K
+        
+        web_task = None
+        if boosted in self.WEB_SEARCH_SECTIONS and self._web_search_early(user_query):
+            web_task = asyncio.ensure_future(self.retriever.aweb_search(user_query, boosted))
+        
+        try:
+            db_results = await asyncio.wait_for(
+                self.retriever.avector_search(query=user_query, section_name=None, top_k=top_k, query_embedding=query_embedding),
+                timeout=self.SECTION_TIMEOUT
+            )
+        except Exception as e:
+            logger.error(f"Async direct vector search failed: {e!r}")
+            db_results = []
+        
+        web_results: List[Dict] = []
+        if boosted in self.WEB_SEARCH_SECTIONS:
+            section_hits = [result for result in db_results if result.get('section') == boosted]
+            web_results = await self._afinish_web_search(boosted, user_query, section_hits, web_task)
+        
+        return self._group_direct_results(db_results, web_results, boosted)
+    
+    @timed("decompose")
+    async def _adecompose_query(self, user_query: str, query_embedding: Optional[List[float]] = None) -> Dict[str, str]:
+        """
+        Async variant of _decompose_query.
+        """
+        try:
+            routed = await asyncio.to_thread(self.section_router.route, user_query, query_embedding)
+            if routed:
+                logger.debug(f"Section router bypassed LLM decomposition: {list(routed.keys())}")
+                return routed
+        except Exception as e:
+            logger.error(f"Section routing failed, using LLM decomposition: {e}", exc_info=True)
+        
+        try:
+            return await self.llm_manager.adecompose_query(
+                user_query,
+                section_definitions=self.SECTION_DEFINITIONS
+            ) or {}
+        except Exception as e:
+            logger.error(f"Async query decomposition failed: {e}", exc_info=True)
+            return {}
+    
+    @timed("fallback_retrieval")
+    async def _afallback_retrieval(self, user_query: str, query_embedding: Optional[List[float]] = None) -> Dict[str, List[Dict]]:
+        """
+        Async variant of _fallback_retrieval.
+        """
+        try:
+            results = await asyncio.wait_for(
+                self.retriever.avector_search(
+                    query=user_query,
+                    section_name=None,
+                    top_k=3,
+                    query_embedding=query_embedding
+                ),
+                timeout=self.SECTION_TIMEOUT
+            )
+            return {'general': results} if results else {}
+        except asyncio.TimeoutError:
+            logger.error(f"Async fallback retrieval timed out after {self.SECTION_TIMEOUT}s")
+            return {}
+        except Exception as e:
+            logger.error(f"Async fallback retrieval failed: {e}", exc_info=True)
+            return {}
+    
+    async def _aparallel_retrieval(self, subqueries: Dict[str, str], embeddings: Optional[Dict[str, List[float]]] = None) -> Dict[str, List[Dict]]:
+        """
+        Async variant of _parallel_retrieval (one batched encode, then gather).
+        
+        Subquery embeddings encoded by the caller (e.g. across a whole
+        batch of queries) can be passed in to skip the encode.
+        """
+        if embeddings is None:
+            embeddings = await asyncio.to_thread(self._embed_subqueries, subqueries)
+        sections = list(subqueries.keys())
+        
+        groups = self._group_subqueries(subqueries, embeddings)
+        if len(groups) < len(subqueries):
+            return await self._agrouped_retrieval(subqueries, groups)
+        
+        outcomes = await asyncio.gather(
+            *(
+                asyncio.wait_for(
+                    self._aretrieve_for_section(section, subqueries[section], embeddings.get(section)),
+                    timeout=self.SECTION_TIMEOUT
+                )
+                for section in sections
+            ),
+            return_exceptions=True
+        )
+        
+        section_results = {}
+        for section, outcome in zip(sections, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"Async retrieval failed for section '{section}': {outcome!r}")
+            elif outcome:
+                section_results[section] = outcome
+        
+        logger.info(f"Async parallel retrieval complete: {len(section_results)} sections returned results")
+        return section_results
     
-    def __init__(self):
+    async def _agrouped_retrieval(self, subqueries: Dict[str, str], groups: List[Dict]) -> Dict[str, List[Dict]]:
         """
-        Initialize orchestrator with required components.
+        Async variant of _grouped_retrieval.
+        """
+        web_sections = [section for section in subqueries if section in self.WEB_SEARCH_SECTIONS]
+        web_tasks = {
+            section: asyncio.ensure_future(self.retriever.aweb_search(subqueries[section], section))
+            for section in web_sections
+            if self._web_search_early(subqueries[section])
+        }
         
-        Raises:
-            Exception: If initialization of any component fails
+        outcomes = await asyncio.gather(
+            *(
+                asyncio.wait_for(
+                    self.retriever.agrouped_vector_search(group["query"], group["sections"], 3, group["embedding"]),
+                    timeout=self.SECTION_TIMEOUT
+                )
+                for group in groups
+            ),
+            return_exceptions=True
+        )
+        
+        db_results: Dict[str, List[Dict]] = {}
+        for group, outcome in zip(groups, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"Async grouped vector search failed for {group['sections']}: {outcome!r}")
+            else:
+                db_results.update(outcome)
+        
+        web_outcomes = await asyncio.gather(*(
+            self._afinish_web_search(section, subqueries[section], db_results.get(section, []), web_tasks.get(section))
+            for section in web_sections
+        ))
+        web_results = dict(zip(web_sections, web_outcomes))
+        
+        section_results = {}
+        for section in subqueries:
+            combined = self._combine_sources(db_results.get(section, []), web_results.get(section, []))
+            if combined:
+                section_results[section] = combined
+        return section_results
+    
+    async def _aretrieve_for_section(self, section: str, subquery: str, query_embedding: Optional[List[float]] = None) -> List[Dict]:
         """
-        logger.info("Initializing Agentic Orchestrator")
+        Async variant of _retrieve_for_section (an early web search is
+        cancelled outright when the gate skips it).
+        """
+        web_task = None
+        if section in self.WEB_SEARCH_SECTIONS and self._web_search_early(subquery):
+            web_task = asyncio.ensure_future(self.retriever.aweb_search(subquery, section))
         
         try:
-            self.llm_manager = LLMManager()
-            logger.debug("LLM Manager initialized")
-            
-            self.retriever = Retriever()
-            logger.debug("Retriever initialized")
+            db_results = await self.retriever.avector_search(
+                query=subquery,
+                section_name=section,
+                top_k=3,
+                query_embedding=query_embedding
+            )
             
-            self.validator = ResultValidator()
-            logger.debug("Result Validator initialized")
+            web_results = []
+            if section in self.WEB_SEARCH_SECTIONS:
+                web_results = await self._afinish_web_search(section, subquery, db_results, web_task)
             
-            logger.info("Orchestrator initialization complete")
+            return self._combine_sources(db_results, web_results)
             
         except Exception as e:
-            logger.error(f"Failed to initialize orchestrator: {e}", exc_info=True)
-            raise
+            if web_task is not None:
+                web_task.cancel()
+            logger.error(f"Error retrieving for section '{section}': {e}", exc_info=True)
+            return []
     
-    def process_query(self, user_query: str, conversation_history: List[Dict] = None) -> str:
+    async def _afinish_web_search(self, section: str, subquery: str, db_results: List[Dict], web_task=None) -> List[Dict]:
         """
-        Main entry point for query processing.
+        Async variant of _finish_web_search (a skipped early search is cancelled).
+        """
+        if not self._web_gate(section, subquery, db_results, started=web_task is not None):
+            if web_task is not None:
+                web_task.cancel()
+            return []
         
-        Implements the full agentic workflow:
-        1. Query validation and decomposition
-        2. Parallel multi-section retrieval OR fallback retrieval
-        3. Result validation
-        4. Synthesis into final answer
+        try:
+            if web_task is None:
+                web_task = self.retriever.aweb_search(subquery, section)
+            return await asyncio.wait_for(web_task, timeout=self.SECTION_TIMEOUT)
+        except Exception as e:
+            logger.error(f"Async web search failed for section '{section}': {e!r}")
+            return []
+    
+    @timed("synthesize")
+    async def _asynthesize_answer(self, original_query: str, validated_results: Dict[str, List[Dict]], conversation_history: List[Dict] = None, domain_check: bool = False) -> Tuple[str, bool]:
+        """
+        Async variant of _synthesize_answer.
+        """
+        try:
+            answer = await self.llm_manager.asynthesize_answer(
+                query=original_query,
+                section_results=validated_results,
+                conversation_history=conversation_history,
+                domain_check=domain_check
+            )
+            return answer, True
+        except Exception as e:
+            logger.error(f"Async answer synthesis failed: {e}", exc_info=True)
+            return self._fallback_synthesis(validated_results), False
+    
+    @timed("semantic_cache")
+    def _semantic_cache_lookup(self, user_query: str, conversation_history: List[Dict] = None) -> Tuple[Optional[List[float]], Optional[Dict]]:
+        """
+        Look up a near-duplicate question in the semantic cache.
+        
+        Follow-up questions (non-empty conversation history) bypass the
+        cache, since their answer depends on the preceding turns.
         
         Args:
-            user_query: User's natural language question
-            conversation_history: Optional list of recent messages for context
+            user_query: User's question
+            conversation_history: Optional recent messages for context
             
         Returns:
-            Final synthesized answer string
+            (query_embedding, cached_entry); either may be None. The embedding
+            is reused for fallback retrieval and for storing the answer.
         """
-        logger.info(f"Processing query: '{user_query}'")
-        if conversation_history:
-            logger.debug(f"Conversation history: {len(conversation_history)} messages")
-        start_time = time.time()
+        if self.semantic_cache is None or conversation_history:
+            return None, None
         
         try:
-            # Step 1: Decompose query and identify sections
-            logger.debug("Step 1: Query decomposition")
-            subqueries = self._decompose_query(user_query)
-            
-            # Check if empty dict (no relevant sections or out of domain)
-            if not subqueries or subqueries == {}:
-                logger.warning(f"No specific sections identified, using fallback retrieval")
-                # Fallback: retrieve top 3 from entire collection
-                section_results = self._fallback_retrieval(user_query)
-            else:
-                logger.info(f"Identified {len(subqueries)} sections: {list(subqueries.keys())}")
-                # Step 2: Parallel retrieval from identified sections
-                logger.debug("Step 2: Parallel retrieval")
-                section_results = self._parallel_retrieval(subqueries)
-            
-            if not section_results:
-                logger.warning("No results retrieved")
-                return "I apologize, but I couldn't find relevant information to answer your query. Please try rephrasing or ask about college administration topics."
-            
-            # Step 3: Validate results (error detection and basic filtering)
-            logger.debug("Step 3: Result validation")
-            validated_results = self._validate_results(section_results)
-            
-            if not validated_results:
-                logger.warning("No results passed validation")
-                return "I found some information, but it appears to contain errors or may not be reliable. Please rephrase or contact the administration directly."
-            
-            # Step 4: Synthesize final answer (with conversation history)
-            logger.debug("Step 4: Answer synthesis")
-            final_answer = self._synthesize_answer(user_query, validated_results, conversation_history)
-            
-            elapsed_time = time.time() - start_time
-            logger.info(f"Query processed successfully in {elapsed_time:.2f}s")
-            
-            return final_answer
-            
+            query_embedding = self.retriever.embed_query(user_query)
+            cached = self.semantic_cache.lookup(query_embedding, self.retriever.corpus_fingerprint())
+            return query_embedding, cached
         except Exception as e:
-            logger.error(f"Error processing query: {e}", exc_info=True)
-            return f"I encountered an error while processing your request. Please try again or contact support."
+            logger.error(f"Semantic cache lookup failed: {e}", exc_info=True)
+            return None, None
     
-    def process_query_with_contexts(self, userquery: str, conversation_history: List[Dict] = None):
+    def _semantic_cache_store(self, user_query: str, query_embedding: Optional[List[float]], answer: str, contexts: List[str]):
         """
-        Agentic workflow but returns both final answer and validated contexts
-        for evaluation.
+        Store a synthesized answer in the semantic cache.
         
         Args:
-            userquery: User's question
-            conversation_history: Optional recent messages for context
+            user_query: User's question
+            query_embedding: Embedding from _semantic_cache_lookup (None = not cacheable)
+            answer: Final synthesized answer
+            contexts: Validated contexts used for the answer
+        """
+        if self.semantic_cache is None or query_embedding is None:
+            return
+        
+        try:
+            self.semantic_cache.store(user_query, query_embedding, answer, contexts, self.retriever.corpus_fingerprint())
+        except Exception as e:
+            logger.error(f"Semantic cache store failed: {e}", exc_info=True)
+    
+    def _collect_contexts(self, validated_results: Dict[str, List[Dict]]) -> List[str]:
+        """
+        Collect validated results as plain context strings.
+        
+        Args:
+            validated_results: Validated results from all sections
             
         Returns:
-            finalanswer: str
-            contexts: List[str]  # all validated DB / web snippets used
+            List of DB / web snippets
         """
-        import time
-
-        logger.info(f"[EVAL] Processing query with contexts: {userquery}")
-        if conversation_history:
-            logger.debug(f"[EVAL] Conversation history: {len(conversation_history)} messages")
-        starttime = time.time()
-        try:
-            # 1) Decomposition
-            subqueries = self._decompose_query(userquery)
-
-            # 2) Retrieval (parallel or fallback)
-            if not subqueries or not subqueries:
-                logger.info("[EVAL] No sections identified, using fallback retrieval")
-                sectionresults = self._fallback_retrieval(userquery)
-            else:
-                logger.info(f"[EVAL] Identified {len(subqueries)} sections: {list(subqueries.keys())}")
-                sectionresults = self._parallel_retrieval(subqueries)
-
-            if not sectionresults:
-                logger.warning("[EVAL] No results retrieved")
-                return (
-                    "I apologize, but I couldn't find relevant information to answer your query. "
-                    "Please try rephrasing or ask about college administration topics.",
-                    []
-                )
-
-            # 3) Validation
-            validatedresults = self._validate_results(sectionresults)
-            if not validatedresults:
-                logger.warning("[EVAL] No results passed validation")
-                return (
-                    "I found some information, but it appears to contain errors or may not be reliable. "
-                    "Please rephrase or contact the administration directly.",
-                    []
+        contexts: list[str] = []
+        for section, results in validated_results.items():
+            for result in results:
+                # try typical keys from retriever / web search
+                text = (
+                    result.get("content")
+                    or result.get("text")
+                    or result.get("snippet")
+                    or ""
                 )
-
-            # 3b) Collect contexts as plain strings
-            contexts: list[str] = []
-            for section, results in validatedresults.items():
-                for result in results:
-                    # try typical keys from retriever / web search
-                    text = (
-                        result.get("content")
-                        or result.get("text")
-                        or result.get("snippet")
-                        or ""
-                    )
-                    if text:
-                        contexts.append(text)
-
-            # 4) Synthesis (with conversation history)
-            finalanswer = self._synthesize_answer(userquery, validatedresults, conversation_history)
-            elapsedtime = time.time() - starttime
-            logger.info(f"[EVAL] Query processed in {elapsedtime:.2f}s with {len(contexts)} contexts")
-
-            return finalanswer, contexts
-
-        except Exception as e:
-            logger.error(f"[EVAL] Error in process_query_with_contexts: {e}", exc_info=True)
-            return (
-                "I encountered an error while processing your request. "
-                "Please try again or contact support.",
-                []
-            )
-
-    def _decompose_query(self, user_query: str) -> Dict[str, str]:
+                if text:
+                    contexts.append(text)
+        return contexts
+    
+    @timed("decompose")
+    def _decompose_query(self, user_query: str, query_embedding: Optional[List[float]] = None) -> Dict[str, str]:
         """
         Decompose user query into section-specific subqueries.
         
-        Uses LLM with detailed section context to:
+        Clearly single-section queries are routed locally by the section
+        router (raw query used as the subquery). Otherwise uses LLM with
+        detailed section context to:
         - Validate query is within college/campus domain
         - Identify relevant sections
         - Generate optimized subqueries for each section
         
         Args:
             user_query: Original user question
+            query_embedding: Optional precomputed embedding of user_query
             
         Returns:
             Dictionary mapping section names to subqueries, or {} if no match/out of domain
         """
+        try:
+            routed = self.section_router.route(user_query, query_embedding)
+            if routed:
+                logger.debug(f"Section router bypassed LLM decomposition: {list(routed.keys())}")
+                return routed
+        except Exception as e:
+            logger.error(f"Section routing failed, using LLM decomposition: {e}", exc_info=True)
+        
         logger.debug("Decomposing query with LLM")
         
         try:
@@ -256,7 +1675,8 @@ class AgenticOrchestrator:
             logger.warning("Falling back to general retrieval due to decomposition error")
             return {}
     
-    def _fallback_retrieval(self, user_query: str) -> Dict[str, List[Dict]]:
+    @timed("fallback_retrieval")
+    def _fallback_retrieval(self, user_query: str, query_embedding: Optional[List[float]] = None) -> Dict[str, List[Dict]]:
         """
         Fallback retrieval when no specific sections are identified.
         
@@ -266,6 +1686,7 @@ class AgenticOrchestrator:
         
         Args:
             user_query: Original user question
+            query_embedding: Optional precomputed embedding of user_query
             
         Returns:
             Dictionary with 'general' key containing top results
@@ -276,7 +1697,8 @@ class AgenticOrchestrator:
             results = self.retriever.vector_search(
                 query=user_query,
                 section_name=None,  # No filtering
-                top_k=3
+                top_k=3,
+                query_embedding=query_embedding
             )
             
             if results:
@@ -294,11 +1716,15 @@ class AgenticOrchestrator:
         """
         Execute parallel retrieval across multiple sections.
         
-        For each section:
+        All subqueries are embedded up front in a single batched encode call,
+        then for each section (on the shared retrieval pool):
         - Performs vector search with metadata filtering
         - Optionally augments with web search (scholarship, exam_center)
         - Combines and returns results
         
+        Sections still running at the SECTION_TIMEOUT deadline are left
+        out of the results (see _collect_until).
+        
         Args:
             subqueries: Dictionary of section -> subquery mappings
             
@@ -308,54 +1734,245 @@ class AgenticOrchestrator:
         logger.debug(f"Starting parallel retrieval for {len(subqueries)} sections")
         
         section_results = {}
+        embeddings = self._embed_subqueries(subqueries)
         
-        with ThreadPoolExecutor(max_workers=len(subqueries)) as executor:
-            # Submit all retrieval tasks
-            future_to_section = {
-                executor.submit(
-                    self._retrieve_for_section, 
-                    section, 
-                    subquery
-                ): section
-                for section, subquery in subqueries.items()
-            }
-            
-            # Collect results as they complete
-            for future in as_completed(future_to_section):
-                section = future_to_section[future]
-                try:
-                    results = future.result(timeout=30)  # 30 second timeout per section
-                    if results:
-                        section_results[section] = results
-                        logger.debug(f"Retrieved {len(results)} results from '{section}'")
-                    else:
-                        logger.debug(f"No results from '{section}'")
-                        
-                except Exception as e:
-                    logger.error(f"Retrieval failed for section '{section}': {e}", exc_info=True)
+        groups = self._group_subqueries(subqueries, embeddings)
+        if len(groups) < len(subqueries):
+            return self._grouped_retrieval(subqueries, groups)
+        
+        # All sections share one deadline, counted from submission
+        deadline = time.perf_counter() + self.SECTION_TIMEOUT
+        future_to_section = {}
+        for section, subquery in subqueries.items():
+            future = self._submit_retrieval(self._retrieve_for_section, section, subquery, embeddings.get(section), deadline)
+            if future is not None:
+                future_to_section[future] = section
+        
+        for section, results in self._collect_until(future_to_section, deadline, "parallel_retrieval").items():
+            if results:
+                section_results[section] = results
+                logger.debug(f"Retrieved {len(results)} results from '{section}'")
+            else:
+                logger.debug(f"No results from '{section}'")
         
         logger.info(f"Parallel retrieval complete: {len(section_results)} sections returned results")
         return section_results
     
-    def _retrieve_for_section(self, section: str, subquery: str) -> List[Dict]:
+    def _submit_retrieval(self, fn, *args):
+        """
+        Submit a retrieval task to the shared retrieval pool.
+        
+        Returns:
+            Future, or None when the pool's backlog is full (the task is
+            dropped and counted in deadline_stats["rejected"])
+        """
+        try:
+            return submit_in_context(self._retrieval_executor, fn, *args)
+        except ExecutorSaturated as e:
+            self._count(self.deadline_stats, "rejected")
+            record_decision("retrieval_rejected", queued=self._retrieval_executor.queue_depth)
+            logger.warning(f"Retrieval task dropped: {e}")
+            return None
+    
+    def _collect_until(self, futures: Dict, deadline: float, stage: str, executor: Optional[BoundedExecutor] = None) -> Dict:
+        """
+        Collect task results until a deadline, then cut over to partial results.
+        
+        Tasks still pending at the deadline are abandoned (cancelled if
+        still queued, otherwise left to finish unobserved). The cut-over is
+        counted in deadline_stats and logged on the request trace.
+        
+        Args:
+            futures: Dictionary of future -> key (section or group sections)
+            deadline: time.perf_counter() value to stop waiting at
+            stage: Stage name for logs and the trace
+            executor: Executor the futures belong to (default: retrieval pool)
+            
+        Returns:
+            Dictionary of key -> result for the tasks that succeeded in time
+        """
+        done, late = gather_until(futures, deadline)
+        
+        results = {}
+        for key, future in done.items():
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                logger.error(f"{stage} failed for {key}: {e}", exc_info=True)
+        
+        if late:
+            running = (executor or self._retrieval_executor).abandon(late.values())
+            self._count(self.deadline_stats, "partial")
+            self._count(self.deadline_stats, "late", len(late))
+            record_decision("deadline", stage=stage, late=list(late), running=running)
+            logger.warning(
+                f"{stage}: {len(late)} task(s) missed the {self.SECTION_TIMEOUT}s deadline, "
+                f"continuing with partial results"
+            )
+        return results
+    
+    def _group_subqueries(self, subqueries: Dict[str, str], embeddings: Dict[str, List[float]]) -> List[Dict]:
+        """
+        Group sections that can share a single vector search.
+        
+        Args:
+            subqueries: Dictionary of section -> subquery mappings
+            embeddings: Dictionary of section -> subquery embedding
+            
+        Returns:
+            List of {"sections", "query", "embedding"} groups
+        """
+        sections = list(subqueries.keys())
+        
+        if self.RETRIEVAL_GROUPING == "merged" and len(sections) > 1:
+            vectors = [embeddings.get(section) for section in sections]
+            merged = None
+            if all(v is not None for v in vectors):
+                import numpy as np
+                
+                mean = np.mean(np.asarray(vectors, dtype=np.float32), axis=0)
+                norm = np.linalg.norm(mean)
+                merged = (mean / norm if norm else mean).tolist()
+            return [{
+                "sections": sections,
+                "query": " ".join(subqueries[section] for section in sections),
+                "embedding": merged,
+            }]
+        
+        if self.RETRIEVAL_GROUPING == "shared":
+            by_text: Dict[str, Dict] = {}
+            for section in sections:
+                key = " ".join(subqueries[section].lower().split())
+                group = by_text.setdefault(key, {
+                    "sections": [],
+                    "query": subqueries[section],
+                    "embedding": embeddings.get(section),
+                })
+                group["sections"].append(section)
+            return list(by_text.values())
+        
+        return [
+            {"sections": [section], "query": subqueries[section], "embedding": embeddings.get(section)}
+            for section in sections
+        ]
+    
+    def _grouped_retrieval(self, subqueries: Dict[str, str], groups: List[Dict]) -> Dict[str, List[Dict]]:
+        """
+        Retrieve with one multi-section vector search per group.
+        
+        Web searches still run per section (on each section's own subquery),
+        gated on the grouped vector search results (see _web_gate). Vector
+        and web searches share one SECTION_TIMEOUT deadline.
+        
+        Args:
+            subqueries: Dictionary of section -> subquery mappings
+            groups: Output of _group_subqueries
+            
+        Returns:
+            Dictionary of section -> list of results
+        """
+        logger.debug(f"Grouped retrieval: {len(subqueries)} sections in {len(groups)} vector searches")
+        
+        web_sections = [section for section in subqueries if section in self.WEB_SEARCH_SECTIONS]
+        db_results: Dict[str, List[Dict]] = {}
+        
+        web_futures = {
+            section: submit_in_context(self._web_executor, self.retriever.web_search, subqueries[section], section)
+            for section in web_sections
+            if self._web_search_early(subqueries[section])
+        }
+        
+        deadline = time.perf_counter() + self.SECTION_TIMEOUT
+        db_futures = {}
+        for group in groups:
+            future = self._submit_retrieval(
+                self.retriever.grouped_vector_search,
+                group["query"],
+                group["sections"],
+                3,
+                group["embedding"]
+            )
+            if future is not None:
+                db_futures[future] = tuple(group["sections"])
+        
+        for grouped in self._collect_until(db_futures, deadline, "grouped_vector_search").values():
+            db_results.update(grouped)
+        
+        # Gate every web section first so the remaining searches run concurrently
+        pending = {}
+        for section in web_sections:
+            future = web_futures.get(section)
+            if self._web_gate(section, subqueries[section], db_results.get(section, []), started=future is not None):
+                pending[section] = future or submit_in_context(
+                    self._web_executor, self.retriever.web_search, subqueries[section], section
+                )
+            elif future is not None:
+                future.cancel()
+        
+        web_results = self._collect_until(
+            {future: section for section, future in pending.items()},
+            deadline,
+            "web_search",
+            executor=self._web_executor
+        )
+        
+        section_results = {}
+        for section in subqueries:
+            combined = self._combine_sources(db_results.get(section, []), web_results.get(section, []))
+            if combined:
+                section_results[section] = combined
+        
+        logger.info(f"Grouped retrieval complete: {len(section_results)} sections returned results")
+        return section_results
+    
+    def _embed_subqueries(self, subqueries: Dict[str, str]) -> Dict[str, List[float]]:
+        """
+        Encode every subquery in one batched embedding call.
+        
+        Args:
+            subqueries: Dictionary of section -> subquery mappings
+            
+        Returns:
+            Dictionary of section -> embedding vector, or {} if encoding failed
+            (each section then encodes its own subquery)
+        """
+        sections = list(subqueries.keys())
+        
+        try:
+            vectors = self.retriever.embed_queries([subqueries[s] for s in sections])
+            return dict(zip(sections, vectors))
+        except Exception as e:
+            logger.error(f"Batch embedding failed, encoding per section: {e}", exc_info=True)
+            return {}
+    
+    def _retrieve_for_section(self, section: str, subquery: str, query_embedding: Optional[List[float]] = None, deadline: Optional[float] = None) -> List[Dict]:
         """
         Retrieve results for a single section.
         
         Args:
             section: Section name
             subquery: Optimized subquery for this section
+            query_embedding: Optional precomputed embedding of subquery
+            deadline: Optional time.perf_counter() value the request stops
+                waiting at (bounds the wait for the web search)
             
         Returns:
             List of retrieved documents/chunks
         """
         logger.debug(f"Retrieving for section '{section}' with query: '{subquery}'")
         
+        # Start the web search right away when the gate cannot skip it
+        web_future = None
+        if section in self.WEB_SEARCH_SECTIONS and self._web_search_early(subquery):
+            web_future = submit_in_context(self._web_executor, self.retriever.web_search, subquery, section)
+        
         try:
             # Always perform vector search
             db_results = self.retriever.vector_search(
                 query=subquery,
                 section_name=section,
-                top_k=3
+                top_k=3,
+                query_embedding=query_embedding
             )
             
             logger.debug(f"Vector search returned {len(db_results)} results for '{section}'")
@@ -363,8 +1980,7 @@ class AgenticOrchestrator:
             # Conditionally perform web search
             web_results = []
             if section in self.WEB_SEARCH_SECTIONS:
-                logger.debug(f"Performing web search for '{section}'")
-                web_results = self.retriever.web_search(subquery, section)
+                web_results = self._finish_web_search(section, subquery, db_results, web_future, deadline)
                 logger.debug(f"Web search returned {len(web_results)} results")
             
             # Combine results
@@ -374,9 +1990,123 @@ class AgenticOrchestrator:
             return combined
             
         except Exception as e:
+            if web_future is not None:
+                web_future.cancel()
             logger.error(f"Error retrieving for section '{section}': {e}", exc_info=True)
             return []
     
+    def _web_search_early(self, subquery: str) -> bool:
+        """True if a web search should start alongside its vector search."""
+        if self.WEB_SEARCH_GATE != "gate":
+            return True
+        return self._is_time_sensitive(subquery)
+    
+    @staticmethod
+    def _is_time_sensitive(text: str) -> bool:
+        """True if a query asks about dates, deadlines, results or other fresh information."""
+        return bool(_TIME_SENSITIVE_PATTERN.search(text or ""))
+    
+    @staticmethod
+    def _top_vector_score(db_results: List[Dict]) -> Optional[float]:
+        """
+        Best vector similarity among vector search results.
+        
+        Hybrid results carry the fused rank score in "score" and the raw
+        similarity in "vector_score" (None for BM25-only hits).
+        """
+        scores = [
+            result['vector_score'] if 'vector_score' in result else result.get('score')
+            for result in db_results
+        ]
+        scores = [score for score in scores if score is not None]
+        return max(scores) if scores else None
+    
+    def _web_gate(self, section: str, subquery: str, db_results: List[Dict], started: bool = False) -> bool:
+        """
+        Decide whether a web section still needs its web search.
+        
+        The web is skipped only when the gate is on, the query has no
+        time-sensitive cues and either the best vector similarity clears
+        WEB_GATE_MIN_SCORE or the results answer a BM25 keyword lookup.
+        The decision is counted in web_gate_stats and logged on the request
+        trace.
+        
+        Args:
+            section: Web search section
+            subquery: Subquery searched for the section
+            db_results: Vector search results for the section
+            started: Whether the web search is already running
+            
+        Returns:
+            True if the web search results are needed
+        """
+        top_score = self._top_vector_score(db_results)
+        if self.WEB_SEARCH_GATE == "off":
+            needed, reason = True, "gate_off"
+        elif self._is_time_sensitive(subquery):
+            needed, reason = True, "time_sensitive"
+        elif top_score is None and any(result.get('keyword_match') for result in db_results):
+            needed, reason = False, "keyword_match"
+        elif top_score is None:
+            needed, reason = True, "no_vector_match"
+        elif top_score >= self.WEB_GATE_MIN_SCORE:
+            needed, reason = False, "confident"
+        else:
+            needed, reason = True, "low_score"
+        
+        decision = "searched" if needed else ("cancelled" if started else "skipped")
+        self._count(self.web_gate_stats, decision)
+        record_decision(
+            "web_gate",
+            section=section,
+            decision=decision,
+            reason=reason,
+            topScore=round(top_score, 4) if top_score is not None else None
+        )
+        logger.debug(f"Web gate for '{section}': {decision} ({reason}, top score {top_score})")
+        return needed
+    
+    def _finish_web_search(self, section: str, subquery: str, db_results: List[Dict], web_future=None, deadline: Optional[float] = None) -> List[Dict]:
+        """
+        Gate a section's web search on its vector search results.
+        
+        The search runs on the web pool and is waited for only until the
+        request deadline, so a retrieval worker whose section was already
+        abandoned is freed as soon as the deadline passes.
+        
+        Args:
+            section: Web search section
+            subquery: Subquery searched for the section
+            db_results: Vector search results for the section
+            web_future: Web search already started alongside the vector
+                search (race mode or time-sensitive query), or None
+            deadline: time.perf_counter() value to stop waiting at
+                (default: SECTION_TIMEOUT from now)
+            
+        Returns:
+            Web results ([] when skipped, late or failed)
+        """
+        if not self._web_gate(section, subquery, db_results, started=web_future is not None):
+            if web_future is not None:
+                # A running thread cannot be stopped; its result still fills the web cache
+                web_future.cancel()
+            return []
+        
+        if deadline is None:
+            deadline = time.perf_counter() + self.SECTION_TIMEOUT
+        try:
+            if web_future is None:
+                web_future = submit_in_context(self._web_executor, self.retriever.web_search, subquery, section)
+            return web_future.result(timeout=max(0.0, deadline - time.perf_counter()))
+        except FuturesTimeoutError:
+            self._web_executor.abandon([web_future])
+            self._count(self.deadline_stats, "late")
+            logger.warning(f"Web search for section '{section}' missed the retrieval deadline")
+            return []
+        except Exception as e:
+            logger.error(f"Web search failed for section '{section}': {e}", exc_info=True)
+            return []
+    
     def _combine_sources(self, db_results: List[Dict], web_results: List[Dict]) -> List[Dict]:
         """
         Combine database and web search results.
@@ -403,6 +2133,38 @@ class AgenticOrchestrator:
         logger.debug(f"Combined {len(db_results)} DB + {len(web_results)} web = {len(combined)} total")
         return combined
     
+    @timed("pack")
+    def _pack_contexts(
+        self,
+        user_query: str,
+        validated_results: Dict[str, List[Dict]],
+        query_embedding: Optional[List[float]] = None
+    ) -> Dict[str, List[Dict]]:
+        """
+        Deduplicate, trim and budget validated results for synthesis.
+        
+        Falls back to the unpacked results if packing is disabled, fails
+        or would leave nothing.
+        
+        Args:
+            user_query: User's question
+            validated_results: Results that passed validation
+            query_embedding: Optional precomputed embedding of user_query
+            
+        Returns:
+            Packed results per section
+        """
+        if self.context_packer is None:
+            return validated_results
+        
+        try:
+            packed = self.context_packer.pack(user_query, validated_results, query_embedding)
+        except Exception as e:
+            logger.warning(f"Context packing failed, using unpacked results: {e}")
+            return validated_results
+        return packed or validated_results
+    
+    @timed("validate")
     def _validate_results(self, section_results: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
         """
         Validate all retrieved results.
@@ -419,33 +2181,17 @@ class AgenticOrchestrator:
         """
         logger.debug("Validating retrieved results")
         
-        validated = {}
         total_before = sum(len(results) for results in section_results.values())
         
-        for section, results in section_results.items():
-            validated_section_results = []
-            
-            for result in results:
-                # Error detection
-                if self.validator.contains_error(result):
-                    logger.debug(f"Filtered out error result from '{section}'")
-                    continue
-                
-                # Basic relevance check
-                if self.validator.is_relevant(result):
-                    validated_section_results.append(result)
-                else:
-                    logger.debug(f"Filtered out low-relevance result from '{section}'")
-            
-            if validated_section_results:
-                validated[section] = validated_section_results
+        validated = self.validator.validate_batch(section_results)
         
         total_after = sum(len(results) for results in validated.values())
         logger.info(f"Validation: {total_before} -> {total_after} results ({total_before - total_after} filtered)")
         
         return validated
     
-    def _synthesize_answer(self, original_query: str, validated_results: Dict[str, List[Dict]], conversation_history: List[Dict] = None) -> str:
+    @timed("synthesize")
+    def _synthesize_answer(self, original_query: str, validated_results: Dict[str, List[Dict]], conversation_history: List[Dict] = None, domain_check: bool = False) -> Tuple[str, bool]:
         """
         Synthesize final answer from validated results.
         
@@ -459,9 +2205,11 @@ class AgenticOrchestrator:
             original_query: User's original question
             validated_results: Validated results from all sections
             conversation_history: Optional recent conversation for context
+            domain_check: Let the LLM reject off-topic questions (direct mode)
             
         Returns:
-            Final synthesized answer
+            (answer, synthesized): the final answer, and False when the LLM
+            failed and the answer is the raw-chunk fallback (not cacheable)
         """
         logger.debug("Synthesizing final answer")
         
@@ -469,16 +2217,17 @@ class AgenticOrchestrator:
             answer = self.llm_manager.synthesize_answer(
                 query=original_query,
                 section_results=validated_results,
-                conversation_history=conversation_history
+                conversation_history=conversation_history,
+                domain_check=domain_check
             )
             
             logger.debug(f"Synthesized answer length: {len(answer)} chars")
-            return answer
+            return answer, True
             
         except Exception as e:
             logger.error(f"Answer synthesis failed: {e}", exc_info=True)
             # Fallback: return concatenated results
-            return self._fallback_synthesis(validated_results)
+            return self._fallback_synthesis(validated_results), False
     
     def _fallback_synthesis(self, validated_results: Dict[str, List[Dict]]) -> str:
         """
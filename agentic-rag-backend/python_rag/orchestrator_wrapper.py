@@ -9,20 +9,79 @@ This wrapper:
 3. Returns JSON response to stdout for Node.js consumption
 4. Logs errors to file for debugging
 
+Interactive mode reads one JSON request per stdin line. Each request may
+carry an "id"; requests run concurrently on a bounded worker pool and each
+response line echoes the "id" of the request it answers, so responses can
+arrive out of order.
+
+A request with "stream": true is answered with NDJSON partial frames
+({"id", "partial": true, "event": "contexts" | "chunk", ...}) followed by
+the regular final response line.
+
+A request may also carry "mode" ("agentic", "direct" or "auto") to pick
+the pipeline mode; the mode that actually ran is reported as
+metadata.pipelineMode ("cache" for semantic cache hits, "coalesced" for
+requests that awaited an identical in-flight request's result).
+
+Every response's metadata carries per-stage timings ("timings"), LLM
+token counts and the web search gate's per-section decisions ("webGate":
+searched, skipped or cancelled, with the reason and top vector score).
+A {"id", "command": "stats"} request is answered inline with
+process-wide latency histograms (p50/p95/p99) and cache hit rates.
+
+Startup is split in two: "Ready" is emitted as soon as the orchestrator
+is constructed (with "state": "warming"); the embedding model and network
+connections warm up in the background, and a {"event": "state",
+"state": "ready", "startup": {...}} line with per-phase timings follows
+once they are done.
+
+With --async-loop, non-streaming requests run as coroutines on a single
+asyncio event loop (async OpenAI/Mongo/Tavily clients) instead of worker
+threads; --workers then bounds the number of in-flight queries.
+
+With --prefork N, a master process loads the embedding model once and
+forks N workers that share it copy-on-write; each worker opens its own
+MongoDB/OpenAI clients and the master dispatches requests to the least
+busy worker (--workers is then the total across workers). Dead workers
+are re-forked; the master exits non-zero once none is left.
+
 Usage:
     python orchestrator_wrapper.py --query "What are admission requirements?" --userId "user123"
+    python orchestrator_wrapper.py --query "Library timings?" --mode direct
+    python orchestrator_wrapper.py --interactive --workers 4
+    python orchestrator_wrapper.py --interactive --prefork 4 --workers 16
+    python orchestrator_wrapper.py --interactive --async-loop --workers 64
 """
 
+import os
 import sys
+import time
+
+# Taken before the heavy imports so the startup report covers them
+_PROCESS_STARTED = time.perf_counter()
+
+import gc
+import asyncio
+import importlib
 import json
 import logging
 import argparse
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
 # Add parent directory to path to import orchestrator
 sys.path.insert(0, str(Path(__file__).parent))
 
+from embeddings import create_embedding_model
 from orchestrator import AgenticOrchestrator
+from retriever import Retriever
+import metrics
+
+# Startup phase durations (ms); orchestrator warm-up phases are merged in later
+_startup_phases = {"imports": round((time.perf_counter() - _PROCESS_STARTED) * 1000, 1)}
+_startup_report = None
 
 # Setup logging to file (not stdout, to avoid interfering with JSON output)
 log_file = Path(__file__).parent.parent / 'logs' / 'python_bridge.log'
@@ -41,6 +100,16 @@ logger = logging.getLogger(__name__)
 
 # Singleton orchestrator instance for performance
 _orchestrator_instance = None
+_orchestrator_lock = threading.Lock()
+
+# Embedding model loaded by the pre-fork master and inherited by its workers
+_preloaded_embedding_model = None
+
+# Default number of queries processed concurrently in interactive mode
+DEFAULT_WORKERS = int(os.getenv("RAG_MAX_CONCURRENCY", "4"))
+
+# Serializes writes so concurrent responses never interleave on stdout
+_stdout_lock = threading.Lock()
 
 
 def get_orchestrator():
@@ -51,14 +120,23 @@ def get_orchestrator():
     global _orchestrator_instance
     
     if _orchestrator_instance is None:
-        logger.info("Initializing AgenticOrchestrator...")
-        _orchestrator_instance = AgenticOrchestrator()
-        logger.info("AgenticOrchestrator initialized successfully")
+        with _orchestrator_lock:
+            if _orchestrator_instance is None:
+                logger.info("Initializing AgenticOrchestrator...")
+                started = time.perf_counter()
+                if _preloaded_embedding_model is not None:
+                    _orchestrator_instance = AgenticOrchestrator(
+                        retriever=Retriever(embedding_model=_preloaded_embedding_model)
+                    )
+                else:
+                    _orchestrator_instance = AgenticOrchestrator()
+                _startup_phases["orchestrator_init"] = round((time.perf_counter() - started) * 1000, 1)
+                logger.info("AgenticOrchestrator initialized successfully")
     
     return _orchestrator_instance
 
 
-def process_query(query, user_id=None, conversation_history=None):
+def process_query(query, user_id=None, conversation_history=None, mode=None):
     """
     Process user query through the agentic RAG pipeline.
     
@@ -66,37 +144,882 @@ def process_query(query, user_id=None, conversation_history=None):
         query: User query string
         user_id: Optional user identifier
         conversation_history: Optional list of recent messages for context
+        mode: Optional pipeline mode ("agentic", "direct", "auto")
+        
+    Returns:
+        dict: Response containing answer, contexts, and metadata
+    """
+    with metrics.request_trace() as trace:
+        try:
+            logger.info(f"Processing query (userId: {user_id}, length: {len(query)}, history: {len(conversation_history) if conversation_history else 0})")
+            
+            # Get orchestrator instance
+            orchestrator = get_orchestrator()
+            
+            # Execute pipeline with contexts and conversation history
+            answer, contexts = orchestrator.process_query_with_contexts(query, conversation_history, mode)
+            
+            logger.info(f"Query processed successfully (contexts: {len(contexts)})")
+            
+            return build_response(query, user_id, conversation_history, answer, contexts, trace)
+            
+        except Exception as e:
+            metrics.registry.record_request(trace, success=False)
+            logger.error(f"Error processing query: {str(e)}", exc_info=True)
+            raise
+
+
+async def process_query_async(query, user_id=None, conversation_history=None, mode=None):
+    """
+    Async variant of process_query (runs on the event loop).
+    
+    Args:
+        query: User query string
+        user_id: Optional user identifier
+        conversation_history: Optional list of recent messages for context
+        mode: Optional pipeline mode ("agentic", "direct", "auto")
         
     Returns:
         dict: Response containing answer, contexts, and metadata
     """
+    with metrics.request_trace() as trace:
+        try:
+            logger.info(f"Processing async query (userId: {user_id}, length: {len(query)}, history: {len(conversation_history) if conversation_history else 0})")
+            
+            orchestrator = get_orchestrator()
+            answer, contexts = await orchestrator.aprocess_query_with_contexts(query, conversation_history, mode)
+            
+            logger.info(f"Async query processed successfully (contexts: {len(contexts)})")
+            
+            return build_response(query, user_id, conversation_history, answer, contexts, trace)
+            
+        except Exception as e:
+            metrics.registry.record_request(trace, success=False)
+            logger.error(f"Error processing async query: {str(e)}", exc_info=True)
+            raise
+
+
+def process_query_stream(query, user_id=None, conversation_history=None, on_frame=None, mode=None):
+    """
+    Process user query, reporting partial results as they become available.
+    
+    Args:
+        query: User query string
+        user_id: Optional user identifier
+        conversation_history: Optional list of recent messages for context
+        on_frame: Callback receiving partial frames
+            ({"event": "contexts", "contexts": [...]} / {"event": "chunk", "text": "..."})
+        mode: Optional pipeline mode ("agentic", "direct", "auto")
+        
+    Returns:
+        dict: Final response containing answer, contexts, and metadata
+    """
+    with metrics.request_trace() as trace:
+        try:
+            logger.info(f"Processing streaming query (userId: {user_id}, length: {len(query)}, history: {len(conversation_history) if conversation_history else 0})")
+            
+            orchestrator = get_orchestrator()
+            
+            answer, contexts = "", []
+            for event in orchestrator.process_query_stream(query, conversation_history, mode):
+                if event["event"] == "final":
+                    answer, contexts = event["answer"], event["contexts"]
+                elif on_frame:
+                    on_frame(event)
+            
+            logger.info(f"Streaming query processed successfully (contexts: {len(contexts)})")
+            
+            response = build_response(query, user_id, conversation_history, answer, contexts, trace)
+            response["metadata"]["streamed"] = True
+            return response
+            
+        except Exception as e:
+            metrics.registry.record_request(trace, success=False)
+            logger.error(f"Error processing streaming query: {str(e)}", exc_info=True)
+            raise
+
+
+def build_response(query, user_id, conversation_history, answer, contexts, trace=None):
+    """
+    Build the JSON response returned to Node.js for a processed query.
+    
+    When a request trace is given, the request is counted in the process
+    metrics and its stage timings, pipeline mode and web search gate
+    decisions are added to the metadata.
+    """
+    response = {
+        "success": True,
+        "answer": answer,
+        "contexts": contexts,
+        "userId": user_id,
+        "query": query,
+        "metadata": {
+            "contextsCount": len(contexts),
+            "queryLength": len(query),
+            "historyLength": len(conversation_history) if conversation_history else 0,
+        }
+    }
+    if trace is not None:
+        metrics.registry.record_request(trace)
+        response["metadata"]["timings"] = trace.to_dict()
+        response["metadata"]["pipelineMode"] = trace.tags.get("mode")
+        response["metadata"]["webGate"] = [
+            {key: value for key, value in decision.items() if key != "kind"}
+            for decision in trace.decisions
+            if decision["kind"] == "web_gate"
+        ]
+    return response
+
+
+def get_stats():
+    """
+    Collect process-wide pipeline metrics.
+    
+    Returns:
+        dict: Latency histograms, token totals and component cache statistics
+    """
+    stats = metrics.registry.snapshot()
+    if _orchestrator_instance is not None:
+        stats["state"] = _orchestrator_instance.state
+        stats["components"] = _orchestrator_instance.get_stats()
+    stats["startup"] = _startup_report or {"phases": dict(_startup_phases)}
+    return stats
+
+
+def announce_ready(workers):
+    """
+    Emit the "Ready" line and report full readiness once warm-up completes.
+    
+    Ready is sent as soon as requests can be accepted; a background thread
+    waits for the orchestrator's warm-up and then emits a "state" event
+    with the per-phase startup report.
+    
+    Args:
+        workers: Concurrency limit advertised to Node.js
+    """
+    orchestrator = get_orchestrator()
+    time_to_ready = round((time.perf_counter() - _PROCESS_STARTED) * 1000, 1)
+    emit({
+        "success": True,
+        "message": "Ready",
+        "workers": workers,
+        "state": orchestrator.state,
+        "startup": {"phases": dict(_startup_phases), "timeToReadyMs": time_to_ready}
+    })
+    
+    def _report_when_warm():
+        global _startup_report
+        orchestrator.wait_until_warm()
+        _startup_report = {
+            "phases": {**_startup_phases, **orchestrator.startup_phases},
+            "timeToReadyMs": time_to_ready,
+            "timeToWarmMs": round((time.perf_counter() - _PROCESS_STARTED) * 1000, 1)
+        }
+        logger.info(f"Startup report: {_startup_report}")
+        emit({"event": "state", "state": "ready", "startup": _startup_report})
+    
+    threading.Thread(target=_report_when_warm, name="rag-startup-report", daemon=True).start()
+
+
+def handle_command(data):
+    """
+    Answer a control command (currently only "stats").
+    
+    Commands are answered inline by the reader loop, so they never queue
+    behind in-flight queries.
+    
+    Args:
+        data: Parsed request object ({"id", "command"})
+        
+    Returns:
+        dict: Response carrying the request "id"
+    """
+    request_id = data.get('id')
+    command = data.get('command')
+    
+    if command == 'stats':
+        return {"id": request_id, "success": True, "stats": get_stats()}
+    
+    return {
+        "id": request_id,
+        "success": False,
+        "error": {"message": f"Unknown command: {command}", "code": "UNKNOWN_COMMAND"}
+    }
+
+
+def emit(payload):
+    """
+    Write a single JSON line to stdout for Node.js consumption.
+    Thread-safe: concurrent workers never interleave partial lines.
+    """
+    emit_line(json.dumps(payload))
+
+
+def emit_line(line):
+    """
+    Write one already-serialized JSON line to stdout.
+    """
+    with _stdout_lock:
+        sys.stdout.write(line + "\n")
+        sys.stdout.flush()
+
+
+def handle_request(data):
+    """
+    Process one interactive request and build its tagged response.
+    
+    Args:
+        data: Parsed request object ({"id", "query", "userId", "conversationHistory", "stream", "mode"})
+        
+    Returns:
+        dict: Response (success or error) carrying the request "id"
+    """
+    request_id = data.get('id')
+    
     try:
-        logger.info(f"Processing query (userId: {user_id}, length: {len(query)}, history: {len(conversation_history) if conversation_history else 0})")
+        query = data.get('query')
+        user_id = data.get('userId', 'anonymous')
+        conversation_history = data.get('conversationHistory', [])
+        
+        if not query:
+            raise ValueError("Query missing")
         
-        # Get orchestrator instance
-        orchestrator = get_orchestrator()
+        if data.get('stream'):
+            def on_frame(frame):
+                emit({"id": request_id, "partial": True, **frame})
+            result = process_query_stream(query, user_id, conversation_history, on_frame, data.get('mode'))
+        else:
+            result = process_query(query, user_id, conversation_history, data.get('mode'))
+        result["id"] = request_id
+        return result
         
-        # Execute pipeline with contexts and conversation history
-        answer, contexts = orchestrator.process_query_with_contexts(query, conversation_history)
+    except Exception as e:
+        return {
+            "id": request_id,
+            "success": False, 
+            "error": {"message": str(e), "code": "PROCESS_ERROR"}
+        }
+
+
+def parse_request_line(line):
+    """
+    Parse one stdin line into a request object.
+    
+    Returns:
+        (data, error_response); exactly one of them is None
+    """
+    try:
+        data = json.loads(line)
+    except json.JSONDecodeError:
+        return None, {
+            "id": None,
+            "success": False, 
+            "error": {"message": "Invalid JSON input", "code": "JSON_ERROR"}
+        }
+    
+    if not isinstance(data, dict):
+        return None, {
+            "id": None,
+            "success": False, 
+            "error": {"message": "Request must be a JSON object", "code": "JSON_ERROR"}
+        }
+    
+    return data, None
+
+
+async def handle_request_async(data):
+    """
+    Async variant of handle_request.
+    
+    Streaming requests keep using the synchronous generator pipeline in a
+    worker thread; everything else is awaited on the event loop.
+    """
+    if data.get('stream'):
+        return await asyncio.to_thread(handle_request, data)
+    
+    request_id = data.get('id')
+    
+    try:
+        query = data.get('query')
+        if not query:
+            raise ValueError("Query missing")
         
-        logger.info(f"Query processed successfully (contexts: {len(contexts)})")
+        result = await process_query_async(
+            query,
+            data.get('userId', 'anonymous'),
+            data.get('conversationHistory', []),
+            data.get('mode')
+        )
+        result["id"] = request_id
+        return result
         
+    except Exception as e:
         return {
-            "success": True,
-            "answer": answer,
-            "contexts": contexts,
-            "userId": user_id,
-            "query": query,
-            "metadata": {
-                "contextsCount": len(contexts),
-                "queryLength": len(query),
-                "historyLength": len(conversation_history) if conversation_history else 0,
-            }
+            "id": request_id,
+            "success": False, 
+            "error": {"message": str(e), "code": "PROCESS_ERROR"}
         }
+
+
+def run_interactive(max_workers=DEFAULT_WORKERS):
+    """
+    Interactive mode: multiplex requests read from stdin over a worker pool.
+    
+    The reader loop never blocks on a query; it hands each request to the
+    pool and moves on to the next line. Responses are written as soon as
+    each query finishes, tagged with the originating request id.
+    
+    Args:
+        max_workers: Maximum number of queries processed concurrently
+    """
+    logger.info(f"Starting interactive mode (workers={max_workers})")
+    
+    # Initialize orchestrator once at startup
+    try:
+        announce_ready(max_workers)
+    except Exception as e:
+        logger.error(f"Failed to initialize in interactive mode: {e}", exc_info=True)
+        emit({
+            "success": False, 
+            "error": {"message": str(e), "code": "INIT_ERROR"}
+        })
+        sys.exit(1)
+
+    def _run(data):
+        emit(handle_request(data))
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rag-worker") as executor:
+        # Loop reading lines from stdin
+        for line in sys.stdin:
+            line = line.strip()
+            if not line:
+                continue
+                
+            data, error = parse_request_line(line)
+            if error:
+                emit(error)
+                continue
+            
+            if data.get('command'):
+                emit(handle_command(data))
+                continue
+                
+            executor.submit(_run, data)
         
+        # stdin closed: let in-flight queries finish before exiting
+        logger.info("stdin closed, draining in-flight queries")
+            
+    logger.info("Interactive mode ended")
+    sys.exit(0)
+
+
+def run_interactive_async(max_in_flight=DEFAULT_WORKERS):
+    """
+    Interactive mode on a single asyncio event loop.
+    
+    Each request becomes a task; a semaphore bounds how many run at once.
+    
+    Args:
+        max_in_flight: Maximum number of queries processed concurrently
+    """
+    logger.info(f"Starting async interactive mode (max in flight={max_in_flight})")
+    
+    try:
+        announce_ready(max_in_flight)
     except Exception as e:
-        logger.error(f"Error processing query: {str(e)}", exc_info=True)
-        raise
+        logger.error(f"Failed to initialize in async interactive mode: {e}", exc_info=True)
+        emit({
+            "success": False, 
+            "error": {"message": str(e), "code": "INIT_ERROR"}
+        })
+        sys.exit(1)
+    
+    async def _serve():
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(max_in_flight)
+        tasks = set()
+        
+        async def _run(data):
+            async with semaphore:
+                emit(await handle_request_async(data))
+        
+        while True:
+            line = await loop.run_in_executor(None, sys.stdin.readline)
+            if not line:
+                break
+            line = line.strip()
+            if not line:
+                continue
+            
+            data, error = parse_request_line(line)
+            if error:
+                emit(error)
+                continue
+            
+            if data.get('command'):
+                emit(handle_command(data))
+                continue
+            
+            task = asyncio.create_task(_run(data))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        
+        # stdin closed: let in-flight queries finish before exiting
+        logger.info("stdin closed, draining in-flight queries")
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    asyncio.run(_serve())
+    logger.info("Async interactive mode ended")
+    sys.exit(0)
+
+
+class _PreforkWorker:
+    """
+    Master-side handle of one forked worker process.
+    """
+    
+    def __init__(self, index, pid, requests, responses):
+        self.index = index
+        self.pid = pid
+        self.requests = requests
+        self.responses = responses
+        self.in_flight = []
+        self.handled = 0
+        self.alive = True
+        self.startup = None
+
+
+class _PreforkPool:
+    """
+    Dispatches requests from the master's stdin to idle forked workers
+    and forwards their response lines to the master's stdout.
+    
+    A worker that exits after warming up is replaced by a fresh fork. If no
+    live worker remains (e.g. workers keep dying during warm-up), the
+    master exits non-zero so the Node.js bridge restarts the whole process.
+    """
+    
+    def __init__(self, workers, slots):
+        """
+        Args:
+            workers: Forked _PreforkWorker handles
+            slots: Maximum requests in flight per worker
+        """
+        self.workers = workers
+        self.slots = slots
+        self._cond = threading.Condition()
+        self._queue = deque()
+        self._command_waiters = {}
+        self._next_command = 0
+        self._readers = []
+        self._ready_announced = False
+        self._draining = False
+        self.respawned = 0
+    
+    def start(self):
+        """Start one response reader thread per worker."""
+        for worker in self.workers:
+            self._start_reader(worker)
+    
+    def _start_reader(self, worker):
+        """Start the thread forwarding one worker's responses."""
+        reader = threading.Thread(
+            target=self._read_responses, args=(worker,),
+            name=f"rag-prefork-reader-{worker.index}-{worker.pid}", daemon=True
+        )
+        reader.start()
+        self._readers.append(reader)
+    
+    def submit(self, data):
+        """Queue a request; it is sent as soon as a worker has a free slot."""
+        with self._cond:
+            self._queue.append(data)
+            self._dispatch()
+    
+    def _dispatch(self):
+        """Hand queued requests to the least busy live workers (lock held)."""
+        while self._queue:
+            live = [w for w in self.workers if w.alive]
+            if not live:
+                while self._queue:
+                    data = self._queue.popleft()
+                    emit({
+                        "id": data.get('id'),
+                        "success": False,
+                        "error": {"message": "No live worker processes", "code": "WORKER_DIED"}
+                    })
+                break
+            
+            idle = [w for w in live if len(w.in_flight) < self.slots]
+            if not idle:
+                break
+            
+            worker = min(idle, key=lambda w: len(w.in_flight))
+            data = self._queue.popleft()
+            worker.in_flight.append(data.get('id'))
+            try:
+                worker.requests.write(json.dumps(data) + "\n")
+                worker.requests.flush()
+            except OSError as e:
+                # The reader thread notices the exit and fails in_flight
+                logger.error(f"Prefork worker {worker.index} not accepting requests: {e}")
+        self._cond.notify_all()
+    
+    def _read_responses(self, worker):
+        """Forward one worker's output until it exits."""
+        for line in worker.responses:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError:
+                logger.warning(f"Prefork worker {worker.index} wrote non-JSON output: {line[:200]}")
+                continue
+            
+            if data.get('message') == 'Ready':
+                continue
+            
+            if data.get('event') == 'state':
+                self._worker_warm(worker, data)
+                continue
+            
+            with self._cond:
+                waiter = self._command_waiters.pop(data.get('id'), None)
+            if waiter is not None:
+                waiter[1].set_result(data)
+                continue
+            
+            emit_line(line)
+            
+            if not data.get('partial'):
+                with self._cond:
+                    if data.get('id') in worker.in_flight:
+                        worker.in_flight.remove(data.get('id'))
+                    worker.handled += 1
+                    self._dispatch()
+        
+        self._worker_exited(worker)
+    
+    def _worker_warm(self, worker, data):
+        """Record a worker's warm-up and announce once every live worker is warm."""
+        with self._cond:
+            worker.startup = data.get('startup') or {}
+            live = [w for w in self.workers if w.alive]
+            if self._ready_announced or any(w.startup is None for w in live):
+                return
+            self._ready_announced = True
+        
+        report = {
+            "phases": {**_startup_phases, **worker.startup.get("phases", {})},
+            "timeToWarmMs": round((time.perf_counter() - _PROCESS_STARTED) * 1000, 1),
+            "processes": len(live),
+        }
+        logger.info(f"Startup report: {report}")
+        emit({"event": "state", "state": "ready", "startup": report})
+    
+    def _worker_exited(self, worker):
+        """
+        Fail the requests and stats commands a dead worker was holding,
+        then fork a replacement (or exit the master if none is left).
+        """
+        try:
+            _, status = os.waitpid(worker.pid, 0)
+        except ChildProcessError:
+            status = None
+        for stream in (worker.requests, worker.responses):
+            try:
+                stream.close()
+            except OSError:
+                pass
+        
+        with self._cond:
+            worker.alive = False
+            lost, worker.in_flight = worker.in_flight, []
+            waiters = [
+                self._command_waiters.pop(command_id)
+                for command_id, (owner, _) in list(self._command_waiters.items())
+                if owner is worker
+            ]
+            # Workers that die before warming up would only crash-loop
+            respawn = not self._draining and worker.startup is not None
+        
+        if lost:
+            logger.error(f"Prefork worker {worker.index} (pid {worker.pid}) exited with {len(lost)} requests in flight (status {status})")
+        else:
+            logger.info(f"Prefork worker {worker.index} (pid {worker.pid}) exited (status {status})")
+        for request_id in lost:
+            emit({
+                "id": request_id,
+                "success": False,
+                "error": {"message": "Worker process exited", "code": "WORKER_DIED"}
+            })
+        for _, future in waiters:
+            future.set_exception(RuntimeError(f"Prefork worker {worker.index} exited"))
+        
+        if respawn:
+            self._respawn(worker)
+        
+        with self._cond:
+            self._dispatch()
+            if self._draining or any(w.alive for w in self.workers):
+                return
+        
+        logger.error("No live prefork workers left, exiting")
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(1)
+    
+    def _respawn(self, worker):
+        """Fork a replacement for a dead worker and start forwarding its output."""
+        with self._cond:
+            siblings = [w for w in self.workers if w.alive]
+        try:
+            replacement = _fork_worker(worker.index, self.slots, siblings)
+        except OSError as e:
+            logger.error(f"Failed to respawn prefork worker {worker.index}: {e}")
+            return
+        
+        with self._cond:
+            self.workers[self.workers.index(worker)] = replacement
+            self.respawned += 1
+        self._start_reader(replacement)
+    
+    def get_stats(self, timeout=2.0):
+        """
+        Collect every live worker's stats plus pool state.
+        
+        Args:
+            timeout: Seconds to wait for each worker's answer
+            
+        Returns:
+            dict: {"pool": {...}, "workers": [per-worker stats]}
+        """
+        futures = []
+        with self._cond:
+            for worker in self.workers:
+                if not worker.alive:
+                    continue
+                self._next_command += 1
+                command_id = f"prefork-stats-{self._next_command}"
+                future = Future()
+                self._command_waiters[command_id] = (worker, future)
+                futures.append((worker, command_id, future))
+                try:
+                    worker.requests.write(json.dumps({"id": command_id, "command": "stats"}) + "\n")
+                    worker.requests.flush()
+                except OSError:
+                    pass
+            pool = {
+                "processes": len(self.workers),
+                "alive": sum(1 for w in self.workers if w.alive),
+                "slotsPerProcess": self.slots,
+                "queued": len(self._queue),
+                "inFlight": sum(len(w.in_flight) for w in self.workers),
+                "handled": [w.handled for w in self.workers],
+                "respawned": self.respawned,
+            }
+        
+        workers = []
+        for worker, command_id, future in futures:
+            try:
+                stats = future.result(timeout=timeout).get("stats", {})
+            except Exception:
+                stats = None
+            with self._cond:
+                self._command_waiters.pop(command_id, None)
+            workers.append({"index": worker.index, "pid": worker.pid, "stats": stats})
+        return {"pool": pool, "workers": workers}
+    
+    def drain(self):
+        """Wait for queued and in-flight requests, then stop the workers."""
+        with self._cond:
+            self._draining = True
+            while any(w.alive for w in self.workers) and (
+                self._queue or any(w.in_flight for w in self.workers)
+            ):
+                self._cond.wait()
+        
+        with self._cond:
+            workers = list(self.workers)
+        for worker in workers:
+            try:
+                worker.requests.close()
+            except OSError:
+                pass
+        for reader in list(self._readers):
+            reader.join()
+
+
+def _preload_for_fork():
+    """
+    Import the client libraries and load the embedding model in the master.
+    
+    Nothing here starts a thread or opens a connection: forked children
+    share these pages copy-on-write and create their own clients.
+    
+    Returns:
+        Loaded embedding model
+    """
+    for module in ("pymongo", "openai", "tavily", "requests"):
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+    
+    # One intra-op thread per worker: the pool already spreads over cores,
+    # and thread pools created before fork() do not survive in the children
+    return create_embedding_model(
+        backend=Retriever.EMBEDDING_BACKEND,
+        model_name=Retriever.EMBEDDING_MODEL_NAME,
+        onnx_dir=Retriever.EMBEDDING_ONNX_DIR,
+        num_threads=1
+    )
+
+
+def _fork_worker(index, slots, siblings):
+    """
+    Fork one worker wired to the master through a request and a response pipe.
+    
+    The child runs the regular threaded interactive mode with its stdin and
+    stdout replaced by the pipes. Respawned workers are forked from a
+    reader thread, so the child re-creates the stdout lock that another
+    master thread may have held at fork time.
+    
+    Args:
+        index: Worker number
+        slots: Maximum concurrent requests in the worker
+        siblings: Already forked workers (their pipe ends are closed in the child)
+        
+    Returns:
+        _PreforkWorker: Master-side handle
+    """
+    request_read, request_write = os.pipe()
+    response_read, response_write = os.pipe()
+    
+    pid = os.fork()
+    if pid == 0:
+        global _stdout_lock
+        _stdout_lock = threading.Lock()
+        exit_code = 0
+        try:
+            os.close(request_write)
+            os.close(response_read)
+            # Close the raw descriptors: a master reader thread may have
+            # held the file objects' buffer locks at fork time
+            for sibling in siblings:
+                os.close(sibling.requests.fileno())
+                os.close(sibling.responses.fileno())
+            
+            sys.stdin = os.fdopen(request_read, 'r')
+            sys.stdout = os.fdopen(response_write, 'w')
+            if 'torch' in sys.modules:
+                sys.modules['torch'].set_num_threads(1)
+            
+            run_interactive(slots)
+        except SystemExit as e:
+            exit_code = e.code or 0
+        except BaseException:
+            logger.error(f"Prefork worker {index} crashed", exc_info=True)
+            exit_code = 1
+        finally:
+            sys.stdout.flush()
+            os._exit(exit_code)
+    
+    os.close(request_read)
+    os.close(response_write)
+    logger.info(f"Forked prefork worker {index} (pid {pid})")
+    return _PreforkWorker(index, pid, os.fdopen(request_write, 'w'), os.fdopen(response_read, 'r'))
+
+
+def run_prefork(processes, max_in_flight=DEFAULT_WORKERS):
+    """
+    Pre-fork interactive mode: one master, several worker processes.
+    
+    The master loads the embedding model once, freezes the GC (so the
+    collector never touches the inherited objects and un-shares their
+    pages) and forks the workers, which share the model copy-on-write and
+    create their own MongoDB/OpenAI/Tavily clients after the fork. The
+    master reads stdin and dispatches each request to the least busy
+    worker with a free slot.
+    
+    Args:
+        processes: Number of worker processes
+        max_in_flight: Total concurrent queries, split across the workers
+    """
+    global _preloaded_embedding_model
+    
+    if not hasattr(os, 'fork'):
+        logger.warning("os.fork() unavailable on this platform, using a single process")
+        run_interactive(max_in_flight)
+    
+    logger.info(f"Starting pre-fork mode (processes={processes}, max in flight={max_in_flight})")
+    slots = max(1, -(-max_in_flight // processes))
+    
+    try:
+        started = time.perf_counter()
+        _preloaded_embedding_model = _preload_for_fork()
+        _startup_phases["preload_model"] = round((time.perf_counter() - started) * 1000, 1)
+    except Exception as e:
+        logger.error(f"Failed to preload model for pre-fork mode: {e}", exc_info=True)
+        emit({
+            "success": False,
+            "error": {"message": str(e), "code": "INIT_ERROR"}
+        })
+        sys.exit(1)
+    
+    started = time.perf_counter()
+    gc.collect()
+    gc.freeze()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    workers = []
+    for index in range(processes):
+        workers.append(_fork_worker(index, slots, workers))
+    _startup_phases["fork"] = round((time.perf_counter() - started) * 1000, 1)
+    
+    pool = _PreforkPool(workers, slots)
+    pool.start()
+    emit({
+        "success": True,
+        "message": "Ready",
+        "workers": processes * slots,
+        "processes": processes,
+        "state": "warming",
+        "startup": {
+            "phases": dict(_startup_phases),
+            "timeToReadyMs": round((time.perf_counter() - _PROCESS_STARTED) * 1000, 1)
+        }
+    })
+    
+    def _answer_stats(data):
+        emit({"id": data.get('id'), "success": True, "stats": pool.get_stats()})
+    
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        
+        data, error = parse_request_line(line)
+        if error:
+            emit(error)
+            continue
+        
+        if data.get('command') == 'stats':
+            # Gathered from every worker off the reader loop
+            threading.Thread(target=_answer_stats, args=(data,), daemon=True).start()
+            continue
+        if data.get('command'):
+            emit(handle_command(data))
+            continue
+        
+        pool.submit(data)
+    
+    logger.info("stdin closed, draining in-flight queries")
+    pool.drain()
+    logger.info("Pre-fork mode ended")
+    sys.exit(0)
 
 
 def main():
@@ -118,6 +1041,13 @@ def main():
         default='anonymous',
         help='User identifier (optional)'
     )
+    parser.add_argument(
+        '--mode',
+        type=str,
+        choices=['agentic', 'direct', 'auto'],
+        default=None,
+        help='Pipeline mode for --query (default: PIPELINE_MODE)'
+    )
     
     parser.add_argument(
         '--interactive',
@@ -125,63 +1055,38 @@ def main():
         help='Run in interactive mode (read queries from stdin)'
     )
     
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help='Maximum concurrent queries in interactive mode'
+    )
+    
+    parser.add_argument(
+        '--prefork',
+        type=int,
+        default=0,
+        metavar='N',
+        help='Serve interactive mode from N forked worker processes sharing one loaded model'
+    )
+    
+    parser.add_argument(
+        '--async-loop',
+        dest='async_loop',
+        action='store_true',
+        help='Serve interactive mode on a single asyncio event loop'
+    )
+    
     args = parser.parse_args()
 
     # Interactive mode
     if args.interactive:
-        logger.info("Starting interactive mode")
-        
-        # Initialize orchestrator once at startup
-        try:
-            get_orchestrator()
-            print(json.dumps({"success": True, "message": "Ready"}))
-            sys.stdout.flush()
-        except Exception as e:
-            logger.error(f"Failed to initialize in interactive mode: {e}", exc_info=True)
-            print(json.dumps({
-                "success": False, 
-                "error": {"message": str(e), "code": "INIT_ERROR"}
-            }))
-            sys.stdout.flush()
-            sys.exit(1)
-
-        # Loop reading lines from stdin
-        for line in sys.stdin:
-            line = line.strip()
-            if not line:
-                continue
-                
-            try:
-                data = json.loads(line)
-                query = data.get('query')
-                user_id = data.get('userId', 'anonymous')
-                conversation_history = data.get('conversationHistory', [])
-                
-                if not query:
-                    raise ValueError("Query missing")
-                    
-                result = process_query(query, user_id, conversation_history)
-                print(json.dumps(result))
-                sys.stdout.flush()
-                
-            except json.JSONDecodeError:
-                error = {
-                    "success": False, 
-                    "error": {"message": "Invalid JSON input", "code": "JSON_ERROR"}
-                }
-                print(json.dumps(error))
-                sys.stdout.flush()
-                
-            except Exception as e:
-                error = {
-                    "success": False, 
-                    "error": {"message": str(e), "code": "PROCESS_ERROR"}
-                }
-                print(json.dumps(error))
-                sys.stdout.flush()
-                
-        logger.info("Interactive mode ended")
-        sys.exit(0)
+        if args.prefork > 0:
+            run_prefork(args.prefork, max(1, args.workers))
+        elif args.async_loop:
+            run_interactive_async(max(1, args.workers))
+        else:
+            run_interactive(max(1, args.workers))
                         
     # One-shot mode (legacy)
     # Validate query
@@ -199,7 +1104,7 @@ def main():
     
     try:
         # Process query
-        result = process_query(args.query.strip(), args.userId)
+        result = process_query(args.query.strip(), args.userId, mode=args.mode)
         
         # Output JSON to stdout
         print(json.dumps(result))
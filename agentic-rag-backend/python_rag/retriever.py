@@ -6,20 +6,50 @@ and web search augmentation for time-sensitive sections.
 
 Features:
 - Vector similarity search with metadata filtering
+- Grouped multi-section search (one $vectorSearch, partitioned per section)
+- Pluggable vector backend: Atlas $vectorSearch or in-process local index
 - Tavily web search integration
 - Result formatting and normalization
+- Async variants (avector_search, aweb_search) on async Mongo/Tavily clients
+- Web search result cache (per-section TTL) and stale-while-error
+  fallback on a shared pooled Tavily client
+- Single-flight coalescing: identical concurrent vector and web searches,
+  from any request, share one database round trip / API call
+- Fast construction: pymongo, sentence-transformers (torch) and requests
+  are imported on first use; the embedding model can be loaded in the
+  background (load_embedding_model) while queries wait for it
+- Pluggable embedding backend: sentence-transformers (torch) or the
+  torch-free int8 ONNX export of the same model (EMBEDDING_BACKEND=onnx)
+- Two-tier query embedding cache (in-process LRU + shared mmap store),
+  versioned by embedding model id
+- Hybrid retrieval: in-process BM25 index fused with vector results by
+  reciprocal rank fusion; short keyword lookups (acronyms such as ATKT,
+  PRN, MahaDBT) are answered from the BM25 index without an embedding
+  pass or database round trip
 
 Author: RAG Research Team
 Date: November 2025
 """
 
 import os
+import time
+import asyncio
 import logging
+import threading
+from pathlib import Path
 from typing import List, Dict, Optional
-from pymongo import MongoClient
-from sentence_transformers import SentenceTransformer
+import numpy as np
 from dotenv import load_dotenv
 
+from collection_sync import corpus_signature
+from embedding_cache import EmbeddingCache
+from embeddings import create_embedding_model
+from lexical_index import LexicalIndex, reciprocal_rank_fusion
+from local_index import LocalVectorIndex
+from metrics import span, timed
+from single_flight import SingleFlight
+from ttl_cache import TTLCache
+
 load_dotenv()
 logger = logging.getLogger(__name__)
 
@@ -35,61 +65,534 @@ class Retriever:
     COLLECTION_NAME = "Main"
     INDEX_NAME = "mainindex"
     
+    # Vector backend configuration ("atlas" or "local")
+    VECTOR_BACKEND = os.getenv("RETRIEVER_BACKEND", "atlas")
+    LOCAL_INDEX_SNAPSHOT = os.getenv("LOCAL_INDEX_SNAPSHOT")
+    LOCAL_INDEX_REFRESH_SECONDS = float(os.getenv("LOCAL_INDEX_REFRESH_SECONDS", "300"))
+    
+    # Seconds between background corpus fingerprint refreshes against Atlas
+    FINGERPRINT_INTERVAL = 60
+    FINGERPRINT_PROJECTION = {"section_name": 1, "content": 1, "metadata": 1}
+    
+    # Web search cache configuration (seconds)
+    WEB_SEARCH_CACHE_TTL = {
+        'scholarship': float(os.getenv("WEB_CACHE_TTL_SCHOLARSHIP", "21600")),
+        'exam_center': float(os.getenv("WEB_CACHE_TTL_EXAM_CENTER", "3600")),
+    }
+    WEB_SEARCH_DEFAULT_TTL = 3600
+    WEB_SEARCH_STALE_TTL = 7 * 24 * 3600
+    WEB_SEARCH_CACHE_MAX_ENTRIES = 512
+    WEB_SEARCH_TIMEOUT = float(os.getenv("WEB_SEARCH_TIMEOUT", "10"))
+    WEB_SEARCH_POOL_SIZE = 10
+    
+    # Grouped search: candidates fetched per requested result (per section)
+    GROUPED_OVERSAMPLE = 2
+    
+    # Embedding model: "torch" (sentence-transformers) or "onnx" (see embeddings.py)
+    EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+    EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch").lower()
+    EMBEDDING_ONNX_DIR = os.getenv(
+        "EMBEDDING_ONNX_DIR",
+        str(Path(__file__).parent / "models" / "all-MiniLM-L6-v2-onnx")
+    )
+    
+    # Query embedding cache: in-process LRU size (0 disables both tiers) and
+    # shared memory-mapped store directory ("" disables the store)
+    EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "4096"))
+    EMBEDDING_STORE_DIR = os.getenv("EMBEDDING_STORE_DIR", str(Path(__file__).parent / "cache"))
+    EMBEDDING_STORE_SLOTS = int(os.getenv("EMBEDDING_STORE_SLOTS", "16384"))
     
-    def __init__(self, db_client=None, embedding_model=None):
+    # Hybrid retrieval: BM25 index (loaded by load_lexical_index, synced every
+    # LOCAL_INDEX_REFRESH_SECONDS) fused with vector results; queries of at
+    # most LEXICAL_KEYWORD_MAX_TERMS indexed terms that include an acronym
+    # (or, with LEXICAL_RARE_TERM_IDF > 0, a rare term) skip the vector search
+    HYBRID_SEARCH = os.getenv("HYBRID_SEARCH", "true").lower() != "false"
+    HYBRID_RRF_K = int(os.getenv("HYBRID_RRF_K", "60"))
+    HYBRID_OVERSAMPLE = 2
+    LEXICAL_KEYWORD_MAX_TERMS = int(os.getenv("LEXICAL_KEYWORD_MAX_TERMS", "3"))
+    LEXICAL_RARE_TERM_IDF = float(os.getenv("LEXICAL_RARE_TERM_IDF", "0"))
+    
+    # Coalesce identical concurrent vector searches (web searches always are)
+    SEARCH_COALESCING = os.getenv("SEARCH_COALESCING", "true").lower() != "false"
+    
+    
+    def __init__(
+        self,
+        db_client=None,
+        embedding_model=None,
+        backend: Optional[str] = None,
+        local_index=None,
+        async_db_client=None,
+        web_client=None,
+        async_web_client=None,
+        lexical_index=None
+    ):
         """
         Initialize retriever with database and embedding model.
         
         Args:
             db_client: Optional MongoDB client (for dependency injection)
             embedding_model: Optional embedding model (for dependency injection)
+            backend: Optional vector backend override ("atlas" or "local")
+            local_index: Optional prebuilt LocalVectorIndex (for dependency injection)
+            async_db_client: Optional AsyncMongoClient-compatible client (for dependency injection)
+            web_client: Optional TavilyClient-compatible client (for dependency injection)
+            async_web_client: Optional AsyncTavilyClient-compatible client (for dependency injection)
+            lexical_index: Optional prebuilt LexicalIndex (for dependency injection)
         """
         logger.info("Initializing Retriever")
         
         try:
-            # Initialize MongoDB connection
+            self.backend = "local" if local_index is not None else (backend or self.VECTOR_BACKEND)
+            offline = self.backend == "local" and (local_index is not None or self.LOCAL_INDEX_SNAPSHOT)
+            
+            # MongoDB connection (optional when running offline); the
+            # client itself is created on first use
+            self._client = db_client
+            self._collection = None
+            self._connect_lock = threading.Lock()
             if db_client is None:
-                mongo_uri = os.getenv("MONGODB_URI")
-                if not mongo_uri:
-                    raise ValueError("MONGODB_URI not found in environment variables")
-                self.client = MongoClient(mongo_uri)
-                logger.debug(f"Connected to MongoDB")
+                self.mongo_uri = os.getenv("MONGODB_URI")
+                if not self.mongo_uri:
+                    if not offline:
+                        raise ValueError("MONGODB_URI not found in environment variables")
+                    logger.info("MONGODB_URI not set, running offline against local index")
             else:
-                self.client = db_client
+                self.mongo_uri = None
                 logger.debug("Using injected MongoDB client")
             
-            self.collection = self.client[self.DB_NAME][self.COLLECTION_NAME]
-            logger.debug(f"Using collection: {self.DB_NAME}.{self.COLLECTION_NAME}")
+            # Initialize vector backend
+            self.local_index = local_index
+            self._async_client = async_db_client
+            self._async_tavily = async_web_client
+            # Event loops the lazily created async clients belong to (None
+            # for injected clients, which are never replaced)
+            self._async_client_loop = None
+            self._async_tavily_loop = None
             
-            # Initialize embedding model
-            if embedding_model is None:
-                logger.debug("Loading embedding model: all-MiniLM-L6-v2")
-                self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-                logger.debug("Embedding model loaded")
-            else:
-                self.embedding_model = embedding_model
+            # Web search client, cache and in-flight registry
+            self._tavily_client = web_client
+            self._web_lock = threading.Lock()
+            self.web_flight = SingleFlight()
+            self.search_flight = SingleFlight() if self.SEARCH_COALESCING else None
+            self.web_cache = TTLCache(self.WEB_SEARCH_CACHE_MAX_ENTRIES, self.WEB_SEARCH_DEFAULT_TTL)
+            self._web_last_good = TTLCache(self.WEB_SEARCH_CACHE_MAX_ENTRIES, self.WEB_SEARCH_STALE_TTL)
+            self._web_stale_served = 0
+            self._fingerprint = None
+            self._fingerprint_lock = threading.Lock()
+            self._fingerprint_stop = threading.Event()
+            self._fingerprint_thread = None
+            
+            # Return chunk embeddings with vector results (used for context dedup)
+            self.include_embeddings = False
+            if self.backend == "local" and self.local_index is None:
+                self.local_index = self._build_local_index()
+            elif self.backend != "local":
+                logger.debug(f"Using Atlas vector index: {self.INDEX_NAME}")
+            
+            # BM25 index for hybrid retrieval (built by load_lexical_index)
+            self.lexical_index = lexical_index
+            self._lexical_lock = threading.Lock()
+            self.hybrid_stats = {"fused": 0, "keywordOnly": 0}
+            
+            # Embedding model (loaded on first use or by load_embedding_model)
+            self._embedding_model = embedding_model
+            self._model_lock = threading.Lock()
+            self.embedding_cache: Optional[EmbeddingCache] = None
+            if embedding_model is not None:
                 logger.debug("Using injected embedding model")
+                self._init_embedding_cache()
             
             logger.info("Retriever initialization complete")
             
         except Exception as e:
             logger.error(f"Failed to initialize Retriever: {e}", exc_info=True)
             raise
+    
+    @property
+    def client(self):
+        """MongoDB client, created on first use (None when offline)."""
+        if self._client is None and self.mongo_uri:
+            with self._connect_lock:
+                if self._client is None:
+                    from pymongo import MongoClient
+                    
+                    self._client = MongoClient(self.mongo_uri)
+                    logger.debug("Connected to MongoDB")
+        return self._client
+    
+    @property
+    def collection(self):
+        """Source collection (None when offline)."""
+        if self._collection is None and self.client is not None:
+            self._collection = self.client[self.DB_NAME][self.COLLECTION_NAME]
+            logger.debug(f"Using collection: {self.DB_NAME}.{self.COLLECTION_NAME}")
+        return self._collection
+    
+    @property
+    def embedding_model(self):
+        """Embedding model; the first caller loads it, concurrent callers wait."""
+        if self._embedding_model is None:
+            self.load_embedding_model()
+        return self._embedding_model
+    
+    @property
+    def model_loaded(self) -> bool:
+        return self._embedding_model is not None
+    
+    def load_embedding_model(self):
+        """
+        Load the configured embedding model if not loaded yet.
+        
+        Safe to call from a background thread at startup: queries that need
+        an embedding meanwhile block on the same lock until it is ready.
+        """
+        with self._model_lock:
+            if self._embedding_model is None:
+                logger.debug(f"Loading embedding model: {self.EMBEDDING_MODEL_NAME} ({self.EMBEDDING_BACKEND})")
+                self._embedding_model = create_embedding_model(
+                    backend=self.EMBEDDING_BACKEND,
+                    model_name=self.EMBEDDING_MODEL_NAME,
+                    onnx_dir=self.EMBEDDING_ONNX_DIR
+                )
+                logger.debug("Embedding model loaded")
+                self._init_embedding_cache()
+    
+    @property
+    def embedding_model_id(self) -> str:
+        """Identifier of the vectors the current model produces (cache version)."""
+        model = self.embedding_model
+        model_id = getattr(model, "model_id", None)
+        if model_id:
+            return model_id
+        if self.EMBEDDING_BACKEND == "torch" and type(model).__name__ == "SentenceTransformer":
+            return f"{self.EMBEDDING_MODEL_NAME}:torch"
+        return f"{self.EMBEDDING_MODEL_NAME}:{type(model).__name__}"
+    
+    def _init_embedding_cache(self):
+        """Create the embedding cache for the loaded model."""
+        if self.EMBEDDING_CACHE_SIZE <= 0:
+            return
+        
+        get_dimension = getattr(self._embedding_model, "get_sentence_embedding_dimension", None)
+        self.embedding_cache = EmbeddingCache(
+            model_id=self.embedding_model_id,
+            max_entries=self.EMBEDDING_CACHE_SIZE,
+            store_dir=self.EMBEDDING_STORE_DIR or None,
+            dimension=get_dimension() if get_dimension else None,
+            store_slots=self.EMBEDDING_STORE_SLOTS
+        )
+    
+    def warm_up_connection(self):
+        """Open the MongoDB connection pool ahead of the first query."""
+        client = self.client
+        if client is not None and hasattr(client, "admin"):
+            client.admin.command("ping")
+            logger.debug("MongoDB connection warmed up")
+    
+    def _build_local_index(self) -> LocalVectorIndex:
+        """
+        Build the in-process vector index from a snapshot or the collection.
+        
+        Returns:
+            Loaded LocalVectorIndex (synced in the background when backed by Mongo)
+        """
+        if self.LOCAL_INDEX_SNAPSHOT:
+            return LocalVectorIndex.from_snapshot(self.LOCAL_INDEX_SNAPSHOT)
+        
+        index = LocalVectorIndex(self.collection, refresh_interval=self.LOCAL_INDEX_REFRESH_SECONDS)
+        index.load()
+        index.start_sync()
+        return index
 
-
+    def load_lexical_index(self):
+        """
+        Build the BM25 index for hybrid retrieval (no-op when disabled or built).
+        
+        Uses the local vector index's chunks when running from a snapshot,
+        otherwise loads the collection (without embeddings) and keeps the
+        index in sync in the background.
+        """
+        if not self.HYBRID_SEARCH or self.lexical_index is not None:
+            return
+        
+        with self._lexical_lock:
+            if self.lexical_index is not None:
+                return
+            if self.local_index is not None and self.local_index.collection is None:
+                index = LexicalIndex()
+                index.add_documents(self.local_index.documents())
+            else:
+                index = LexicalIndex(self.collection, refresh_interval=self.LOCAL_INDEX_REFRESH_SECONDS)
+                index.load()
+                index.start_sync()
+            self.lexical_index = index
+    
+    @property
+    def hybrid(self) -> bool:
+        """True if vector results are fused with the BM25 index."""
+        return self.lexical_index is not None and self.lexical_index.size > 0
+    
+    def _is_keyword_lookup(self, query: str) -> bool:
+        """True if a query is a short acronym lookup of indexed terms (see LEXICAL_KEYWORD_MAX_TERMS)."""
+        return self.hybrid and self.lexical_index.is_keyword_query(
+            query, self.LEXICAL_KEYWORD_MAX_TERMS, self.LEXICAL_RARE_TERM_IDF
+        )
+    
+    def _keyword_results(self, query: str, section_name: Optional[str], top_k: int) -> Optional[List[Dict]]:
+        """
+        Answer a short keyword lookup from the BM25 index alone.
+        
+        Args:
+            query: Search query text
+            section_name: Optional section filter
+            top_k: Number of results to return
+            
+        Returns:
+            Formatted results flagged "keyword_match", or None if the query
+            is not a keyword lookup (or nothing matched) and needs the
+            vector search
+        """
+        if not self._is_keyword_lookup(query):
+            return None
+        
+        with span("lexical_search", section_name=section_name):
+            hits = self.lexical_index.search(query, section_name, top_k)
+        if not hits:
+            return None
+        
+        self.hybrid_stats["keywordOnly"] += 1
+        logger.debug(f"Keyword lookup answered from BM25 index: '{query}'")
+        results = self._fuse_rankings([], self._format_vector_results(hits, section_name), top_k)
+        for result in results:
+            result['keyword_match'] = True
+        return results
+    
+    def _hybrid_results(self, query: str, section_name: Optional[str], vector_results: List[Dict], top_k: int) -> List[Dict]:
+        """
+        Fuse formatted vector results with BM25 hits for the same section.
+        
+        Args:
+            query: Search query text
+            section_name: Optional section filter
+            vector_results: Formatted vector results, best first
+            top_k: Number of results to return
+            
+        Returns:
+            Fused top_k results (vector results unchanged when not hybrid)
+        """
+        if not self.hybrid:
+            return vector_results[:top_k]
+        
+        with span("lexical_search", section_name=section_name):
+            hits = self.lexical_index.search(query, section_name, top_k * self.HYBRID_OVERSAMPLE)
+        self.hybrid_stats["fused"] += 1
+        return self._fuse_rankings(vector_results, self._format_vector_results(hits, section_name), top_k)
+    
+    def _fuse_rankings(self, vector_results: List[Dict], lexical_results: List[Dict], top_k: int) -> List[Dict]:
+        """
+        Reciprocal rank fusion of vector and lexical results (keyed by content).
+        
+        The fused "score" is rescaled to 0-1 (1.0 = ranked first by both);
+        the original vector similarity is kept as "vector_score".
+        
+        Returns:
+            Top top_k results in fused order
+        """
+        candidates: Dict[str, Dict] = {}
+        for result in lexical_results:
+            candidates[result['content']] = {**result, 'vector_score': None}
+        for result in vector_results:
+            candidates[result['content']] = {**result, 'vector_score': result.get('score')}
+        
+        fused = reciprocal_rank_fusion(
+            [[r['content'] for r in vector_results], [r['content'] for r in lexical_results]],
+            k=self.HYBRID_RRF_K
+        )
+        ceiling = 2.0 / (self.HYBRID_RRF_K + 1)
+        
+        ranked = []
+        for content in sorted(fused, key=lambda key: -fused[key])[:top_k]:
+            result = candidates[content]
+            result['score'] = round(fused[content] / ceiling, 4)
+            ranked.append(result)
+        return ranked
+    
+    def get_lexical_index_stats(self) -> Optional[Dict]:
+        """
+        Get BM25 index and hybrid retrieval statistics.
+        
+        Returns:
+            Dictionary of statistics, or None if hybrid retrieval is off
+        """
+        if self.lexical_index is None:
+            return None
+        return {**self.lexical_index.get_stats(), **self.hybrid_stats}
+    
+    def corpus_fingerprint(self):
+        """
+        Token that changes whenever the indexed corpus changes.
+        
+        Uses the local index version when available, otherwise the last
+        Atlas digest computed by refresh_fingerprint. Never touches the
+        database, so it is safe to call on the request path.
+        
+        Returns:
+            Hashable fingerprint, or None if it is not known yet
+        """
+        if self.local_index is not None:
+            return ("local", self.local_index.version)
+        
+        with self._fingerprint_lock:
+            return self._fingerprint
+    
+    def refresh_fingerprint(self):
+        """
+        Recompute the Atlas corpus fingerprint: a digest of the collection's
+        per-document signatures (updatedAt, or a hash of the indexed fields),
+        so edited and replaced chunks count too. Scans the collection.
+        
+        Returns:
+            The new fingerprint (the previous one is kept if the scan fails)
+        """
+        if self.local_index is not None or self.collection is None:
+            return self.corpus_fingerprint()
+        
+        try:
+            fingerprint = ("atlas", corpus_signature(self.collection, self.FINGERPRINT_PROJECTION))
+        except Exception as e:
+            logger.warning(f"Corpus fingerprint refresh failed: {e}")
+            return self.corpus_fingerprint()
+        
+        with self._fingerprint_lock:
+            self._fingerprint = fingerprint
+        return fingerprint
+    
+    def start_fingerprint_refresh(self):
+        """
+        Compute the Atlas corpus fingerprint now and refresh it every
+        FINGERPRINT_INTERVAL seconds on a background thread (no-op for the
+        local index, whose version is the fingerprint).
+        """
+        if self.local_index is not None or self._fingerprint_thread is not None:
+            return
+        
+        self.refresh_fingerprint()
+        
+        def _loop():
+            while not self._fingerprint_stop.wait(self.FINGERPRINT_INTERVAL):
+                self.refresh_fingerprint()
+        
+        self._fingerprint_thread = threading.Thread(target=_loop, name="corpus-fingerprint", daemon=True)
+        self._fingerprint_thread.start()
+    
+    def section_centroids(self) -> Dict[str, List[float]]:
+        """
+        Mean chunk embedding per section_name.
+        
+        Uses the local index when loaded, otherwise scans the collection's
+        embeddings once (the corpus is small).
+        
+        Returns:
+            Dictionary of section name -> centroid vector
+        """
+        if self.local_index is not None:
+            return {name: v.tolist() for name, v in self.local_index.section_centroids().items()}
+        
+        sums, counts = {}, {}
+        for doc in self.collection.find({}, {"embedding": 1, "section_name": 1}):
+            section, embedding = doc.get("section_name"), doc.get("embedding")
+            if not section or not embedding:
+                continue
+            vector = np.asarray(embedding, dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            sums[section] = sums.get(section, 0) + (vector / norm if norm else vector)
+            counts[section] = counts.get(section, 0) + 1
+        
+        return {name: (sums[name] / counts[name]).tolist() for name in sums}
+    
+    @timed("embed")
+    def embed_query(self, query: str) -> List[float]:
+        """
+        Encode a single query (served from the embedding cache when seen before).
+        
+        Args:
+            query: Query text to embed
+            
+        Returns:
+            Embedding vector
+        """
+        model = self.embedding_model
+        cache = self.embedding_cache
+        if cache is not None:
+            cached = cache.get(query)
+            if cached is not None:
+                return cached
+        
+        embedding_response = model.encode(query)
+        # Check if it's already a list (from HF client) or numpy array (from output of SentenceTransformer)
+        if not isinstance(embedding_response, list):
+            embedding_response = embedding_response.tolist()
+        
+        if cache is not None:
+            cache.put(query, embedding_response)
+        return embedding_response
+    
+    @timed("embed")
+    def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """
+        Encode several queries in a single forward pass.
+        
+        Cached queries are served from the embedding cache; only the
+        misses go through the model.
+        
+        Args:
+            queries: Query texts to embed
+            
+        Returns:
+            List of embedding vectors, in the same order as queries
+        """
+        if not queries:
+            return []
+        
+        model = self.embedding_model
+        cache = self.embedding_cache
+        embeddings = [cache.get(query) if cache is not None else None for query in queries]
+        missing = [i for i, vector in enumerate(embeddings) if vector is None]
+        if not missing:
+            return embeddings
+        
+        embedding_response = model.encode([queries[i] for i in missing])
+        # Check if it's already a list (from HF client) or numpy array (from output of SentenceTransformer)
+        if not isinstance(embedding_response, list):
+            embedding_response = embedding_response.tolist()
+        for i, vector in zip(missing, embedding_response):
+            embeddings[i] = vector if isinstance(vector, list) else vector.tolist()
+            if cache is not None:
+                cache.put(queries[i], embeddings[i])
+        
+        logger.debug(f"Batch-encoded {len(missing)} of {len(queries)} queries in one call")
+        return embeddings
+    
+    @timed("vector_search", label="section_name")
     def vector_search(
         self, 
         query: str, 
         section_name: Optional[str] = None, 
-        top_k: int = 3
+        top_k: int = 3,
+        query_embedding: Optional[List[float]] = None
     ) -> List[Dict]:
         """
         Perform vector similarity search with optional section filtering.
         
+        Identical concurrent searches (same query, section and top_k) share
+        one embedding pass and backend call.
+        
         Args:
             query: Search query text
             section_name: Optional section name for metadata filtering (None = no filter)
             top_k: Number of results to return
+            query_embedding: Optional precomputed embedding of query (skips encoding)
             
         Returns:
             List of retrieved documents with content and metadata
@@ -97,72 +600,392 @@ class Retriever:
         logger.debug(f"Vector search: query='{query}', section={section_name}, top_k={top_k}")
         
         try:
-            # Generate query embedding
-            embedding_response = self.embedding_model.encode(query)
-            # Check if it's already a list (from HF client) or numpy array (from output of SentenceTransformer)
-            if isinstance(embedding_response, list):
-                query_embedding = embedding_response
-            else:
-                query_embedding = embedding_response.tolist()
-                
-            logger.debug(f"Generated embedding vector (dim={len(query_embedding)})")
-            
-            # Build aggregation pipeline
-            pipeline = [
-                {
-                    "$vectorSearch": {
-                        "index": self.INDEX_NAME,
-                        "path": "embedding",
-                        "queryVector": query_embedding,
-                        "numCandidates": 100,
-                        "limit": top_k
-                    }
-                },
-                {
-                    "$project": {
-                        "section_name": 1,
-                        "content": 1,
-                        "metadata": 1,
-                        "score": {"$meta": "vectorSearchScore"}
-                    }
-                }
-            ]
+            keyword_results = self._keyword_results(query, section_name, top_k)
+            if keyword_results is not None:
+                return keyword_results
             
-            # Add section filter if specified
-            if section_name:
-                pipeline[0]["$vectorSearch"]["filter"] = {
-                    "section_name": {"$eq": section_name}
-                }
-                logger.debug(f"Applied section filter: {section_name}")
-            else:
-                logger.debug("No section filter applied (searching entire collection)")
+            # Identical in-flight searches (from any request) share one round trip
+            if self.search_flight is not None:
+                results, shared = self.search_flight.do(
+                    (query, section_name, top_k), self._search_vectors, query, section_name, top_k, query_embedding
+                )
+                return self._copy_shared(results) if shared else results
+            return self._search_vectors(query, section_name, top_k, query_embedding)
             
-            # Execute search
-            results = list(self.collection.aggregate(pipeline))
-            logger.debug(f"Vector search returned {len(results)} results")
+        except Exception as e:
+            logger.error(f"Vector search failed: {e}", exc_info=True)
+            return []
+    
+    def _search_vectors(
+        self,
+        query: str,
+        section_name: Optional[str],
+        top_k: int,
+        query_embedding: Optional[List[float]] = None
+    ) -> List[Dict]:
+        """
+        Embed (if needed), search the vector backend and fuse with BM25 hits.
+        
+        Returns:
+            Formatted top_k results
+        """
+        # Generate query embedding unless the caller already batch-encoded it
+        if query_embedding is None:
+            query_embedding = self.embed_query(query)
             
-            # Format results
-            formatted_results = []
-            for result in results:
-                formatted_results.append({
-                    'content': result.get('content', ''),
-                    'section': result.get('section_name', section_name or 'general'),
-                    'score': result.get('score', 0.0),
-                    'metadata': result.get('metadata', {})
-                })
+        logger.debug(f"Generated embedding vector (dim={len(query_embedding)})")
+        
+        fetch_k = top_k * self.HYBRID_OVERSAMPLE if self.hybrid else top_k
+        if self.local_index is not None:
+            results = self.local_index.search(query_embedding, section_name, fetch_k)
+        else:
+            results = self._atlas_search(query_embedding, section_name, fetch_k)
+        logger.debug(f"Vector search returned {len(results)} results")
+        
+        formatted_results = self._hybrid_results(
+            query, section_name, self._format_vector_results(results, section_name), top_k
+        )
+        logger.info(f"Vector search complete: {len(formatted_results)} results")
+        return formatted_results
+    
+    @staticmethod
+    def _copy_shared(results: List[Dict]) -> List[Dict]:
+        """Per-caller copies of results shared with a coalesced search."""
+        logger.debug(f"Joined in-flight vector search ({len(results)} results)")
+        return [dict(result) for result in results]
+    
+    @timed("vector_search", label="section_name")
+    async def avector_search(
+        self, 
+        query: str, 
+        section_name: Optional[str] = None, 
+        top_k: int = 3,
+        query_embedding: Optional[List[float]] = None
+    ) -> List[Dict]:
+        """
+        Async variant of vector_search.
+        
+        Encoding runs in a worker thread (CPU-bound); the $vectorSearch
+        aggregation runs on the async Mongo client when one is available.
+        
+        Args:
+            query: Search query text
+            section_name: Optional section name for metadata filtering (None = no filter)
+            top_k: Number of results to return
+            query_embedding: Optional precomputed embedding of query (skips encoding)
+            
+        Returns:
+            List of retrieved documents with content and metadata
+        """
+        logger.debug(f"Async vector search: query='{query}', section={section_name}, top_k={top_k}")
+        
+        try:
+            keyword_results = self._keyword_results(query, section_name, top_k)
+            if keyword_results is not None:
+                return keyword_results
             
-            logger.info(f"Vector search complete: {len(formatted_results)} results")
-            return formatted_results
+            # Identical in-flight searches on this event loop share one round trip
+            if self.search_flight is not None:
+                results, shared = await self.search_flight.ado(
+                    (query, section_name, top_k),
+                    lambda: self._asearch_vectors(query, section_name, top_k, query_embedding)
+                )
+                return self._copy_shared(results) if shared else results
+            return await self._asearch_vectors(query, section_name, top_k, query_embedding)
             
         except Exception as e:
-            logger.error(f"Vector search failed: {e}", exc_info=True)
+            logger.error(f"Async vector search failed: {e}", exc_info=True)
             return []
     
+    async def _asearch_vectors(
+        self,
+        query: str,
+        section_name: Optional[str],
+        top_k: int,
+        query_embedding: Optional[List[float]] = None
+    ) -> List[Dict]:
+        """
+        Async variant of _search_vectors.
+        """
+        if query_embedding is None:
+            query_embedding = await asyncio.to_thread(self.embed_query, query)
+        
+        fetch_k = top_k * self.HYBRID_OVERSAMPLE if self.hybrid else top_k
+        if self.local_index is not None:
+            results = self.local_index.search(query_embedding, section_name, fetch_k)
+        elif self.async_collection is not None:
+            cursor = await self.async_collection.aggregate(
+                self._build_vector_pipeline(query_embedding, section_name, fetch_k)
+            )
+            results = await cursor.to_list()
+        else:
+            # Injected sync client without an async counterpart
+            results = await asyncio.to_thread(self._atlas_search, query_embedding, section_name, fetch_k)
+        
+        formatted_results = self._hybrid_results(
+            query, section_name, self._format_vector_results(results, section_name), top_k
+        )
+        logger.info(f"Async vector search complete: {len(formatted_results)} results")
+        return formatted_results
+    
+    @property
+    def async_collection(self):
+        """
+        Async Mongo collection of the running event loop (None if unavailable).
+        
+        The client is created on first use inside each event loop, since its
+        connection pool is bound to the loop it was created on.
+        """
+        loop = asyncio.get_running_loop()
+        stale = self._async_client_loop not in (None, loop)
+        if (self._async_client is None or stale) and self.mongo_uri:
+            from pymongo import AsyncMongoClient
+            
+            self._async_client = AsyncMongoClient(self.mongo_uri)
+            self._async_client_loop = loop
+            logger.debug("Async MongoDB client initialized")
+        if self._async_client is None:
+            return None
+        return self._async_client[self.DB_NAME][self.COLLECTION_NAME]
+    
+    def _format_vector_results(self, results: List[Dict], section_name: Optional[str]) -> List[Dict]:
+        """
+        Normalize raw vector search documents.
+        
+        Args:
+            results: Raw projected documents
+            section_name: Section filter used for the search (if any)
+            
+        Returns:
+            List of {content, section, score, metadata[, embedding]} dictionaries
+        """
+        formatted_results = []
+        for result in results:
+            formatted = {
+                'content': result.get('content', ''),
+                'section': result.get('section_name', section_name or 'general'),
+                'score': result.get('score', 0.0),
+                'metadata': result.get('metadata', {})
+            }
+            if self.include_embeddings and result.get('embedding') is not None:
+                formatted['embedding'] = result['embedding']
+            formatted_results.append(formatted)
+        return formatted_results
+    
+    def _atlas_search(self, query_embedding: List[float], section_name: Optional[str], top_k: int) -> List[Dict]:
+        """
+        Run a $vectorSearch aggregation against the Atlas index.
+        
+        Args:
+            query_embedding: Query vector
+            section_name: Optional section name for metadata filtering
+            top_k: Number of results to return
+            
+        Returns:
+            Raw projected documents (section_name, content, metadata, score)
+        """
+        # Execute search
+        return list(self.collection.aggregate(
+            self._build_vector_pipeline(query_embedding, section_name, top_k)
+        ))
+    
+    def grouped_vector_search(
+        self,
+        query: str,
+        sections: List[str],
+        top_k: int = 3,
+        query_embedding: Optional[List[float]] = None
+    ) -> Dict[str, List[Dict]]:
+        """
+        Search several sections with one shared query vector.
+        
+        Issues a single $vectorSearch filtered on section_name $in sections
+        and partitions the hits per section client-side. When the shared
+        limit was exhausted, any section left with fewer than top_k hits is
+        topped up with its own filtered search, so every section still gets
+        its per-section top_k.
+        
+        Args:
+            query: Search query text
+            sections: Section names to search
+            top_k: Number of results per section
+            query_embedding: Optional precomputed embedding of query (skips encoding)
+            
+        Returns:
+            Dictionary of section -> list of formatted results
+        """
+        logger.debug(f"Grouped vector search: query='{query}', sections={sections}, top_k={top_k}")
+        
+        if len(sections) == 1:
+            return {sections[0]: self.vector_search(query, sections[0], top_k, query_embedding)}
+        
+        try:
+            if self.local_index is not None or self._is_keyword_lookup(query):
+                # In-process searches (and keyword lookups) gain nothing from grouping
+                return {
+                    section: self.vector_search(query, section, top_k, query_embedding)
+                    for section in sections
+                }
+            
+            if query_embedding is None:
+                query_embedding = self.embed_query(query)
+            
+            limit = top_k * len(sections) * self.GROUPED_OVERSAMPLE
+            with span("grouped_vector_search", sections=sections):
+                results = list(self.collection.aggregate(
+                    self._build_vector_pipeline(query_embedding, sections, limit)
+                ))
+            grouped, short = self._partition_grouped(results, sections, top_k)
+            if len(results) < limit:
+                short = []
+            
+            for section in sections:
+                if section not in short:
+                    grouped[section] = self._hybrid_results(query, section, grouped[section], top_k)
+            for section in short:
+                logger.debug(f"Grouped search short for '{section}', topping up")
+                grouped[section] = self.vector_search(query, section, top_k, query_embedding)
+            
+            logger.info(f"Grouped vector search complete: {len(sections)} sections, {len(short)} top-ups")
+            return grouped
+            
+        except Exception as e:
+            logger.error(f"Grouped vector search failed: {e}", exc_info=True)
+            return {section: [] for section in sections}
+    
+    async def agrouped_vector_search(
+        self,
+        query: str,
+        sections: List[str],
+        top_k: int = 3,
+        query_embedding: Optional[List[float]] = None
+    ) -> Dict[str, List[Dict]]:
+        """
+        Async variant of grouped_vector_search.
+        """
+        if (
+            len(sections) == 1
+            or self.local_index is not None
+            or self.async_collection is None
+            or self._is_keyword_lookup(query)
+        ):
+            return await asyncio.to_thread(self.grouped_vector_search, query, sections, top_k, query_embedding)
+        
+        try:
+            if query_embedding is None:
+                query_embedding = await asyncio.to_thread(self.embed_query, query)
+            
+            limit = top_k * len(sections) * self.GROUPED_OVERSAMPLE
+            with span("grouped_vector_search", sections=sections):
+                cursor = await self.async_collection.aggregate(
+                    self._build_vector_pipeline(query_embedding, sections, limit)
+                )
+                results = await cursor.to_list()
+            grouped, short = self._partition_grouped(results, sections, top_k)
+            if len(results) < limit:
+                short = []
+            
+            for section in sections:
+                if section not in short:
+                    grouped[section] = self._hybrid_results(query, section, grouped[section], top_k)
+            if short:
+                top_ups = await asyncio.gather(*(
+                    self.avector_search(query, section, top_k, query_embedding) for section in short
+                ))
+                grouped.update(zip(short, top_ups))
+            
+            return grouped
+            
+        except Exception as e:
+            logger.error(f"Async grouped vector search failed: {e}", exc_info=True)
+            return {section: [] for section in sections}
+    
+    def _partition_grouped(self, results: List[Dict], sections: List[str], top_k: int):
+        """
+        Split grouped search hits per section.
+        
+        Args:
+            results: Raw hits, ordered by descending score
+            sections: Requested section names
+            top_k: Number of results per section
+            
+        Returns:
+            (grouped, short): section -> formatted top_k results, and the
+            sections that received fewer than top_k hits
+        """
+        buckets = {section: [] for section in sections}
+        for result in results:
+            bucket = buckets.get(result.get('section_name'))
+            if bucket is not None and len(bucket) < top_k:
+                bucket.append(result)
+        
+        grouped = {
+            section: self._format_vector_results(hits, section)
+            for section, hits in buckets.items()
+        }
+        short = [section for section, hits in buckets.items() if len(hits) < top_k]
+        return grouped, short
+    
+    def _build_vector_pipeline(self, query_embedding: List[float], section_name, top_k: int) -> List[Dict]:
+        """
+        Build the $vectorSearch aggregation pipeline.
+        
+        Args:
+            query_embedding: Query vector
+            section_name: Optional section name, or list of section names,
+                for metadata filtering
+            top_k: Number of results to return
+            
+        Returns:
+            Aggregation pipeline stages
+        """
+        # Build aggregation pipeline
+        pipeline = [
+            {
+                "$vectorSearch": {
+                    "index": self.INDEX_NAME,
+                    "path": "embedding",
+                    "queryVector": query_embedding,
+                    "numCandidates": max(100, top_k * 20),
+                    "limit": top_k
+                }
+            },
+            {
+                "$project": {
+                    "section_name": 1,
+                    "content": 1,
+                    "metadata": 1,
+                    "score": {"$meta": "vectorSearchScore"}
+                }
+            }
+        ]
+        if self.include_embeddings:
+            pipeline[1]["$project"]["embedding"] = 1
+        
+        # Add section filter if specified
+        if isinstance(section_name, (list, tuple)):
+            pipeline[0]["$vectorSearch"]["filter"] = {
+                "section_name": {"$in": list(section_name)}
+            }
+            logger.debug(f"Applied multi-section filter: {section_name}")
+        elif section_name:
+            pipeline[0]["$vectorSearch"]["filter"] = {
+                "section_name": {"$eq": section_name}
+            }
+            logger.debug(f"Applied section filter: {section_name}")
+        else:
+            logger.debug("No section filter applied (searching entire collection)")
+        
+        return pipeline
+    
+    @timed("web_search", label="section")
     def web_search(self, query: str, section: str, num_results: int = 3) -> List[Dict]:
         """
         Perform web search using Tavily API for time-sensitive information.
         
-        Currently supports scholarship and exam_center sections.
+        Currently supports scholarship and exam_center sections. Results are
+        cached per section TTL, identical concurrent lookups share a single
+        API call, and the last good result is served if the API fails.
         
         Args:
             query: Search query
@@ -175,86 +998,278 @@ class Retriever:
         logger.debug(f"Web search: query='{query}', section={section}, num={num_results}")
         
         try:
-            # Get Tavily API key
+            # Get Tavily API key (not needed with an injected client)
             tavily_api_key = os.getenv("TAVILY_API_KEY")
-            if not tavily_api_key:
+            if not tavily_api_key and self._tavily_client is None:
                 logger.warning("TAVILY_API_KEY not found in environment, skipping web search")
                 return []
             
-            # Import Tavily client
-            try:
-                from tavily import TavilyClient
-            except ImportError:
-                logger.error("Tavily package not installed. Install with: pip install tavily-python")
-                return []
-            
             # Refine query with section context
-            refined_query = f"{query} college campus {section.replace('_', ' ')}"
+            refined_query = self._refine_web_query(query, section)
             logger.debug(f"Refined query: '{refined_query}'")
             
-            # Perform Tavily search
-            results = self._tavily_search(refined_query, tavily_api_key, num_results)
+            key = (section, refined_query, num_results)
+            cached = self.web_cache.get(key)
+            if cached is not TTLCache.MISSING:
+                logger.debug(f"Web search cache hit for '{refined_query}'")
+                return list(cached)
+            
+            # Identical in-flight lookups (from any request) share one API call
+            results, shared = self.web_flight.do(
+                key,
+                self._fetch_web_results,
+                key,
+                lambda: self._tavily_search(refined_query, tavily_api_key, num_results)
+            )
+            if shared:
+                logger.debug(f"Joined in-flight web search for '{refined_query}'")
+                return list(results)
             
             logger.info(f"Web search complete: {len(results)} results")
             logger.info(f"Web search results: {results}")
-            return results
+            return list(results)
             
         except Exception as e:
             logger.error(f"Web search failed: {e}", exc_info=True)
             return []
     
-    def _tavily_search(self, query: str, api_key: str, num_results: int) -> List[Dict]:
+    @timed("web_search", label="section")
+    async def aweb_search(self, query: str, section: str, num_results: int = 3) -> List[Dict]:
         """
-        Perform search using Tavily API.
+        Async variant of web_search using the async Tavily client.
+        
+        Shares the result cache and stale fallback with web_search.
         
         Args:
             query: Search query
-            api_key: Tavily API key
-            num_results: Number of results
+            section: Section context for search refinement
+            num_results: Number of web results to retrieve
             
         Returns:
-            List of formatted search results
+            List of web search results with snippets
         """
-        logger.debug("Calling Tavily API")
+        logger.debug(f"Async web search: query='{query}', section={section}, num={num_results}")
         
         try:
-            from tavily import TavilyClient
-            
-            # Initialize Tavily client
-            client = TavilyClient(api_key=api_key)
-            
-            # Perform search
-            response = client.search(
-                query=query,
-                max_results=num_results,
-                search_depth="basic",  # Options: "basic" or "advanced"
-                include_answer=False,
-                include_raw_content=False
-            )
+            tavily_api_key = os.getenv("TAVILY_API_KEY")
+            if not tavily_api_key and self._async_tavily is None:
+                logger.warning("TAVILY_API_KEY not found in environment, skipping web search")
+                return []
             
-            # Format results
-            results = []
-            for item in response.get('results', [])[:num_results]:
-                results.append({
-                    'content': item.get('content', ''),
-                    'title': item.get('title', ''),
-                    'url': item.get('url', ''),
-                    'source': 'web',
-                    'score': item.get('score', 0.0)
-                })
+            refined_query = self._refine_web_query(query, section)
+            key = (section, refined_query, num_results)
+            cached = self.web_cache.get(key)
+            if cached is not TTLCache.MISSING:
+                logger.debug(f"Web search cache hit for '{refined_query}'")
+                return list(cached)
             
-            logger.debug(f"Tavily API returned {len(results)} results")
-            return results
+            # Identical in-flight lookups on this event loop share one API call
+            results, shared = await self.web_flight.ado(
+                key, lambda: self._afetch_web_results(key, refined_query, tavily_api_key, num_results)
+            )
+            if shared:
+                logger.debug(f"Joined in-flight web search for '{refined_query}'")
+            logger.info(f"Async web search complete: {len(results)} results")
+            return list(results)
             
         except Exception as e:
-            logger.error(f"Tavily API call failed: {e}", exc_info=True)
+            logger.error(f"Async web search failed: {e}", exc_info=True)
             return []
     
+    def get_embedding_cache_stats(self) -> Optional[Dict]:
+        """
+        Get embedding cache statistics.
+        
+        Returns:
+            Per-tier statistics, or None when the cache is disabled/not built
+        """
+        return self.embedding_cache.get_stats() if self.embedding_cache is not None else None
+    
+    def get_coalescing_stats(self) -> Dict:
+        """
+        Get single-flight statistics of vector and web searches.
+        
+        Returns:
+            Dictionary of per-search coalescing statistics (None when disabled)
+        """
+        return {
+            "vectorSearch": self.search_flight.get_stats() if self.search_flight is not None else None,
+            "webSearch": self.web_flight.get_stats(),
+        }
+    
+    def get_web_cache_stats(self) -> Dict:
+        """
+        Get web search cache statistics.
+        
+        Returns:
+            Dictionary with size, hits, misses, hit rate and stale serves
+        """
+        return {**self.web_cache.get_stats(), "staleServed": self._web_stale_served}
+    
+    def _fetch_web_results(self, key: tuple, search) -> List[Dict]:
+        """
+        Call the web search API, caching successes and falling back to stale.
+        
+        Args:
+            key: (section, refined_query, num_results) cache key
+            search: Zero-argument callable performing the API call
+            
+        Returns:
+            Fresh results, the last good results on failure, or []
+        """
+        try:
+            results = search()
+        except Exception as e:
+            return self._stale_web_results(key, e)
+        
+        self._store_web_results(key, results)
+        return results
+    
+    async def _afetch_web_results(self, key: tuple, refined_query: str, api_key: str, num_results: int) -> List[Dict]:
+        """
+        Async variant of _fetch_web_results.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+            if self._async_tavily is None or self._async_tavily_loop not in (None, loop):
+                from tavily import AsyncTavilyClient
+                
+                # One client per event loop (its HTTP pool is loop-bound)
+                self._async_tavily = AsyncTavilyClient(api_key=api_key)
+                self._async_tavily_loop = loop
+            
+            response = await asyncio.wait_for(
+                self._async_tavily.search(
+                    query=refined_query,
+                    max_results=num_results,
+                    search_depth="basic",
+                    include_answer=False,
+                    include_raw_content=False
+                ),
+                timeout=self.WEB_SEARCH_TIMEOUT
+            )
+            results = self._format_tavily_results(response, num_results)
+        except Exception as e:
+            return self._stale_web_results(key, e)
+        
+        self._store_web_results(key, results)
+        return results
+    
+    def _store_web_results(self, key: tuple, results: List[Dict]):
+        """Cache fresh results with the section's TTL and keep them as last good."""
+        section = key[0]
+        ttl = self.WEB_SEARCH_CACHE_TTL.get(section, self.WEB_SEARCH_DEFAULT_TTL)
+        self.web_cache.set(key, results, ttl_seconds=ttl)
+        self._web_last_good.set(key, results)
+    
+    def _stale_web_results(self, key: tuple, error: Exception) -> List[Dict]:
+        """Serve the last good results for key after an API failure (or [])."""
+        stale = self._web_last_good.get(key)
+        if stale is not TTLCache.MISSING:
+            self._web_stale_served += 1
+            logger.warning(f"Tavily API failed ({error}), serving last good results for '{key[1]}'")
+            return stale
+        
+        logger.error(f"Tavily API call failed: {error}", exc_info=True)
+        return []
+    
+    @staticmethod
+    def _refine_web_query(query: str, section: str) -> str:
+        """Add section context to a web search query."""
+        return f"{query} college campus {section.replace('_', ' ')}"
+    
+    @staticmethod
+    def _format_tavily_results(response: Dict, num_results: int) -> List[Dict]:
+        """
+        Normalize a Tavily search response.
+        
+        Args:
+            response: Raw Tavily response
+            num_results: Maximum number of results to keep
+            
+        Returns:
+            List of {content, title, url, source, score} dictionaries
+        """
+        results = []
+        for item in response.get('results', [])[:num_results]:
+            results.append({
+                'content': item.get('content', ''),
+                'title': item.get('title', ''),
+                'url': item.get('url', ''),
+                'source': 'web',
+                'score': item.get('score', 0.0)
+            })
+        return results
+    
+    def _get_tavily_client(self, api_key: str):
+        """
+        Shared Tavily client backed by a pooled HTTP session.
+        
+        Created once and reused, so repeated searches keep their TLS
+        connections alive instead of reconnecting on every call.
+        """
+        if self._tavily_client is None:
+            with self._web_lock:
+                if self._tavily_client is None:
+                    from tavily import TavilyClient
+                    
+                    import requests
+                    
+                    session = requests.Session()
+                    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.WEB_SEARCH_POOL_SIZE)
+                    session.mount("https://", adapter)
+                    try:
+                        self._tavily_client = TavilyClient(api_key=api_key, session=session)
+                    except TypeError:
+                        # Older tavily-python without session injection
+                        self._tavily_client = TavilyClient(api_key=api_key)
+                    logger.debug("Tavily client initialized")
+        return self._tavily_client
+    
+    def _tavily_search(self, query: str, api_key: str, num_results: int) -> List[Dict]:
+        """
+        Perform search using Tavily API.
+        
+        Args:
+            query: Search query
+            api_key: Tavily API key
+            num_results: Number of results
+            
+        Returns:
+            List of formatted search results
+            
+        Raises:
+            Exception: If the API call fails (handled by the caller)
+        """
+        logger.debug("Calling Tavily API")
+        
+        client = self._get_tavily_client(api_key)
+        
+        # Perform search
+        response = client.search(
+            query=query,
+            max_results=num_results,
+            search_depth="basic",  # Options: "basic" or "advanced"
+            include_answer=False,
+            include_raw_content=False,
+            timeout=self.WEB_SEARCH_TIMEOUT
+        )
+        
+        # Format results
+        results = self._format_tavily_results(response, num_results)
+        
+        logger.debug(f"Tavily API returned {len(results)} results")
+        return results
+    
     def __del__(self):
-        """Cleanup: Close MongoDB connection."""
+        """Cleanup: Stop index sync and close MongoDB connection."""
         try:
-            if hasattr(self, 'client'):
-                self.client.close()
+            if getattr(self, '_fingerprint_stop', None) is not None:
+                self._fingerprint_stop.set()
+            if getattr(self, 'local_index', None) is not None:
+                self.local_index.stop_sync()
+            if getattr(self, '_client', None) is not None:
+                self._client.close()
                 logger.debug("MongoDB connection closed")
         except:
             pass
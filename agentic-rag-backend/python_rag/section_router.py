@@ -0,0 +1,224 @@
+"""
+Section Router Module
+=====================
+Local, embedding-based section classifier that lets the orchestrator skip
+the LLM decomposition call for clearly single-section queries.
+
+Each section is represented by a centroid built from the embedding of its
+definition and (when available) the mean embedding of its corpus chunks.
+A query is routed locally only when its best section clears a minimum
+similarity and beats the runner-up by a clear margin; everything else
+(ambiguous, multi-section or out-of-domain) falls back to the LLM.
+
+With lazy=True the centroids are built later by build() (e.g. from a
+startup warm-up thread); until then every query falls back to the LLM.
+
+Modes:
+- "off": router disabled
+- "shadow": decisions are computed and counted but never used (for tuning)
+- "on": confident decisions replace LLM decomposition
+
+classify() exposes the confident section in any mode (once centroids are
+built) for callers that only need a hint, such as section boosting.
+
+Author: RAG Research Team
+Date: November 2025
+"""
+
+import logging
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SectionRouter:
+    """
+    Centroid classifier over the fixed knowledge sections.
+    """
+
+    MODES = ("off", "shadow", "on")
+
+    def __init__(
+        self,
+        retriever,
+        section_definitions: Dict[str, str],
+        mode: str = "shadow",
+        min_score: float = 0.45,
+        min_margin: float = 0.10,
+        use_corpus: bool = True,
+        lazy: bool = False
+    ):
+        """
+        Initialize router and precompute section centroids.
+
+        Args:
+            retriever: Retriever providing the embedding model and corpus
+            section_definitions: Dictionary of section names to descriptions
+            mode: "off", "shadow" or "on"
+            min_score: Minimum cosine similarity of the best section
+            min_margin: Minimum similarity gap between best and second section
+            use_corpus: Blend per-section corpus centroids into the definitions
+            lazy: Defer centroid construction to build()
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unsupported section router mode: {mode}")
+
+        logger.info(f"Initializing Section Router (mode={mode}, min_score={min_score}, min_margin={min_margin})")
+        self.retriever = retriever
+        self.mode = mode
+        self.min_score = min_score
+        self.min_margin = min_margin
+
+        self._lock = threading.Lock()
+        self.stats = {"routed": 0, "bypassed": 0, "fallback": 0}
+
+        self.section_definitions = section_definitions
+        self.use_corpus = use_corpus
+        self.sections: List[str] = []
+        self.centroids = None
+        if mode != "off" and not lazy:
+            self.build()
+
+    @property
+    def enabled(self) -> bool:
+        """True if routing decisions are computed (shadow or on)."""
+        return self.mode != "off"
+
+    @property
+    def ready(self) -> bool:
+        """True once centroids are built."""
+        return self.centroids is not None
+
+    def build(self):
+        """Build the section centroids (no-op when disabled or already built)."""
+        if self.enabled and not self.ready:
+            self._build_centroids(self.section_definitions, self.use_corpus)
+
+    def _build_centroids(self, section_definitions: Dict[str, str], use_corpus: bool):
+        """
+        Embed section definitions and blend in corpus centroids.
+
+        Args:
+            section_definitions: Dictionary of section names to descriptions
+            use_corpus: Blend per-section corpus centroids into the definitions
+        """
+        sections = list(section_definitions.keys())
+        definition_vectors = self.retriever.embed_queries([
+            f"{name.replace('_', ' ')}: {description}"
+            for name, description in section_definitions.items()
+        ])
+        vectors = [self._normalize(v) for v in definition_vectors]
+
+        if use_corpus:
+            try:
+                corpus_centroids = self.retriever.section_centroids()
+            except Exception as e:
+                logger.warning(f"Corpus centroids unavailable, using definitions only: {e}")
+                corpus_centroids = {}
+
+            for i, section in enumerate(sections):
+                centroid = corpus_centroids.get(section)
+                if centroid is not None:
+                    vectors[i] = self._normalize(vectors[i] + self._normalize(centroid))
+            logger.debug(f"Blended corpus centroids for {len(corpus_centroids)} sections")
+
+        self.sections = sections
+        self.centroids = np.stack(vectors)
+
+    def route(self, user_query: str, query_embedding: Optional[List[float]] = None) -> Optional[Dict[str, str]]:
+        """
+        Classify a query into a single section when confident.
+
+        Args:
+            user_query: Original user question
+            query_embedding: Optional precomputed embedding of user_query
+
+        Returns:
+            {section: user_query} when the router is "on" and confident,
+            otherwise None (use LLM decomposition)
+        """
+        if not self.enabled or not self.ready:
+            return None
+
+        section, confident = self._classify(user_query, query_embedding)
+
+        with self._lock:
+            self.stats["routed"] += 1
+            if confident:
+                self.stats["bypassed"] += 1
+            else:
+                self.stats["fallback"] += 1
+
+        if confident and self.mode == "on":
+            return {section: user_query}
+        return None
+
+    def classify(self, user_query: str, query_embedding: Optional[List[float]] = None) -> Optional[str]:
+        """
+        Best section of a query when confident, regardless of mode.
+
+        Used by the direct pipeline to boost a section; not counted in the
+        routing statistics.
+
+        Args:
+            user_query: Original user question
+            query_embedding: Optional precomputed embedding of user_query
+
+        Returns:
+            Section name, or None if not confident or centroids are not built
+        """
+        if not self.ready:
+            return None
+        section, confident = self._classify(user_query, query_embedding)
+        return section if confident else None
+
+    def _classify(self, user_query: str, query_embedding: Optional[List[float]] = None):
+        """
+        Score a query against the section centroids.
+
+        Returns:
+            (best section, whether it clears min_score and min_margin)
+        """
+        if query_embedding is None:
+            query_embedding = self.retriever.embed_query(user_query)
+
+        similarities = self.centroids @ self._normalize(query_embedding)
+        order = np.argsort(-similarities)
+        best = float(similarities[order[0]])
+        runner_up = float(similarities[order[1]]) if len(order) > 1 else -1.0
+        section = self.sections[order[0]]
+
+        confident = best >= self.min_score and (best - runner_up) >= self.min_margin
+        logger.debug(
+            f"Section router: best={section} ({best:.3f}), margin={best - runner_up:.3f}, "
+            f"confident={confident}, mode={self.mode}"
+        )
+        return section, confident
+
+    def get_stats(self) -> Dict:
+        """
+        Get routing statistics.
+
+        "bypassed" counts confident decisions; in shadow mode these are the
+        LLM calls the router would have saved.
+
+        Returns:
+            Dictionary with mode, counts and bypass rate
+        """
+        with self._lock:
+            routed = self.stats["routed"]
+            return {
+                "mode": self.mode,
+                **self.stats,
+                "bypassRate": round(self.stats["bypassed"] / routed, 4) if routed else 0.0,
+            }
+
+    @staticmethod
+    def _normalize(vector) -> np.ndarray:
+        """Return the vector as an L2-normalized float32 array."""
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
@@ -0,0 +1,183 @@
+"""
+Semantic Cache Module
+=====================
+Caches final answers keyed by query embedding, so near-duplicate
+questions ("how to pay fees in installments" / "installment fee payment
+process") are served without re-running retrieval and synthesis.
+
+Features:
+- Cosine-similarity lookup against stored query embeddings
+- LRU eviction with a bounded entry count
+- Per-entry TTL expiry
+- Whole-cache invalidation when the corpus fingerprint changes
+- Hit/miss counters
+
+Author: RAG Research Team
+Date: November 2025
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from itertools import count
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """
+    Thread-safe embedding-similarity cache for final answers.
+    """
+
+    def __init__(self, threshold: float = 0.92, max_entries: int = 512, ttl_seconds: float = 3600):
+        """
+        Initialize cache with configuration.
+
+        Args:
+            threshold: Minimum cosine similarity (0-1) to serve a cached answer
+            max_entries: Maximum number of cached answers (LRU eviction)
+            ttl_seconds: Time-to-live of a cached answer in seconds
+        """
+        logger.info(
+            f"Initializing Semantic Cache (threshold={threshold}, "
+            f"max_entries={max_entries}, ttl={ttl_seconds}s)"
+        )
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, Dict]" = OrderedDict()
+        self._keys = count()
+        self._matrix = None
+        self._matrix_keys: List[int] = []
+        self._fingerprint = None
+
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, query_embedding: List[float], fingerprint=None) -> Optional[Dict]:
+        """
+        Find the most similar cached query above the similarity threshold.
+
+        Args:
+            query_embedding: Embedding of the incoming query
+            fingerprint: Current corpus fingerprint; a change clears the cache
+
+        Returns:
+            Cached entry ({"query", "answer", "contexts", "similarity"}) or None
+        """
+        query = self._normalize(query_embedding)
+
+        with self._lock:
+            self._check_fingerprint(fingerprint)
+            self._expire()
+
+            if not self._entries:
+                self.misses += 1
+                return None
+
+            if self._matrix is None:
+                self._matrix_keys = list(self._entries.keys())
+                self._matrix = np.stack([self._entries[k]["embedding"] for k in self._matrix_keys])
+
+            similarities = self._matrix @ query
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+
+            if similarity < self.threshold:
+                self.misses += 1
+                return None
+
+            key = self._matrix_keys[best]
+            entry = self._entries[key]
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        logger.debug(f"Semantic cache hit (similarity={similarity:.3f}, cached query='{entry['query']}')")
+        return {
+            "query": entry["query"],
+            "answer": entry["answer"],
+            "contexts": list(entry["contexts"]),
+            "similarity": similarity,
+        }
+
+    def store(self, query: str, query_embedding: List[float], answer: str, contexts: List[str], fingerprint=None):
+        """
+        Cache a final answer under its query embedding.
+
+        Args:
+            query: Original query text (for logging/debugging)
+            query_embedding: Embedding of the query
+            answer: Final synthesized answer
+            contexts: Validated contexts used for the answer
+            fingerprint: Corpus fingerprint the answer was produced against
+        """
+        with self._lock:
+            self._check_fingerprint(fingerprint)
+            self._entries[next(self._keys)] = {
+                "query": query,
+                "embedding": self._normalize(query_embedding),
+                "answer": answer,
+                "contexts": list(contexts),
+                "expires_at": time.time() + self.ttl_seconds,
+            }
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._matrix = None
+
+    def invalidate(self):
+        """Drop every cached answer."""
+        with self._lock:
+            self._clear()
+        logger.info("Semantic cache invalidated")
+
+    def get_stats(self) -> Dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with size, hits, misses and hit rate
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+    def _check_fingerprint(self, fingerprint):
+        """Clear the cache when the corpus fingerprint changes (lock held)."""
+        if fingerprint is None or fingerprint == self._fingerprint:
+            return
+        if self._fingerprint is not None and self._entries:
+            logger.info("Corpus changed, clearing semantic cache")
+            self._clear()
+        self._fingerprint = fingerprint
+
+    def _expire(self):
+        """Drop expired entries (lock held)."""
+        now = time.time()
+        expired = [k for k, entry in self._entries.items() if entry["expires_at"] <= now]
+        for key in expired:
+            del self._entries[key]
+        if expired:
+            self._matrix = None
+
+    def _clear(self):
+        """Drop all entries (lock held)."""
+        self._entries.clear()
+        self._matrix = None
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        """Return the embedding as an L2-normalized float32 vector."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
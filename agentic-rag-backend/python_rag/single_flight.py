@@ -0,0 +1,131 @@
+"""
+Single-Flight Module
+====================
+Coalesces concurrent calls that share a key into one execution: the
+first caller (the leader) runs the work, callers arriving while it is
+still in flight wait for the leader's result instead of repeating it.
+
+Used for whole queries (the orchestrator) and for vector and web
+searches (the retriever), so a burst of identical questions costs one
+pipeline run.
+
+Features:
+- Thread-based callers (do) block on the leader's Future
+- asyncio callers (ado) await the leader's task on the same event loop;
+  the task is shielded, so a cancelled caller never cancels the others
+- Leader exceptions propagate to every waiting caller
+- Nothing is kept once the leader finishes (no caching)
+- Leader/coalesced counters
+
+Author: RAG Research Team
+Date: November 2025
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """
+    Registry of in-flight calls keyed by a hashable call key.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self._tasks: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], "asyncio.Task"] = {}
+        self.stats = {"leaders": 0, "coalesced": 0}
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs) -> Tuple[Any, bool]:
+        """
+        Run fn once for all concurrent callers with the same key.
+
+        Args:
+            key: Call key (identical keys share one execution)
+            fn: Function to run (as the leader)
+            *args, **kwargs: Arguments for fn
+
+        Returns:
+            (result, shared): shared is True when the result came from
+            another caller's execution
+
+        Raises:
+            Exception: Whatever fn raised (for the leader and its followers)
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = self._calls[key] = Future()
+                self.stats["leaders"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        if not is_leader:
+            return future.result(), True
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+        return result, False
+
+    async def ado(self, key: Hashable, factory: Callable[[], Awaitable]) -> Tuple[Any, bool]:
+        """
+        Async variant of do: await one task for all concurrent callers on this loop.
+
+        Args:
+            key: Call key (identical keys share one execution)
+            factory: Zero-argument callable returning the awaitable to run
+
+        Returns:
+            (result, shared), as for do
+        """
+        loop = asyncio.get_running_loop()
+        task_key = (loop, key)
+
+        with self._lock:
+            task = self._tasks.get(task_key)
+            is_leader = task is None
+            if is_leader:
+                task = self._tasks[task_key] = loop.create_task(factory())
+                task.add_done_callback(lambda _: self._forget(task_key))
+                self.stats["leaders"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        return await asyncio.shield(task), not is_leader
+
+    def _forget(self, task_key: Tuple):
+        """Drop a finished task from the registry."""
+        with self._lock:
+            self._tasks.pop(task_key, None)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of calls currently running."""
+        with self._lock:
+            return len(self._calls) + len(self._tasks)
+
+    def get_stats(self) -> Dict:
+        """
+        Get coalescing statistics.
+
+        Returns:
+            Dictionary with leader/coalesced counts, coalesce rate and in-flight calls
+        """
+        with self._lock:
+            total = self.stats["leaders"] + self.stats["coalesced"]
+            return {
+                **self.stats,
+                "coalesceRate": round(self.stats["coalesced"] / total, 4) if total else 0.0,
+                "inFlight": len(self._calls) + len(self._tasks),
+            }
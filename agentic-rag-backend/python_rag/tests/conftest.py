@@ -0,0 +1,59 @@
+"""
+Shared fixtures: an AgenticOrchestrator wired to the benchmark stand-in
+services (benchmarks.fakes) with zero latency.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Pipeline modules are imported by bare name, like the wrapper does
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.fakes import (
+    FakeAsyncMongoClient,
+    FakeAsyncOpenAI,
+    FakeAsyncTavilyClient,
+    FakeCollection,
+    FakeEmbeddingModel,
+    FakeMongoClient,
+    FakeOpenAI,
+    FakeTavilyClient,
+    build_corpus,
+)
+from llm_utils import LLMManager
+from orchestrator import AgenticOrchestrator
+from retriever import Retriever
+
+
+@pytest.fixture
+def fake_services(monkeypatch):
+    """Stand-in embedding model, collection, LLM and web clients."""
+    # Never write the shared embedding store from tests
+    monkeypatch.setattr(Retriever, "EMBEDDING_STORE_DIR", "")
+    embedding_model = FakeEmbeddingModel()
+    collection = FakeCollection(build_corpus(embedding_model, chunks_per_section=5))
+    openai_client = FakeOpenAI()
+    tavily_client = FakeTavilyClient()
+    return embedding_model, collection, openai_client, tavily_client
+
+
+@pytest.fixture
+def build_orchestrator(fake_services):
+    """Factory building an orchestrator on the stand-in services."""
+    embedding_model, collection, openai_client, tavily_client = fake_services
+
+    def build(backend: str = "atlas") -> AgenticOrchestrator:
+        retriever = Retriever(
+            db_client=FakeMongoClient(collection),
+            embedding_model=embedding_model,
+            backend=backend,
+            async_db_client=FakeAsyncMongoClient(collection),
+            web_client=tavily_client,
+            async_web_client=FakeAsyncTavilyClient(tavily_client),
+        )
+        llm_manager = LLMManager(client=openai_client, async_client=FakeAsyncOpenAI(openai_client))
+        return AgenticOrchestrator(llm_manager=llm_manager, retriever=retriever)
+
+    return build
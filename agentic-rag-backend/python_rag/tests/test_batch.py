@@ -0,0 +1,38 @@
+"""
+Batch evaluation tests (process_queries_batch).
+"""
+
+import asyncio
+
+from benchmarks.fakes import FakeOpenAI
+from llm_utils import LLMManager
+
+
+def test_repeated_batches_in_one_process(build_orchestrator):
+    orchestrator = build_orchestrator()
+    orchestrator.wait_until_warm(timeout=10)
+    queries = ["how do i apply for mahadbt scholarship", "library book issue fine"]
+
+    first = orchestrator.process_queries_batch(queries)
+    second = orchestrator.process_queries_batch(queries)
+
+    assert len(first) == len(second) == 2
+    assert all(record["answer"] for record in first + second)
+
+
+def test_lazy_async_clients_follow_the_event_loop(monkeypatch, build_orchestrator):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    manager = LLMManager(client=FakeOpenAI())
+    retriever = build_orchestrator().retriever
+    retriever._async_client = None
+    retriever.mongo_uri = "mongodb://localhost:27017"
+
+    async def clients():
+        return (manager.async_client, manager.async_client, retriever.async_collection.database.client)
+
+    first_llm, same_llm, first_db = asyncio.run(clients())
+    second_llm, _, second_db = asyncio.run(clients())
+
+    assert first_llm is same_llm
+    assert second_llm is not first_llm
+    assert second_db is not first_db
@@ -0,0 +1,43 @@
+"""
+Retriever.corpus_fingerprint tests (Atlas backend).
+"""
+
+
+def test_fingerprint_changes_when_a_chunk_is_edited(build_orchestrator, fake_services):
+    collection = fake_services[1]
+    orchestrator = build_orchestrator()
+    orchestrator.wait_until_warm(timeout=10)
+    retriever = orchestrator.retriever
+    before = retriever.refresh_fingerprint()
+
+    assert retriever.refresh_fingerprint() == before
+
+    collection.documents[0] = {**collection.documents[0], "content": "Edited chunk text."}
+
+    assert retriever.refresh_fingerprint() != before
+
+
+def test_fingerprint_changes_when_a_chunk_is_replaced(build_orchestrator, fake_services):
+    collection = fake_services[1]
+    orchestrator = build_orchestrator()
+    orchestrator.wait_until_warm(timeout=10)
+    retriever = orchestrator.retriever
+    before = retriever.refresh_fingerprint()
+
+    collection.documents[0] = {**collection.documents[1], "_id": "replacement"}
+
+    assert retriever.refresh_fingerprint() != before
+
+
+def test_lookups_read_the_cached_fingerprint(build_orchestrator, fake_services):
+    collection = fake_services[1]
+    orchestrator = build_orchestrator()
+    orchestrator.wait_until_warm(timeout=10)
+    retriever = orchestrator.retriever
+    before = retriever.refresh_fingerprint()
+
+    collection.documents[0] = {**collection.documents[0], "content": "Edited chunk text."}
+
+    assert retriever.corpus_fingerprint() == before
+    assert retriever.refresh_fingerprint() != before
+    assert retriever.corpus_fingerprint() != before
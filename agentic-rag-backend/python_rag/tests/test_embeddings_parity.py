@@ -0,0 +1,25 @@
+"""
+ONNX embedding parity test (runs only where an export and the torch model exist).
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from embeddings import check_parity
+
+
+ONNX_DIR = os.getenv("EMBEDDING_ONNX_DIR")
+MIN_COSINE = float(os.getenv("EMBEDDING_PARITY_MIN_COSINE", "0.98"))
+
+
+@pytest.mark.skipif(not ONNX_DIR or not Path(ONNX_DIR).is_dir(), reason="EMBEDDING_ONNX_DIR not set to an ONNX export")
+def test_onnx_embeddings_match_the_torch_model():
+    pytest.importorskip("sentence_transformers")
+    pytest.importorskip("onnxruntime")
+
+    result = check_parity(ONNX_DIR)
+
+    assert result["minCosine"] >= MIN_COSINE
+    assert result["rankPreserved"]
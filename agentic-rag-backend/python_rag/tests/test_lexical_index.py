@@ -0,0 +1,58 @@
+"""
+LexicalIndex sync and keyword-lookup tests.
+"""
+
+from benchmarks.fakes import FakeCollection
+from lexical_index import LexicalIndex
+
+
+def make_collection():
+    return FakeCollection([
+        {"_id": "a", "section_name": "exam_center", "content": "ATKT forms open online.", "metadata": {}, "embedding": [1.0, 0.0]},
+        {"_id": "b", "section_name": "library", "content": "Library timings are 9 to 5.", "metadata": {}, "embedding": [0.0, 1.0]},
+    ])
+
+
+def test_refresh_reindexes_edited_chunks():
+    collection = make_collection()
+    index = LexicalIndex(collection)
+    index.load()
+    version = index.version
+
+    collection.documents[0]["content"] = "Backlog forms open online."
+
+    assert index.refresh()
+    assert index.version > version
+    assert index.search("atkt") == []
+    assert [hit["_id"] for hit in index.search("backlog")] == ["a"]
+    assert not index.refresh()
+
+
+def test_refresh_drops_removed_chunks():
+    collection = make_collection()
+    index = LexicalIndex(collection)
+    index.load()
+
+    del collection.documents[1]
+
+    assert index.refresh()
+    assert index.size == 1
+    assert index.search("library") == []
+
+
+def test_keyword_query_needs_an_acronym():
+    index = LexicalIndex()
+    index.add_documents([
+        {"_id": "a", "section_name": "exam_center", "content": "ATKT forms for the principal's office."},
+        {"_id": "b", "section_name": "library", "content": "Library timings are posted by the principal."},
+        {"_id": "c", "section_name": "scholarship", "content": "MahaDBT freeship renewal."},
+    ])
+
+    assert index.is_keyword_query("ATKT forms")
+    assert index.is_keyword_query("MahaDBT freeship")
+    assert not index.is_keyword_query("library timings")
+    assert not index.is_keyword_query("who is principal")
+    assert not index.is_keyword_query("LIBRARY TIMINGS")
+    assert not index.is_keyword_query("atkt forms")
+    assert index.is_keyword_query("atkt forms", min_idf=0.9)
+    assert not index.is_keyword_query("ATKT forms and hostel fees")
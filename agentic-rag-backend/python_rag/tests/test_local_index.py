@@ -0,0 +1,58 @@
+"""
+LocalVectorIndex sync tests.
+"""
+
+from benchmarks.fakes import FakeCollection
+from local_index import LocalVectorIndex
+
+
+def make_collection():
+    return FakeCollection([
+        {"_id": "a", "section_name": "library", "content": "Library opens at 9.", "metadata": {}, "embedding": [1.0, 0.0]},
+        {"_id": "b", "section_name": "library", "content": "Two books per card.", "metadata": {}, "embedding": [0.0, 1.0]},
+    ])
+
+
+def test_refresh_without_changes_keeps_version():
+    collection = make_collection()
+    index = LocalVectorIndex(collection)
+    index.load()
+    version = index.version
+
+    assert not index.refresh()
+    assert index.version == version
+
+
+def test_refresh_picks_up_edited_content_and_embedding():
+    collection = make_collection()
+    index = LocalVectorIndex(collection)
+    index.load()
+    version = index.version
+
+    collection.documents[0]["content"] = "Library opens at 8."
+    collection.documents[1]["embedding"] = [1.0, 0.0]
+
+    assert index.refresh()
+    assert index.version > version
+    assert {doc["content"] for doc in index.documents()} == {"Library opens at 8.", "Two books per card."}
+    top = index.search([0.0, 1.0], top_k=2)
+    assert all(result["score"] < 0.75 for result in top)
+
+
+def test_refresh_uses_updated_at_when_present():
+    collection = make_collection()
+    for doc in collection.documents:
+        doc["updatedAt"] = 1
+    index = LocalVectorIndex(collection)
+    index.load()
+
+    collection.documents.append(
+        {"_id": "c", "section_name": "library", "content": "Reading hall.", "metadata": {}, "embedding": [0.5, 0.5], "updatedAt": 1}
+    )
+    collection.documents[0]["content"] = "Library opens at 8."
+    collection.documents[0]["updatedAt"] = 2
+    del collection.documents[1]
+
+    assert index.refresh()
+    assert sorted(doc["content"] for doc in index.documents()) == ["Library opens at 8.", "Reading hall."]
+    assert not index.refresh()
@@ -0,0 +1,68 @@
+"""
+Retrieval deadline and shared executor tests.
+"""
+
+import asyncio
+import time
+
+from bounded_executor import BoundedExecutor
+
+
+LOW_SCORE_RESULTS = [{"content": "x", "score": 0.1}]
+
+
+def test_web_wait_stops_at_the_request_deadline(build_orchestrator):
+    orchestrator = build_orchestrator()
+    orchestrator.retriever.web_search = lambda query, section: time.sleep(1.0) or []
+
+    started = time.perf_counter()
+    results = orchestrator._finish_web_search(
+        "scholarship", "scholarship help", LOW_SCORE_RESULTS, deadline=time.perf_counter() + 0.1
+    )
+
+    assert results == []
+    assert time.perf_counter() - started < 0.5
+    assert orchestrator.deadline_stats["late"] == 1
+    assert orchestrator._web_executor.get_stats()["abandoned"] == 1
+
+
+def test_web_wait_returns_results_before_the_deadline(build_orchestrator):
+    orchestrator = build_orchestrator()
+    orchestrator.retriever.web_search = lambda query, section: [{"content": "notice"}]
+
+    results = orchestrator._finish_web_search(
+        "scholarship", "scholarship help", LOW_SCORE_RESULTS, deadline=time.perf_counter() + 5
+    )
+
+    assert results == [{"content": "notice"}]
+
+
+def test_speculation_runs_on_a_bounded_executor(build_orchestrator):
+    orchestrator = build_orchestrator()
+
+    assert isinstance(orchestrator._speculation_executor, BoundedExecutor)
+    assert orchestrator._speculation_executor.max_queue == orchestrator.SPECULATIVE_QUEUE_LIMIT
+    assert "speculative" in orchestrator.get_stats()["executors"]
+
+
+def test_async_fallback_waits_stop_at_the_section_timeout(build_orchestrator):
+    orchestrator = build_orchestrator()
+    orchestrator.SECTION_TIMEOUT = 0.1
+
+    async def hanging_search(**kwargs):
+        await asyncio.sleep(5)
+
+    orchestrator.retriever.avector_search = hanging_search
+
+    async def run():
+        fallback = await orchestrator._afallback_retrieval("hostel fees")
+        speculative = asyncio.ensure_future(hanging_search())
+        return fallback, await orchestrator._aretrieve_subqueries("hostel fees", {}, speculative=speculative)
+
+    started = time.perf_counter()
+    fallback, (validated, failure_message) = asyncio.run(run())
+
+    assert fallback == {}
+    assert validated == {}
+    assert failure_message == orchestrator.NO_RESULTS_MESSAGE
+    assert time.perf_counter() - started < 1.0
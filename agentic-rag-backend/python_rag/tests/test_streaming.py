@@ -0,0 +1,36 @@
+"""
+Streaming pipeline tests (process_query_stream).
+"""
+
+import pytest
+
+
+@pytest.mark.parametrize("deltas", [
+    ["OUT_OF", "_DOMAIN"],
+    ["OUT_OF", "_DOMAIN", "."],
+    ["**OUT_OF_DOMAIN", ".**"],
+])
+def test_direct_stream_withholds_out_of_domain_marker(build_orchestrator, deltas):
+    orchestrator = build_orchestrator()
+    orchestrator.wait_until_warm(timeout=10)
+    orchestrator.llm_manager.synthesize_answer_stream = lambda **kwargs: iter(deltas)
+
+    events = list(orchestrator.process_query_stream("how do i apply for mahadbt scholarship", mode="direct"))
+
+    assert [event["event"] for event in events] == ["final"]
+    assert events[0]["answer"] == orchestrator.NO_RESULTS_MESSAGE
+    assert events[0]["contexts"] == []
+    assert orchestrator.semantic_cache.get_stats()["size"] == 0
+
+
+def test_direct_stream_releases_regular_answer(build_orchestrator):
+    orchestrator = build_orchestrator()
+    orchestrator.wait_until_warm(timeout=10)
+    orchestrator.llm_manager.synthesize_answer_stream = lambda **kwargs: iter(["Apply on ", "the MahaDBT portal."])
+
+    events = list(orchestrator.process_query_stream("how do i apply for mahadbt scholarship", mode="direct"))
+
+    assert [event["event"] for event in events] == ["contexts", "chunk", "chunk", "final"]
+    assert events[-1]["answer"] == "Apply on the MahaDBT portal."
+    assert events[-1]["contexts"]
+    assert orchestrator.semantic_cache.get_stats()["size"] == 1
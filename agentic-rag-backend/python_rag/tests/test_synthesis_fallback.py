@@ -0,0 +1,42 @@
+"""
+Synthesis failure tests: the raw-chunk fallback is returned but never cached.
+"""
+
+import asyncio
+
+
+QUERY = "how do i apply for mahadbt scholarship"
+
+
+def _raise(**kwargs):
+    raise RuntimeError("LLM unavailable")
+
+
+async def _araise(**kwargs):
+    raise RuntimeError("LLM unavailable")
+
+
+def test_failed_synthesis_is_not_cached(build_orchestrator):
+    orchestrator = build_orchestrator()
+    orchestrator.wait_until_warm(timeout=10)
+    orchestrator.llm_manager.synthesize_answer = _raise
+
+    answer = orchestrator.process_query(QUERY, mode="direct")
+    answer_with_contexts, contexts = orchestrator.process_query_with_contexts(QUERY, mode="direct")
+
+    assert answer == answer_with_contexts
+    assert answer not in (orchestrator.ERROR_MESSAGE, orchestrator.NO_RESULTS_MESSAGE)
+    assert contexts
+    assert orchestrator.semantic_cache.get_stats()["size"] == 0
+
+
+def test_failed_async_synthesis_is_not_cached(build_orchestrator):
+    orchestrator = build_orchestrator()
+    orchestrator.wait_until_warm(timeout=10)
+    orchestrator.llm_manager.asynthesize_answer = _araise
+
+    answer, contexts = asyncio.run(orchestrator.aprocess_query_with_contexts(QUERY, mode="direct"))
+
+    assert answer not in (orchestrator.ERROR_MESSAGE, orchestrator.NO_RESULTS_MESSAGE)
+    assert contexts
+    assert orchestrator.semantic_cache.get_stats()["size"] == 0
@@ -0,0 +1,63 @@
+"""
+Web search gate tests (_web_gate and the time-sensitive query cues).
+"""
+
+import pytest
+
+from lexical_index import LexicalIndex
+from orchestrator import AgenticOrchestrator
+
+
+SCHOLARSHIP_CHUNKS = [
+    {"_id": "s1", "section_name": "scholarship", "content": "Apply for the MahaDBT freeship before the portal closes."},
+    {"_id": "s2", "section_name": "scholarship", "content": "Scholarship renewal needs the previous year's income certificate."},
+    {"_id": "l1", "section_name": "library", "content": "The central library issues two books per student card."},
+    {"_id": "l2", "section_name": "library", "content": "Reading hall timings are posted at the library desk."},
+]
+
+
+@pytest.mark.parametrize("query", [
+    "is 7.5 CGPA required for placement",
+    "when are exam results declared",
+    "what is the exam schedule",
+    "can i march in the sports day parade",
+])
+def test_static_questions_are_not_time_sensitive(query):
+    assert not AgenticOrchestrator._is_time_sensitive(query)
+
+
+@pytest.mark.parametrize("query", [
+    "last date for scholarship form",
+    "is the portal open on 15/07/2025",
+    "exam form due on 5th march",
+    "scholarship window opens march 10",
+    "fee structure for 2025",
+])
+def test_dated_questions_are_time_sensitive(query):
+    assert AgenticOrchestrator._is_time_sensitive(query)
+
+
+def test_hybrid_keyword_lookup_skips_web_search(build_orchestrator, fake_services):
+    tavily_client = fake_services[3]
+    orchestrator = build_orchestrator()
+    orchestrator.wait_until_warm(timeout=10)
+    index = LexicalIndex()
+    index.add_documents(SCHOLARSHIP_CHUNKS)
+    orchestrator.retriever.lexical_index = index
+
+    results = orchestrator._retrieve_for_section("scholarship", "MahaDBT freeship")
+
+    assert [result["content"] for result in results] == [SCHOLARSHIP_CHUNKS[0]["content"]]
+    assert results[0]["vector_score"] is None
+    assert orchestrator.web_gate_stats["skipped"] == 1
+    assert tavily_client.calls == 0
+
+
+def test_low_vector_score_still_searches_web(build_orchestrator):
+    orchestrator = build_orchestrator()
+    orchestrator.wait_until_warm(timeout=10)
+
+    needed = orchestrator._web_gate("scholarship", "scholarship help", [{"content": "x", "score": 0.1}])
+
+    assert needed
+    assert orchestrator.web_gate_stats["searched"] == 1
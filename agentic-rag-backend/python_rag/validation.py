@@ -8,6 +8,8 @@ Features:
 - Error detection (primary filter)
 - Lightweight relevance checking (secondary filter)
 - Quality filtering
+- Single-pass, whole-word keyword matching over one compiled phrase table
+- Batch validation of a whole section -> results mapping
 
 Author: RAG Research Team
 Date: November 2025
@@ -15,7 +17,7 @@ Date: November 2025
 
 import logging
 import re
-from typing import Dict
+from typing import Dict, FrozenSet, List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -119,7 +121,7 @@ class ResultValidator:
         "web opac", "opac", "knimbus", "j-gate", "delnet",
         "digital library", "question papers", "syllabus",
     ],
-    "studentportal_erp": [
+    "studentportalerp": [
         "nmvpmerp", "student portal", "application id", "prn",
         "login", "forgot password", "change password",
         "attendance", "timetable", "internal marks",
@@ -128,6 +130,8 @@ class ResultValidator:
     ],
     }
 
+    # Word tokens used for whole-word keyword matching
+    _TOKEN_PATTERN = re.compile(r"\w+")
     
     def __init__(self, relevance_threshold: float = 0.1):
         """
@@ -138,6 +142,73 @@ class ResultValidator:
         """
         logger.info(f"Initializing Result Validator (threshold={relevance_threshold})")
         self.relevance_threshold = relevance_threshold
+        
+        self._error_keywords = frozenset(self.ERROR_INDICATORS)
+        self._campus_keywords = frozenset(self.CAMPUS_KEYWORDS)
+        self._section_keywords = {
+            section: frozenset(keywords) for section, keywords in self.SECTION_KEYWORDS.items()
+        }
+        self._compile_matcher()
+    
+    def _compile_matcher(self):
+        """
+        Compile every keyword list into one word-level phrase table.
+        
+        Keywords are stored as word-token phrases, so matching is whole-word
+        ("fe" no longer fires inside "feature") and a single scan of the
+        content's tokens finds error, campus and section keywords together.
+        A prefix table stops each scan as soon as no longer phrase can match.
+        Keywords longer than three letters also match a plural "s"/"es".
+        """
+        keywords = set(self.ERROR_INDICATORS) | set(self.CAMPUS_KEYWORDS)
+        for section_keywords in self.SECTION_KEYWORDS.values():
+            keywords.update(section_keywords)
+        
+        # Phrase ("exam form") -> keywords it spells
+        phrases: Dict[str, set] = {}
+        for keyword in keywords:
+            words = self._TOKEN_PATTERN.findall(keyword)
+            forms = [words]
+            if len(keyword) > 3 and keyword[-1].isalpha():
+                forms += [words[:-1] + [words[-1] + "s"], words[:-1] + [words[-1] + "es"]]
+            for form in forms:
+                phrases.setdefault(" ".join(form), set()).add(keyword)
+        
+        self._phrases: Dict[str, FrozenSet[str]] = {
+            phrase: frozenset(hits) for phrase, hits in phrases.items()
+        }
+        self._prefixes = {
+            " ".join(phrase.split()[:n])
+            for phrase in phrases
+            for n in range(1, len(phrase.split()))
+        }
+        self._max_words = max(len(phrase.split()) for phrase in phrases)
+    
+    def match_keywords(self, content: str) -> FrozenSet[str]:
+        """
+        Find every known keyword in content in a single token pass.
+        
+        Args:
+            content: Text to scan (any case)
+            
+        Returns:
+            Set of matched keywords (error, campus and section keywords alike)
+        """
+        tokens = self._TOKEN_PATTERN.findall(content.lower())
+        phrases, prefixes = self._phrases, self._prefixes
+        matched = set()
+        
+        for i, token in enumerate(tokens):
+            phrase = token
+            for n in range(1, self._max_words + 1):
+                hits = phrases.get(phrase)
+                if hits:
+                    matched.update(hits)
+                if phrase not in prefixes or i + n >= len(tokens):
+                    break
+                phrase = f"{phrase} {tokens[i + n]}"
+        
+        return frozenset(matched)
     
     def contains_error(self, result: Dict) -> bool:
         """
@@ -149,21 +220,23 @@ class ResultValidator:
         Returns:
             True if error detected, False otherwise
         """
-        content = result.get('content', result.get('text', '')).lower()
+        content = result.get('content', result.get('text', ''))
         
         if not content:
             logger.debug("Empty content, marking as error")
             return True
         
-        # Check for error indicators
-        for error_phrase in self.ERROR_INDICATORS:
-            if error_phrase in content:
-                logger.debug(f"Error detected: '{error_phrase}'")
-                return True
-        
+        return self._has_error(self.match_keywords(content))
+    
+    def _has_error(self, matched: FrozenSet[str]) -> bool:
+        """Check matched keywords for error indicators."""
+        errors = matched & self._error_keywords
+        if errors:
+            logger.debug(f"Error detected: {sorted(errors)}")
+            return True
         return False
     
-    def score_relevance(self, result: Dict) -> Dict:
+    def score_relevance(self, result: Dict, matched: Optional[FrozenSet[str]] = None, section_name: Optional[str] = None) -> Dict:
         """
         Compute global and section-specific relevance signals for a result.
 
@@ -172,8 +245,14 @@ class ResultValidator:
         - global_score / section_score: ratios (for logging/debugging only)
         - matched_global / matched_section: the actual keywords hit
         - section_name: from result (if any)
+        
+        Args:
+            result: Result dictionary with 'content' field
+            matched: Optional precomputed match_keywords(content)
+            section_name: Optional section override (defaults to the result's)
         """
-        content = result.get("content", result.get("text", "")).lower()
+        content = result.get("content", result.get("text", ""))
+        section_name = section_name or result.get("section_name") or result.get("section")
         if not content or len(content) < 20:
             return {
                 "global_hits": 0,
@@ -182,25 +261,27 @@ class ResultValidator:
                 "section_score": 0.0,
                 "matched_global": [],
                 "matched_section": [],
-                "section_name": result.get("section_name"),
+                "section_name": section_name,
             }
 
+        if matched is None:
+            matched = self.match_keywords(content)
+
         # Global campus keyword hits
-        matched_global = [kw for kw in self.CAMPUS_KEYWORDS if kw in content]
+        matched_global = [kw for kw in self.CAMPUS_KEYWORDS if kw in matched]
         global_hits = len(matched_global)
         global_score = (
             global_hits / len(self.CAMPUS_KEYWORDS) if self.CAMPUS_KEYWORDS else 0.0
         )
 
         # Section-specific hits
-        section_name = result.get("section_name")
         matched_section = []
         section_hits = 0
         section_score = 0.0
 
-        if section_name and section_name in SECTION_KEYWORDS:
-            section_kw = SECTION_KEYWORDS[section_name]
-            matched_section = [kw for kw in section_kw if kw in content]
+        if section_name and section_name in self.SECTION_KEYWORDS:
+            section_kw = self.SECTION_KEYWORDS[section_name]
+            matched_section = [kw for kw in section_kw if kw in matched]
             section_hits = len(matched_section)
             section_score = section_hits / len(section_kw) if section_kw else 0.0
 
@@ -215,14 +296,14 @@ class ResultValidator:
         }
 
     
-    def is_relevant(self, result: Dict) -> bool:
+    def is_relevant(self, result: Dict, matched: Optional[FrozenSet[str]] = None, section_name: Optional[str] = None) -> bool:
         """
         Lightweight relevance check (secondary filter).
 
         Uses hit counts for robustness (not sensitive to keyword list length),
         with ratios only for logging/debugging.
         """
-        scores = self.score_relevance(result)
+        scores = self.score_relevance(result, matched, section_name)
 
         g_hits = scores["global_hits"]
         s_hits = scores["section_hits"]
@@ -254,5 +335,45 @@ class ResultValidator:
 
         return is_relevant
 
+    def validate_batch(self, section_results: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
+        """
+        Validate every result of a section -> results mapping.
+
+        Each chunk is scanned once; error detection and global/section
+        relevance are all derived from that single keyword pass. The dict
+        key is used as the section for section-specific keywords.
+
+        Args:
+            section_results: Raw results per section
+
+        Returns:
+            Results that passed both filters (sections left empty are dropped)
+        """
+        validated = {}
+
+        for section, results in section_results.items():
+            kept = []
+
+            for result in results:
+                content = result.get('content', result.get('text', ''))
+                if not content:
+                    logger.debug(f"Filtered out empty result from '{section}'")
+                    continue
+
+                matched = self.match_keywords(content)
+
+                # Error detection
+                if self._has_error(matched):
+                    logger.debug(f"Filtered out error result from '{section}'")
+                    continue
+
+                # Basic relevance check
+                if self.is_relevant(result, matched, section):
+                    kept.append(result)
+                else:
+                    logger.debug(f"Filtered out low-relevance result from '{section}'")
 
+            if kept:
+                validated[section] = kept
 
+        return validated
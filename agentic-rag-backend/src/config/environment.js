@@ -61,6 +61,22 @@ class Environment {
     return process.env.PYTHON_PATH || 'python3';
   }
 
+  get pythonConcurrency() {
+    return parseInt(process.env.PYTHON_CONCURRENCY || '4', 10);
+  }
+
+  get pythonAsyncLoop() {
+    return process.env.PYTHON_ASYNC_LOOP === 'true';
+  }
+
+  get pythonPrefork() {
+    return parseInt(process.env.PYTHON_PREFORK || '0', 10);
+  }
+
+  get pythonHardTimeout() {
+    return parseInt(process.env.PYTHON_HARD_TIMEOUT_MS || '90000', 10);
+  }
+
   // API Keys
   get gptApiKey() {
     return process.env.GPT_API_KEY;
@@ -182,6 +198,10 @@ class Environment {
       },
       python: {
         path: this.pythonPath,
+        concurrency: this.pythonConcurrency,
+        asyncLoop: this.pythonAsyncLoop,
+        prefork: this.pythonPrefork,
+        hardTimeoutMs: this.pythonHardTimeout,
       },
       cache: {
         ttl: this.cacheTtl,
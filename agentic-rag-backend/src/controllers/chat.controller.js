@@ -15,7 +15,7 @@ import User from '../models/user.model.js';
  */
 class ChatController {
     processChat = asyncHandler(async (req, res) => {
-        const { query, conversationId } = req.body;
+        const { query, conversationId, mode } = req.body;
         const userId = req.userId; // Provided by authenticateJWT
 
         logger.info('Processing chat request', {
@@ -140,6 +140,7 @@ class ChatController {
             userId: userId.toString(),
             sessionId: conversation._id.toString(),
             conversationHistory,
+            mode,
         });
 
         // 4. Wait for job completion
@@ -164,6 +165,7 @@ class ChatController {
                 responseTime: result.elapsed,
                 sources: result.contexts,
                 cached: result.cached,
+                pipelineMode: result.pipelineMode,
             },
         });
 
@@ -188,7 +190,9 @@ class ChatController {
                 model_used: 'agentic-rag', // or from result if available
                 metadata: {
                     jobId: job.id,
-                    cached: result.cached
+                    cached: result.cached,
+                    pipelineMode: result.pipelineMode,
+                    webGate: result.webGate
                 }
             });
         } catch (logError) {
@@ -272,6 +276,8 @@ class ChatController {
             tokens_used: user ? (settings.rateLimit.type === 'requests' ? user.usage.dailyQueries : user.usage.dailyTokens) : 0,
             total_tokens: settings.rateLimit.enabled ? ((user && user.role === 'admin') ? 10000 : (settings.rateLimit.type === 'requests' ? (settings.rateLimit.requestLimit + 1) : settings.rateLimit.tokenLimit)) : 5000,
             session_exhausted: isSessionExhausted,
+            pipelineMode: result.pipelineMode,
+            webGate: result.webGate,
         };
 
         logger.info('Sending response with token data', {
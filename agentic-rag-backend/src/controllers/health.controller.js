@@ -34,19 +34,24 @@ class HealthController {
 
         // Check Python health (optional, can be slow)
         let pythonHealth = { status: 'unknown' };
-        try {
-            const isPythonHealthy = await Promise.race([
-                pythonBridge.healthCheck(),
-                new Promise((resolve) => setTimeout(() => resolve(false), 5000)),
-            ]);
-            pythonHealth = {
-                status: isPythonHealthy ? 'healthy' : 'unhealthy',
-            };
-        } catch (error) {
-            pythonHealth = {
-                status: 'error',
-                error: error.message,
-            };
+        if (pythonBridge.pythonState !== 'ready') {
+            // Still starting/warming up: report it instead of queueing a test query
+            pythonHealth = { status: pythonBridge.pythonState };
+        } else {
+            try {
+                const isPythonHealthy = await Promise.race([
+                    pythonBridge.healthCheck(),
+                    new Promise((resolve) => setTimeout(() => resolve(false), 5000)),
+                ]);
+                pythonHealth = {
+                    status: isPythonHealthy ? 'healthy' : 'unhealthy',
+                };
+            } catch (error) {
+                pythonHealth = {
+                    status: 'error',
+                    error: error.message,
+                };
+            }
         }
 
         // Determine overall health
@@ -108,10 +113,11 @@ class HealthController {
      * GET /api/stats
      */
     getSystemStats = asyncHandler(async (req, res) => {
-        const [queueStats, cacheStats, pythonStats] = await Promise.all([
+        const [queueStats, cacheStats, pythonStats, pipelineStats] = await Promise.all([
             queueService.getQueueStats(),
             Promise.resolve(cacheService.getStats()),
             Promise.resolve(pythonBridge.getStats()),
+            pythonBridge.getPipelineStats(),
         ]);
 
         const memoryUsage = process.memoryUsage();
@@ -129,7 +135,10 @@ class HealthController {
             },
             queue: queueStats,
             cache: cacheStats,
-            python: pythonStats,
+            python: {
+                ...pythonStats,
+                pipeline: pipelineStats,
+            },
         };
 
         res.json(successResponse(stats, 'System statistics retrieved'));
@@ -29,6 +29,10 @@ export const validateChatRequest = [
         .isString().withMessage('Session ID must be a string')
         .trim()
         .isLength({ max: 100 }).withMessage('Session ID too long'),
+
+    body('mode')
+        .optional()
+        .isIn(['agentic', 'direct', 'auto']).withMessage('Mode must be one of agentic, direct, auto'),
 ];
 
 /**
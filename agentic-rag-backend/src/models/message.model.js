@@ -31,6 +31,7 @@ const messageSchema = new mongoose.Schema(
             responseTime: Number,
             sources: [String],
             cached: Boolean,
+            pipelineMode: String,
         },
     },
     {
@@ -17,6 +17,15 @@ const __dirname = dirname(__filename);
  * - Error parsing and reporting
  * - Performance tracking
  * - Health monitoring
+ * - Multiplexed requests: several queries are in flight on the persistent
+ *   process at once, each tagged with an id so out-of-order responses are
+ *   routed back to the right caller
+ * - Hang recovery: a timed-out request keeps its slot until Python answers;
+ *   one still unanswered after the hard timeout restarts the process
+ * - Optional streaming: partial frames (contexts, answer chunks) are
+ *   forwarded to an onPartial callback before the final response
+ * - Pipeline metrics: a "stats" command returns the process's per-stage
+ *   latency histograms and cache hit rates
  */
 class PythonBridge {
     constructor(options = {}) {
@@ -24,12 +33,22 @@ class PythonBridge {
         this.scriptPath = join(__dirname, '../../../python_rag');
         this.scriptName = 'orchestrator_wrapper.py';
         this.timeout = options.timeout || 30000; // 30 seconds
+        // Unanswered this long after dispatch, a request counts as hung
+        this.hardTimeout = options.hardTimeout || env.pythonHardTimeout;
         this.maxRetries = options.maxRetries || 1;
+        this.maxInFlight = options.maxInFlight || env.pythonConcurrency;
+        this.asyncLoop = options.asyncLoop ?? env.pythonAsyncLoop;
+        this.prefork = options.prefork ?? env.pythonPrefork;
 
         this.shell = null;
         this.requestQueue = [];
-        this.isProcessing = false;
+        this.pendingRequests = new Map();
+        this.pendingCommands = new Map();
+        this.nextRequestId = 1;
         this.isReady = false;
+        // 'starting' -> 'warming' (accepting queries) -> 'ready' (models and connections warm)
+        this.pythonState = 'starting';
+        this.startupReport = null;
 
         // Track execution statistics
         this.stats = {
@@ -50,9 +69,15 @@ class PythonBridge {
      * @param {String} query - User query
      * @param {String} userId - User identifier
      * @param {Array} conversationHistory - Recent messages for context
+     * @param {Object} options - Optional settings
+     * @param {Function} options.onPartial - Receives streamed frames
+     *   ({ event: 'contexts', contexts } / { event: 'chunk', text }) before the final response
+     * @param {String} options.mode - Pipeline mode ('agentic', 'direct' or 'auto');
+     *   defaults to the process's PIPELINE_MODE. The mode that ran is reported
+     *   in metadata.pipelineMode
      * @returns {Promise<Object>} Response with answer, contexts, and metadata
      */
-    async executeQuery(query, userId = 'anonymous', conversationHistory = []) {
+    async executeQuery(query, userId = 'anonymous', conversationHistory = [], options = {}) {
         // Validation
         if (!query || typeof query !== 'string' || !query.trim()) {
             throw new ValidationError('Query must be a non-empty string');
@@ -63,10 +88,13 @@ class PythonBridge {
         }
 
         const startTime = Date.now();
+        const { onPartial = null, mode = null } = options;
+        // A retried stream would replay chunks the caller already forwarded
+        const maxRetries = onPartial ? 0 : this.maxRetries;
         let attempt = 0;
         let lastError = null;
 
-        while (attempt <= this.maxRetries) {
+        while (attempt <= maxRetries) {
             try {
                 attempt++;
 
@@ -75,9 +103,11 @@ class PythonBridge {
                     queryLength: query.length,
                     userId,
                     historyLength: conversationHistory.length,
+                    streaming: Boolean(onPartial),
+                    mode,
                 });
 
-                const result = await this._executePython(query, userId, conversationHistory);
+                const result = await this._executePython(query, userId, conversationHistory, onPartial, mode);
 
                 const elapsed = Date.now() - startTime;
 
@@ -95,8 +125,8 @@ class PythonBridge {
             } catch (error) {
                 lastError = error;
 
-                if (attempt <= this.maxRetries) {
-                    logger.warn(`Python execution failed, retrying (${attempt}/${this.maxRetries})`, {
+                if (attempt <= maxRetries) {
+                    logger.warn(`Python execution failed, retrying (${attempt}/${maxRetries})`, {
                         error: error.message,
                     });
 
@@ -134,124 +164,242 @@ class PythonBridge {
             } catch (e) { /* ignore */ }
         }
 
+        const args = ['--interactive', '--workers', String(this.maxInFlight)];
+        if (this.prefork > 0) {
+            args.push('--prefork', String(this.prefork));
+        } else if (this.asyncLoop) {
+            args.push('--async-loop');
+        }
+
         const options = {
             mode: 'text',
             pythonPath: this.pythonPath,
             pythonOptions: ['-u'], // Unbuffered output
             scriptPath: this.scriptPath,
-            args: ['--interactive'],
+            args,
         };
 
         logger.info('Initializing Python RAG process...');
-        this.shell = new PythonShell(this.scriptName, options);
+        const shell = new PythonShell(this.scriptName, options);
+        this.shell = shell;
         this.isReady = false;
+        this.pythonState = 'starting';
+        this.startupReport = null;
+
+        shell.on('message', (message) => {
+            // Ignore output of a process that was already replaced
+            if (this.shell !== shell) {
+                return;
+            }
 
-        this.shell.on('message', (message) => {
             try {
                 const data = JSON.parse(message);
 
                 // Check for initial ready message
                 if (!this.isReady && data.success && data.message === 'Ready') {
                     this.isReady = true;
-                    logger.info('Python RAG process ready');
+                    this.pythonState = data.state || 'ready';
+                    this.startupReport = data.startup || null;
+                    logger.info('Python RAG process ready', { state: this.pythonState, startup: data.startup });
                     this._processQueue();
                     return;
                 }
 
-                // Handle response for current request
-                const currentRequest = this.currentRequest;
-                if (currentRequest) {
-                    this.currentRequest = null;
-                    this.isProcessing = false;
+                // Background warm-up finished (id-less state event)
+                if (data.event === 'state') {
+                    this.pythonState = data.state;
+                    this.startupReport = data.startup || this.startupReport;
+                    logger.info('Python RAG process state changed', { state: data.state, startup: data.startup });
+                    return;
+                }
 
+                // Control command answers are not part of the query slots
+                const command = this.pendingCommands.get(data.id);
+                if (command) {
+                    this.pendingCommands.delete(data.id);
+                    clearTimeout(command.timeoutId);
                     if (data.success) {
-                        currentRequest.resolve(data);
+                        command.resolve(data);
                     } else {
-                        currentRequest.reject(new PythonExecutionError(
+                        command.reject(new PythonExecutionError(
                             data.error?.message || 'Unknown Python error',
                             data.error
                         ));
                     }
+                    return;
+                }
+
+                // Route response to the request it answers
+                const request = this.pendingRequests.get(data.id);
+                if (!request) {
+                    logger.warn('Python response for unknown or expired request', { id: data.id });
+                    return;
+                }
+
+                // Streamed partial frame: forward and keep the request pending
+                if (data.partial) {
+                    if (request.onPartial && !request.timedOut) {
+                        try {
+                            request.onPartial(data);
+                        } catch (err) {
+                            logger.error('onPartial callback failed', { error: err.message });
+                        }
+                    }
+                    return;
+                }
 
-                    // Process next in queue
-                    setImmediate(() => this._processQueue());
+                this.pendingRequests.delete(data.id);
+                clearTimeout(request.timeoutId);
+                clearTimeout(request.hardTimeoutId);
+
+                if (request.timedOut) {
+                    // The caller already got a timeout; this only frees the slot
+                    logger.info('Late Python response released its slot', { id: data.id });
+                } else if (data.success) {
+                    request.resolve(data);
+                } else {
+                    request.reject(new PythonExecutionError(
+                        data.error?.message || 'Unknown Python error',
+                        data.error
+                    ));
                 }
+
+                // Fill the freed slot
+                setImmediate(() => this._processQueue());
             } catch (err) {
                 logger.error('Error parsing Python output:', { error: err.message, output: message });
             }
         });
 
-        this.shell.on('stderr', (stderr) => {
+        shell.on('stderr', (stderr) => {
             // Log stderr but don't treat as fatal unless process exits
             logger.warn('Python stderr:', { output: stderr });
         });
 
-        this.shell.on('error', (err) => {
+        shell.on('error', (err) => {
+            if (this.shell !== shell) {
+                return;
+            }
             logger.error('Python process error:', err);
             this._handleProcessDeath();
         });
 
-        this.shell.on('close', () => {
+        shell.on('close', () => {
+            if (this.shell !== shell) {
+                return;
+            }
             logger.warn('Python process closed unexpectedly');
             this._handleProcessDeath();
         });
     }
 
+    /**
+     * Kill a hung process and start a fresh one
+     * @private
+     * @param {String} reason - Why the process is restarted
+     */
+    _restartProcess(reason) {
+        const shell = this.shell;
+        logger.error('Restarting Python RAG process', {
+            reason,
+            inFlight: this.pendingRequests.size,
+            queued: this.requestQueue.length,
+        });
+
+        // Detach first so the killed process's close event is ignored
+        this._handleProcessDeath('Python process restarted');
+        if (shell) {
+            try {
+                shell.kill();
+            } catch (e) { /* ignore */ }
+        }
+    }
+
     /**
      * Handle process crash/exit
      * @private
      */
-    _handleProcessDeath() {
+    _handleProcessDeath(message = 'Python process crashed') {
         this.isReady = false;
-        this.isProcessing = false;
+        this.pythonState = 'starting';
         this.shell = null;
 
-        // Reject current request if any
-        if (this.currentRequest) {
-            this.currentRequest.reject(new PythonExecutionError('Python process crashed'));
-            this.currentRequest = null;
+        // Reject every in-flight request (timed-out ones were already rejected)
+        for (const request of this.pendingRequests.values()) {
+            clearTimeout(request.timeoutId);
+            clearTimeout(request.hardTimeoutId);
+            if (!request.timedOut) {
+                request.reject(new PythonExecutionError(message));
+            }
+        }
+        this.pendingRequests.clear();
+
+        for (const command of this.pendingCommands.values()) {
+            clearTimeout(command.timeoutId);
+            command.reject(new PythonExecutionError(message));
         }
+        this.pendingCommands.clear();
 
         // Restart process after delay
         setTimeout(() => this._initShell(), 1000);
     }
 
     /**
-     * Process the next request in the queue
+     * Dispatch queued requests until the in-flight limit is reached
      * @private
      */
     _processQueue() {
-        if (!this.isReady || this.isProcessing || this.requestQueue.length === 0) {
-            return;
+        while (
+            this.isReady &&
+            this.pendingRequests.size < this.maxInFlight &&
+            this.requestQueue.length > 0
+        ) {
+            this._dispatch(this.requestQueue.shift());
         }
+    }
 
-        const request = this.requestQueue.shift();
-        this.currentRequest = request;
-        this.isProcessing = true;
+    /**
+     * Send a single request to the Python process
+     * @private
+     * @param {Object} request - Queued request
+     */
+    _dispatch(request) {
+        const id = this.nextRequestId++;
+        this.pendingRequests.set(id, request);
 
         const payload = JSON.stringify({
+            id,
             query: request.query,
             userId: request.userId,
-            conversationHistory: request.conversationHistory || []
+            conversationHistory: request.conversationHistory || [],
+            stream: Boolean(request.onPartial),
+            ...(request.mode ? { mode: request.mode } : {})
         });
 
         try {
             this.shell.send(payload);
 
-            // Set timeout for this specific request
+            // Set timeout for this specific request; other in-flight
+            // requests keep running. The timed-out request keeps its slot
+            // (Python is still working on it) until its late response
+            // arrives, or restarts the process at the hard timeout
             request.timeoutId = setTimeout(() => {
-                if (this.currentRequest === request) {
-                    request.reject(new PythonExecutionError('Python execution timeout', { timeout: this.timeout }));
-                    // Force kill and restart process on hanging timeout to clear state
-                    this._handleProcessDeath();
+                if (this.pendingRequests.get(id) !== request) {
+                    return;
                 }
+                request.timedOut = true;
+                request.reject(new PythonExecutionError('Python execution timeout', { timeout: this.timeout }));
+
+                request.hardTimeoutId = setTimeout(() => {
+                    if (this.pendingRequests.get(id) === request) {
+                        this._restartProcess(`request ${id} unanswered after ${this.hardTimeout}ms`);
+                    }
+                }, Math.max(this.hardTimeout - this.timeout, 0));
             }, this.timeout);
 
         } catch (err) {
+            this.pendingRequests.delete(id);
             request.reject(err);
-            this.currentRequest = null;
-            this.isProcessing = false;
-            this._processQueue();
         }
     }
 
@@ -262,14 +410,18 @@ class PythonBridge {
      * @param {String} query - User query
      * @param {String} userId - User identifier
      * @param {Array} conversationHistory - Recent messages for context
+     * @param {Function} onPartial - Optional callback for streamed frames
+     * @param {String} mode - Optional pipeline mode
      * @returns {Promise<Object>} Parsed response
      */
-    async _executePython(query, userId, conversationHistory = []) {
+    async _executePython(query, userId, conversationHistory = [], onPartial = null, mode = null) {
         return new Promise((resolve, reject) => {
             this.requestQueue.push({
                 query,
                 userId,
                 conversationHistory,
+                onPartial,
+                mode,
                 resolve,
                 reject
             });
@@ -277,6 +429,64 @@ class PythonBridge {
         });
     }
 
+    /**
+     * Send a control command to the Python process
+     * 
+     * Commands are answered inline by the process's reader loop, so they
+     * do not wait behind in-flight queries or take a query slot.
+     * 
+     * @private
+     * @param {String} command - Command name (e.g. 'stats')
+     * @param {Number} timeout - Milliseconds to wait for the answer
+     * @returns {Promise<Object>} Parsed response
+     */
+    _sendCommand(command, timeout) {
+        return new Promise((resolve, reject) => {
+            if (!this.isReady || !this.shell) {
+                reject(new PythonExecutionError('Python process not ready'));
+                return;
+            }
+
+            const id = this.nextRequestId++;
+            const pending = { resolve, reject };
+            this.pendingCommands.set(id, pending);
+
+            pending.timeoutId = setTimeout(() => {
+                if (this.pendingCommands.get(id) === pending) {
+                    this.pendingCommands.delete(id);
+                    reject(new PythonExecutionError('Python command timeout', { command, timeout }));
+                }
+            }, timeout);
+
+            try {
+                this.shell.send(JSON.stringify({ id, command }));
+            } catch (err) {
+                clearTimeout(pending.timeoutId);
+                this.pendingCommands.delete(id);
+                reject(err);
+            }
+        });
+    }
+
+    /**
+     * Get pipeline metrics from the Python process
+     * 
+     * Per-stage latency histograms (p50/p95/p99), LLM token totals and
+     * cache/router hit rates, aggregated since the process started.
+     * 
+     * @param {Number} timeout - Milliseconds to wait for the answer
+     * @returns {Promise<Object|null>} Pipeline stats, or null if unavailable
+     */
+    async getPipelineStats(timeout = 2000) {
+        try {
+            const data = await this._sendCommand('stats', timeout);
+            return data.stats;
+        } catch (error) {
+            logger.warn('Python pipeline stats unavailable', { error: error.message });
+            return null;
+        }
+    }
+
     /**
      * Health check - test Python execution
      * 
@@ -302,8 +512,21 @@ class PythonBridge {
      * @returns {Object} Statistics
      */
     getStats() {
+        let timedOut = 0;
+        for (const request of this.pendingRequests.values()) {
+            if (request.timedOut) {
+                timedOut++;
+            }
+        }
+
         return {
             ...this.stats,
+            inFlight: this.pendingRequests.size,
+            timedOutInFlight: timedOut,
+            queued: this.requestQueue.length,
+            maxInFlight: this.maxInFlight,
+            state: this.pythonState,
+            startup: this.startupReport,
             successRate: this.stats.totalExecutions > 0
                 ? ((this.stats.successfulExecutions / this.stats.totalExecutions) * 100).toFixed(2) + '%'
                 : '0%',
@@ -30,17 +30,19 @@ class QueueService {
      * @param {String} data.userId - User identifier
      * @param {String} data.sessionId - Session identifier
      * @param {Array} data.conversationHistory - Recent messages for context
+     * @param {String} data.mode - Optional pipeline mode ('agentic', 'direct' or 'auto')
      * @param {Object} options - Job options
      * @returns {Promise<Object>} Job instance
      */
     async addJob(data, options = {}) {
-        const { query, userId, sessionId, conversationHistory } = data;
+        const { query, userId, sessionId, conversationHistory, mode } = data;
 
         const jobData = {
             query,
             userId: userId || 'anonymous',
             sessionId: sessionId || `session-${Date.now()}`,
             conversationHistory: conversationHistory || [],
+            mode: mode || null,
             timestamp: new Date().toISOString(),
         };
 
@@ -217,7 +219,7 @@ class QueueService {
      * @returns {Promise<Object>} Job result
      */
     async _processJob(job) {
-        const { query, userId, sessionId, conversationHistory } = job.data;
+        const { query, userId, sessionId, conversationHistory, mode } = job.data;
         const startTime = Date.now();
 
         try {
@@ -244,6 +246,7 @@ class QueueService {
                     answer: cached.answer,
                     contexts: cached.contexts,
                     cached: true,
+                    pipelineMode: 'cache',
                     elapsed: Date.now() - startTime,
                     userId,
                     sessionId,
@@ -254,7 +257,7 @@ class QueueService {
             await job.progress(40);
 
             // Execute Python RAG pipeline with conversation history
-            const result = await pythonBridge.executeQuery(query, userId, conversationHistory || []);
+            const result = await pythonBridge.executeQuery(query, userId, conversationHistory || [], { mode });
 
             // Update progress: Storing cache
             await job.progress(80);
@@ -278,6 +281,8 @@ class QueueService {
                 answer: result.answer,
                 contexts: result.contexts,
                 cached: false,
+                pipelineMode: result.metadata?.pipelineMode || null,
+                webGate: result.metadata?.webGate || [],
                 elapsed: Date.now() - startTime,
                 userId,
                 sessionId,